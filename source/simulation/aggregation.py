@@ -0,0 +1,152 @@
+import numpy as np
+
+from message import Computer, MessageStore
+from onlinestats import LogHistogram, PERCENTILES
+
+# Sufijos de las métricas de cada grupo de mensajes, en el orden de `messageCategories`
+CATEGORY_SUFFIXES = ("2", "3", "3r")
+
+def messageCategories(origin, status):
+    """
+    Asigna a cada mensaje el índice de su grupo: 0 (Comp2->destino), 1 (Comp3->destino),
+    2 (Comp3->rechazado) o 3 (ninguno de los anteriores).
+    """
+    category = np.full(origin.shape, 3, dtype=np.intp)
+    sent = status == MessageStore.SENT
+    category[(origin == Computer.COMPUTER_2.value) & sent] = 0
+    category[(origin == Computer.COMPUTER_3.value) & sent] = 1
+    category[(origin == Computer.COMPUTER_3.value) & (status == MessageStore.REJECTED)] = 2
+    return category
+
+def categorySums(origin, status, arrival, departure, queue):
+    """
+    Devuelve la cantidad de mensajes de cada grupo y las sumas por grupo del tiempo en el
+    sistema, del tiempo en colas y del coeficiente de eficiencia. Como son sumas, las de
+    varios bloques de mensajes se pueden acumular (ver `tracefile.TraceReader.metrics`).
+    Los mensajes con duración cero tienen un coeficiente de eficiencia de 0 (no se divide
+    entre cero).
+    """
+    total = departure - arrival
+    ratio = np.divide(queue, total, out=np.zeros_like(total), where=total > 0)
+    category = messageCategories(origin, status)
+
+    counts = np.bincount(category, minlength=4)
+    sums = {
+        "time": np.bincount(category, weights=total, minlength=4),
+        "queue": np.bincount(category, weights=queue, minlength=4),
+        "eff": np.bincount(category, weights=ratio, minlength=4),
+    }
+    return counts, sums
+
+def sumsMetrics(counts, sums):
+    # Las 12 métricas de mensajes a partir de las cantidades y sumas de `categorySums`
+    metrics = {}
+    messages = counts.sum()
+    for name, perCategory in sums.items():
+        for i, suffix in enumerate(CATEGORY_SUFFIXES):
+            metrics[f"{name}_{suffix}"] = perCategory[i] / counts[i] if counts[i] else 0.0
+        metrics[f"{name}_all"] = perCategory.sum() / messages if messages else 0.0
+    return metrics
+
+def messageMetrics(origin, status, arrival, departure, queue):
+    """
+    Calcula las 12 métricas de mensajes de `showStats` a partir de columnas de NumPy.
+
+    Cada métrica sale de una sola reducción (`np.bincount`) por grupo de mensajes, en lugar
+    de recorrer los mensajes una vez por métrica.
+    """
+    return sumsMetrics(*categorySums(origin, status, arrival, departure, queue))
+
+def storeMetrics(store, workTimes, togetherTime, duration):
+    """
+    Calcula las 16 métricas de `showStats` a partir de un `MessageStore`, de los tiempos
+    trabajados por servidor de cada computadora y del tiempo que trabajaron las tres juntas.
+    """
+    columns = store.columns()
+    queue = columns["queueTime1"] + columns["queueTime2"] + columns["queueTime3"]
+    metrics = messageMetrics(columns["origin"], columns["status"], columns["arrivalTime"],
+                             columns["departureTime"], queue)
+    return systemMetrics(metrics, workTimes, togetherTime, duration)
+
+def systemMetrics(metrics, workTimes, togetherTime, duration):
+    # Las 16 métricas de `showStats` a partir de las 12 de mensajes y de los tiempos trabajados
+    result = {}
+    # Se conserva el orden de las claves de `showStats`
+    for name in ("time", "queue", "eff"):
+        for suffix in CATEGORY_SUFFIXES + ("all",):
+            result[f"{name}_{suffix}"] = metrics[f"{name}_{suffix}"]
+    for i, workTime in enumerate(workTimes):
+        result[f"occ_{i + 1}"] = (workTime / duration) * 100
+    result["occ_all"] = (togetherTime / duration) * 100
+    return result
+
+class PooledPercentiles:
+    """
+    Clase que junta los histogramas de percentiles (`LogHistogram`) de varias réplicas para
+    informar los percentiles de todas las réplicas agrupadas, con intervalos de confianza.
+
+    Cada réplica se guarda en forma compacta (arreglos de cubetas y cantidades), así la
+    memoria depende de la cantidad de cubetas usadas y no de la cantidad de mensajes. El
+    percentil agrupado es el de la suma de los histogramas; su intervalo es un bootstrap
+    percentil que remuestrea réplicas completas, ya que las réplicas son independientes
+    entre sí pero los mensajes de una misma réplica no.
+
+    Atributos:
+        runs (list): Por réplica, diccionario nombre -> (ceros, cubetas, cantidades, mínimo, máximo).
+    """
+    def __init__(self):
+        self.runs = []
+
+    def __len__(self):
+        return len(self.runs)
+
+    def add(self, histograms):
+        self.runs.append({name: (histogram.zeros, np.fromiter(histogram.counts, dtype=np.int64),
+                                 np.fromiter(histogram.counts.values(), dtype=np.float64),
+                                 histogram.minimum, histogram.maximum)
+                          for name, histogram in histograms.items()})
+
+    def results(self, confidence=0.95, resamples=1000, seed=0):
+        """
+        Devuelve, por métrica (`time_2`, ..., `queue_all`), un diccionario con la tupla (valor
+        agrupado, límite inferior, límite superior) de cada percentil y el máximo agrupado.
+        Con menos de dos réplicas no hay intervalo (los límites son None).
+        """
+        runs = len(self.runs)
+        rng = np.random.default_rng(seed)
+        # Veces que se elige cada réplica en cada remuestreo (la primera fila es la muestra original)
+        weights = np.vstack([np.ones(runs), rng.multinomial(runs, np.full(runs, 1 / runs), size=resamples)])
+        results = {}
+        for name in self.runs[0]:
+            parts = [run[name] for run in self.runs]
+            keys = np.unique(np.concatenate([part[1] for part in parts]))
+            counts = np.zeros((runs, len(keys) + 1))
+            for r, (zeros, runKeys, runCounts, _, _) in enumerate(parts):
+                counts[r, 0] = zeros
+                counts[r, 1 + np.searchsorted(keys, runKeys)] = runCounts
+            exponent, index = np.divmod(keys, LogHistogram.SUB_BUCKETS)
+            values = np.concatenate([[0.0], np.ldexp(0.5 + (index + 0.5) / (2 * LogHistogram.SUB_BUCKETS), exponent)])
+            minimum = min(part[3] for part in parts)
+            maximum = max(part[4] for part in parts)
+            cumulative = np.cumsum(weights @ counts, axis=1)
+            totals = cumulative[:, -1]
+
+            entry = {}
+            for label, q in PERCENTILES:
+                if totals[0] == 0:
+                    entry[label] = (0.0, None, None)
+                    continue
+                # Rango más cercano, igual que `LogHistogram.quantile`
+                ranks = np.maximum(1, np.ceil(q * totals))
+                position = np.minimum((cumulative < ranks[:, None]).sum(axis=1), len(values) - 1)
+                samples = np.clip(values[position], minimum, maximum)
+                estimate = float(samples[0])
+                if runs < 2:
+                    entry[label] = (estimate, None, None)
+                    continue
+                resampled = samples[1:][totals[1:] > 0]
+                low, high = np.quantile(resampled, [(1 - confidence) / 2, (1 + confidence) / 2])
+                entry[label] = (estimate, float(low), float(high))
+            entry["max"] = float(maximum) if totals[0] else 0.0
+            results[name] = entry
+        return results
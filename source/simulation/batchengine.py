@@ -0,0 +1,286 @@
+import numpy as np
+
+from streams import newSeed
+from scenario import Scenario
+
+class RingQueues:
+    """
+    Clase que representa una cola FIFO por réplica, guardadas juntas en arreglos de NumPy.
+
+    Cada elemento tiene `fields` campos numéricos; el primero es la clave de tiempo con la que
+    se ordena el calendario. La capacidad se duplica cuando alguna cola se llena.
+
+    Atributos:
+        data (ndarray): Arreglo (campos, réplicas, capacidad) con los elementos.
+        head, tail (ndarray): Contadores de extracción e inserción de cada réplica.
+    """
+    def __init__(self, replications, fields, capacity=16):
+        self.capacity = capacity
+        self.data = np.empty((fields, replications, capacity))
+        self.head = np.zeros(replications, dtype=np.int64)
+        self.tail = np.zeros(replications, dtype=np.int64)
+        self.rows = np.arange(replications)
+
+    def sizes(self):
+        return self.tail - self.head
+
+    # Clave del primer elemento de cada cola (infinito si la cola está vacía)
+    def headKey(self):
+        key = self.data[0, self.rows, self.head % self.capacity]
+        return np.where(self.tail > self.head, key, np.inf)
+
+    # Campos del primer elemento de las colas de `rows`, con forma (campos, len(rows))
+    def peek(self, rows):
+        return self.data[:, rows, self.head[rows] % self.capacity]
+
+    def pop(self, rows):
+        self.head[rows] += 1
+
+    def push(self, rows, *values):
+        if (self.tail[rows] - self.head[rows] >= self.capacity).any():
+            self.grow()
+        self.data[:, rows, self.tail[rows] % self.capacity] = values
+        self.tail[rows] += 1
+
+    def grow(self):
+        # Se reordena cada cola para que empiece en la posición 0 de un arreglo del doble de tamaño
+        order = (self.head[:, None] + np.arange(self.capacity)) % self.capacity
+        data = np.empty((self.data.shape[0], self.data.shape[1], self.capacity * 2))
+        data[:, :, :self.capacity] = np.take_along_axis(self.data, order[None, :, :], axis=2)
+        self.data = data
+        self.tail -= self.head
+        self.head[:] = 0
+        self.capacity *= 2
+
+class VariateBlocks:
+    """
+    Clase que representa números aleatorios generados por bloques para cada réplica.
+
+    Se genera un bloque (réplicas x `blockSize`) de una vez con NumPy y cada réplica lo
+    consume con su propio cursor; cuando el bloque de una réplica se agota se vuelve a llenar.
+    """
+    def __init__(self, generator, draw, replications, blockSize):
+        self.generator = generator
+        self.draw = draw
+        self.blockSize = blockSize
+        self.block = draw(generator, (replications, blockSize))
+        self.cursor = np.zeros(replications, dtype=np.intp)
+
+    def take(self, rows):
+        exhausted = rows[self.cursor[rows] == self.blockSize]
+        if exhausted.size:
+            self.block[exhausted] = self.draw(self.generator, (exhausted.size, self.blockSize))
+            self.cursor[exhausted] = 0
+        values = self.block[rows, self.cursor[rows]]
+        self.cursor[rows] += 1
+        return values
+
+class BatchSimulation:
+    """
+    Clase que representa un motor que avanza muchas réplicas a la vez con operaciones de NumPy.
+
+    Cada computadora es un servidor FIFO, por lo que el inicio de cada procesamiento se obtiene
+    con la recursión de Lindley: inicio = max(llegada, momento en que se libera la computadora).
+    Las llegadas a las computadoras se procesan en orden de tiempo; como cada computadora
+    atiende en orden FIFO, los mensajes que salen de ella hacia otra también salen ordenados,
+    por lo que basta una cola FIFO por cada ruta (C2->C1, C3->C1, C1->C2, C1->C3) más el
+    próximo arribo externo de C2 y C3. En cada paso, cada réplica procesa su siguiente llegada
+    y las rutas de devolución se resuelven con máscaras.
+
+    Usa las mismas distribuciones que `Simulation` (por defecto exponencial de media 15,
+    triangular (2, 10, 4), uniforme (5, 10), normal (3, 1) truncada en 0 y la inversa cúbica de
+    la Computadora 3, con los parámetros del `Scenario`), generadas por bloques. La recursión
+    de Lindley supone un servidor por computadora, por lo que todas las capacidades deben ser 1.
+
+    Atributos:
+        replications (int): Cantidad de réplicas que se simulan juntas.
+        duration (float): Duración de cada réplica.
+        free (ndarray): Momento en que se libera cada computadora en cada réplica (3 x réplicas).
+        workTime (ndarray): Tiempo trabajado por cada computadora en cada réplica (3 x réplicas).
+        compTogetherTime (ndarray): Tiempo en que las tres computadoras trabajaron juntas en cada réplica.
+    """
+    # Orígenes de la siguiente llegada a una computadora
+    EXTERNAL_2, EXTERNAL_3, ROUTE_21, ROUTE_31, ROUTE_12, ROUTE_13 = range(6)
+    # Grupos de mensajes finalizados
+    SENT_2, SENT_3, REJECTED_3 = range(3)
+
+    def __init__(self, replications, duration, seed=None, replication=0, blockSize=1024, scenario=None):
+        scenario = scenario if scenario is not None else Scenario()
+        if scenario.capacities != (1, 1, 1):
+            raise ValueError("El motor en lote solo admite un servidor por computadora")
+        self.scenario = scenario
+        if seed is None:
+            seed = newSeed()
+        self.seed = seed
+        self.replications = replications
+        self.duration = duration
+        self.allRows = np.arange(replications)
+
+        # Un generador independiente por propósito, derivado de (semilla, primera réplica)
+        def generator(purpose):
+            return np.random.Generator(np.random.PCG64(np.random.SeedSequence(seed, spawn_key=(replication, purpose))))
+        blocks = lambda purpose, draw: VariateBlocks(generator(purpose), draw, replications, blockSize)
+        s = scenario
+        self.arrival2 = blocks(0, lambda g, size: g.exponential(s.arrivalMean2, size))
+        self.arrival3 = blocks(1, lambda g, size: g.triangular(s.arrivalMin3, s.arrivalMode3, s.arrivalMax3, size))
+        self.service1 = blocks(2, lambda g, size: np.maximum(0, g.normal(s.serviceMean1, s.serviceSd1, size)))
+        self.service2 = blocks(3, lambda g, size: g.uniform(s.serviceMin2, s.serviceMax2, size))
+        self.service3 = blocks(4, lambda g, size: (98 * g.uniform(s.serviceUniformMin3, s.serviceUniformMax3, size) + 27) ** (1/3))
+        self.routing1 = blocks(5, lambda g, size: g.random(size))
+        self.routing3 = blocks(6, lambda g, size: g.random(size))
+
+        # Próximo arribo externo de cada réplica (el primero ocurre luego de un tiempo entre arribos)
+        self.nextArrival2 = self.arrival2.take(self.allRows)
+        self.nextArrival3 = self.arrival3.take(self.allRows)
+        # Rutas entre computadoras: (llegada a la siguiente computadora, llegada al sistema, tiempo en colas)
+        self.routes = {source: RingQueues(replications, 3) for source in
+                       (self.ROUTE_21, self.ROUTE_31, self.ROUTE_12, self.ROUTE_13)}
+        # Intervalos (inicio, fin) en que trabaja cada computadora, pendientes de cruzar entre sí
+        self.busy = [RingQueues(replications, 2) for _ in range(3)]
+
+        self.free = np.zeros((3, replications))
+        self.workTime = np.zeros((3, replications))
+        self.compTogetherTime = np.zeros(replications)
+        self.countMessages = np.zeros((2, replications), dtype=np.int64)
+        self.completedServices = np.zeros(replications, dtype=np.int64)
+        # Acumuladores por grupo de mensajes: cantidad, tiempo en el sistema, tiempo en colas y eficiencia
+        self.count = np.zeros((3, replications), dtype=np.int64)
+        self.timeSum = np.zeros((3, replications))
+        self.queueSum = np.zeros((3, replications))
+        self.effSum = np.zeros((3, replications))
+
+    # Procesa en la computadora `index` (0, 1 o 2) los mensajes que llegan en `arrival` a las réplicas `rows`
+    def serve(self, index, rows, arrival, queue, processingTime):
+        start = np.maximum(arrival, self.free[index, rows])
+        end = start + processingTime
+        self.free[index, rows] = end
+        # Igual que en SimPy, solo cuenta el trabajo de los procesamientos que terminan antes de `duration`
+        done = end < self.duration
+        self.workTime[index, rows[done]] += processingTime[done]
+        self.completedServices[rows[done]] += 1
+        started = start < self.duration
+        self.busy[index].push(rows[started], start[started], np.minimum(end[started], self.duration))
+        return end, queue + (start - arrival)
+
+    # Registra los mensajes del grupo `group` que salen del sistema en `departure`
+    def record(self, group, rows, departure, arrivalTime, queue):
+        done = departure < self.duration
+        rows = rows[done]
+        total = departure[done] - arrivalTime[done]
+        queue = queue[done]
+        self.count[group, rows] += 1
+        self.timeSum[group, rows] += total
+        self.queueSum[group, rows] += queue
+        self.effSum[group, rows] += np.divide(queue, total, out=np.zeros_like(total), where=total > 0)
+
+    # Suma el tiempo en que las tres computadoras trabajaron juntas, con los intervalos ya conocidos.
+    # Cada pasada descarta a lo sumo un intervalo por réplica; `passes` limita la cantidad de pasadas.
+    def crossBusyIntervals(self, passes=None):
+        while passes is None or passes > 0:
+            if passes is not None:
+                passes -= 1
+            ready = (self.busy[0].sizes() > 0) & (self.busy[1].sizes() > 0) & (self.busy[2].sizes() > 0)
+            rows = np.flatnonzero(ready)
+            if rows.size == 0:
+                return
+            heads = [queue.peek(rows) for queue in self.busy]
+            starts = np.maximum(np.maximum(heads[0][0], heads[1][0]), heads[2][0])
+            ends = np.stack([heads[0][1], heads[1][1], heads[2][1]])
+            self.compTogetherTime[rows] += np.maximum(0, ends.min(axis=0) - starts)
+            # El intervalo que termina primero ya no puede cruzarse con ningún otro
+            first = ends.argmin(axis=0)
+            for index in range(3):
+                self.busy[index].pop(rows[first == index])
+
+    def step(self):
+        keys = np.stack([self.nextArrival2, self.nextArrival3] +
+                        [self.routes[source].headKey() for source in
+                         (self.ROUTE_21, self.ROUTE_31, self.ROUTE_12, self.ROUTE_13)])
+        choice = keys.argmin(axis=0)
+        now = keys[choice, self.allRows]
+        active = now < self.duration
+        if not active.any():
+            return False
+
+        for source in range(6):
+            rows = np.flatnonzero(active & (choice == source))
+            if rows.size == 0:
+                continue
+            arrival = now[rows]
+            if source in (self.EXTERNAL_2, self.EXTERNAL_3):
+                arrivalTime = arrival
+                queue = np.zeros(rows.size)
+                self.countMessages[source, rows] += 1
+            else:
+                _, arrivalTime, queue = self.routes[source].peek(rows)
+                self.routes[source].pop(rows)
+
+            if source in (self.EXTERNAL_2, self.ROUTE_12):
+                # Computadora 2: siempre envía a la Computadora 1
+                if source == self.EXTERNAL_2:
+                    self.nextArrival2[rows] = arrival + self.arrival2.take(rows)
+                end, queue = self.serve(1, rows, arrival, queue, self.service2.take(rows))
+                self.routes[self.ROUTE_21].push(rows, end, arrivalTime, queue)
+            elif source in (self.EXTERNAL_3, self.ROUTE_13):
+                # Computadora 3: rechaza el 75% y envía el resto a la Computadora 1
+                if source == self.EXTERNAL_3:
+                    self.nextArrival3[rows] = arrival + self.arrival3.take(rows)
+                end, queue = self.serve(2, rows, arrival, queue, self.service3.take(rows))
+                rejected = self.routing3.take(rows) <= self.scenario.rejectProb3
+                self.record(self.REJECTED_3, rows[rejected], end[rejected], arrivalTime[rejected], queue[rejected])
+                sent = ~rejected
+                self.routes[self.ROUTE_31].push(rows[sent], end[sent], arrivalTime[sent], queue[sent])
+            else:
+                # Computadora 1: devuelve el 20% (de C2) o el 50% (de C3) y envía el resto al destino
+                end, queue = self.serve(0, rows, arrival, queue, self.service1.take(rows))
+                returnProb = self.routing1.take(rows)
+                if source == self.ROUTE_21:
+                    back, group, route = returnProb <= self.scenario.returnProb2, self.SENT_2, self.ROUTE_12
+                else:
+                    back, group, route = returnProb <= self.scenario.returnProb3, self.SENT_3, self.ROUTE_13
+                self.routes[route].push(rows[back], end[back], arrivalTime[back], queue[back])
+                sent = ~back
+                self.record(group, rows[sent], end[sent], arrivalTime[sent], queue[sent])
+        # Cada paso agrega un intervalo por réplica, con dos pasadas el cruce no se atrasa
+        self.crossBusyIntervals(passes=2)
+        return True
+
+    def run(self):
+        while self.step():
+            pass
+        self.crossBusyIntervals()
+
+    # Cantidad de eventos procesados en todas las réplicas: arribos externos y procesamientos terminados
+    def eventCount(self):
+        return int(self.countMessages.sum() + self.completedServices.sum())
+
+    def collectStats(self):
+        """
+        Devuelve una lista con el diccionario de métricas de cada réplica, con las mismas
+        claves que `Simulation.showStats`.
+        """
+        def means(sums, group=None):
+            if group is None:
+                count, total = self.count.sum(axis=0), sums.sum(axis=0)
+            else:
+                count, total = self.count[group], sums[group]
+            return np.divide(total, count, out=np.zeros(self.replications), where=count > 0)
+
+        columns = {}
+        for name, sums in (("time", self.timeSum), ("queue", self.queueSum), ("eff", self.effSum)):
+            columns[f"{name}_2"] = means(sums, self.SENT_2)
+            columns[f"{name}_3"] = means(sums, self.SENT_3)
+            columns[f"{name}_3r"] = means(sums, self.REJECTED_3)
+            columns[f"{name}_all"] = means(sums)
+        for index in range(3):
+            columns[f"occ_{index + 1}"] = self.workTime[index] / self.duration * 100
+        columns["occ_all"] = self.compTogetherTime / self.duration * 100
+        return [{key: float(values[r]) for key, values in columns.items()} for r in range(self.replications)]
+
+def runBatch(replications, duration, seed=None, replication=0, blockSize=1024, scenario=None):
+    """
+    Simula `replications` réplicas juntas y devuelve el diccionario de métricas de cada una.
+    """
+    batch = BatchSimulation(replications, duration, seed, replication, blockSize, scenario)
+    batch.run()
+    return batch.collectStats()
@@ -0,0 +1,130 @@
+import numpy as np
+
+from aggregation import CATEGORY_SUFFIXES, messageCategories
+from intervals import tCritical
+
+# Nombres de las métricas de mensajes, como se muestran en `showStats`
+METRIC_LABELS = {
+    "time_2": "Tiempo promedio en el sistema (Comp2->destino)",
+    "time_3": "Tiempo promedio en el sistema (Comp3->destino)",
+    "time_3r": "Tiempo promedio en el sistema (Comp3->rechazado)",
+    "time_all": "Tiempo promedio en el sistema (general)",
+    "queue_2": "Tiempo promedio en colas (Comp2->destino)",
+    "queue_3": "Tiempo promedio en colas (Comp3->destino)",
+    "queue_3r": "Tiempo promedio en colas (Comp3->rechazado)",
+    "queue_all": "Tiempo promedio en colas (general)",
+    "eff_2": "Coeficiente eficiencia (Comp2->destino)",
+    "eff_3": "Coeficiente eficiencia (Comp3->destino)",
+    "eff_3r": "Coeficiente eficiencia (Comp3->rechazado)",
+    "eff_all": "Coeficiente eficiencia (general)",
+}
+
+def mser5Warmup(arrival, values):
+    """
+    Estima el fin del período de calentamiento con la regla MSER-5.
+
+    `values` (por ejemplo, el tiempo en el sistema) debe estar ordenado por `arrival`. Los
+    valores se agrupan de a 5 y se elige la cantidad `d` de grupos iniciales a descartar que
+    minimiza el error estándar de la media del resto, con `d` a lo sumo la mitad de los grupos.
+    Devuelve el tiempo de llegada del primer mensaje que se conserva.
+    """
+    groups = len(values) // 5
+    if groups < 2:
+        return 0.0
+    z = values[:groups * 5].reshape(groups, 5).mean(axis=1)
+    # Sumas (y sumas de cuadrados) de los grupos d..groups-1 para cada d
+    suffix = np.cumsum(z[::-1])[::-1]
+    suffixSquares = np.cumsum((z * z)[::-1])[::-1]
+    remaining = groups - np.arange(groups)
+    deviations = suffixSquares - suffix * suffix / remaining
+    mser = deviations / remaining ** 2
+    d = int(np.argmin(mser[:groups // 2 + 1]))
+    return float(arrival[d * 5]) if d else 0.0
+
+def completeArrivals(ids, firstId, arrivals):
+    """
+    Marca los mensajes finalizados que llegaron antes que el primer mensaje que sigue en el
+    sistema al terminar la corrida.
+
+    Los identificadores se asignan en orden de llegada, desde `firstId`, a los `arrivals`
+    mensajes de la corrida: el primer identificador que falta entre los finalizados es el del
+    mensaje más antiguo que sigue en una cola o en procesamiento. Devuelve la máscara de los
+    mensajes anteriores a él (todos los que llegaron hasta ese instante ya salieron).
+    """
+    if len(ids) >= arrivals:
+        return np.ones(len(ids), dtype=bool)
+    offsets = np.sort(ids) - firstId
+    gaps = np.flatnonzero(offsets != np.arange(len(offsets)))
+    earliest = firstId + (int(gaps[0]) if len(gaps) else len(offsets))
+    return ids < earliest
+
+def batchMeans(store, duration, warmup=None, batches=30, confidence=0.95, firstId=None, arrivals=None):
+    """
+    Estima las métricas de mensajes de una sola corrida larga con el método de medias por lotes.
+
+    Con `firstId` y `arrivals` (primer identificador y cantidad de mensajes que llegaron en la
+    corrida) solo se usan los mensajes que llegaron antes del instante de corte en que el
+    mensaje más antiguo que sigue en el sistema llegó (ver `completeArrivals`): los que llegan
+    al final y tardan más no terminan, y contar solo a los que terminaron sesgaría los
+    últimos lotes. Se descartan además los mensajes que llegaron antes de `warmup` (si es
+    `None` se estima con `mser5Warmup` sobre el tiempo en el sistema). El intervalo entre el
+    calentamiento y el corte se divide en `batches` intervalos de igual duración según
+    `arrivalTime`; la media de cada lote es una observación y con ellas se calcula el
+    intervalo t de Student de cada métrica. Los lotes sin mensajes de un grupo no se usan
+    para las métricas de ese grupo (la cantidad de lotes usados se devuelve con cada métrica).
+
+    Devuelve un diccionario con `warmup`, `cutoff` (instante de corte), `discarded` (mensajes
+    descartados por el calentamiento), `excluded` (mensajes finalizados que llegaron después
+    del corte), `batches` y `metrics`: para cada métrica, la tupla (media, límite inferior,
+    límite superior, lotes usados).
+    """
+    columns = store.columns()
+    arrival = columns["arrivalTime"]
+    total = columns["departureTime"] - arrival
+    queue = columns["queueTime1"] + columns["queueTime2"] + columns["queueTime3"]
+    ratio = np.divide(queue, total, out=np.zeros_like(total), where=total > 0)
+
+    complete = np.ones(len(arrival), dtype=bool)
+    cutoff = duration
+    if firstId is not None and arrivals is not None:
+        complete = completeArrivals(columns["ID"], firstId, arrivals)
+        if len(arrival) < arrivals:
+            cutoff = float(arrival[complete].max()) if complete.any() else 0.0
+
+    if warmup is None:
+        order = np.argsort(arrival[complete], kind="stable")
+        warmup = mser5Warmup(arrival[complete][order], total[complete][order])
+    if warmup >= cutoff:
+        raise ValueError(f"No quedan mensajes completos después del calentamiento ({warmup:.2f} s); "
+                         f"el corte es {cutoff:.2f} s")
+    keep = complete & (arrival >= warmup)
+
+    # Lote de cada mensaje conservado y su grupo (Comp2->destino, Comp3->destino, Comp3->rechazado, otro)
+    edges = np.linspace(warmup, cutoff, batches + 1)
+    batch = np.clip(np.searchsorted(edges, arrival[keep], side="right") - 1, 0, batches - 1)
+    category = messageCategories(columns["origin"][keep], columns["status"][keep])
+    cell = category * batches + batch
+
+    counts = np.bincount(cell, minlength=4 * batches).reshape(4, batches)
+    metrics = {}
+    for name, values in (("time", total), ("queue", queue), ("eff", ratio)):
+        sums = np.bincount(cell, weights=values[keep], minlength=4 * batches).reshape(4, batches)
+        rows = [(suffix, sums[i], counts[i]) for i, suffix in enumerate(CATEGORY_SUFFIXES)]
+        rows.append(("all", sums.sum(axis=0), counts.sum(axis=0)))
+        for suffix, batchSums, batchCounts in rows:
+            used = batchCounts > 0
+            means = batchSums[used] / batchCounts[used]
+            metrics[f"{name}_{suffix}"] = _interval(means, confidence)
+    return {"warmup": warmup, "cutoff": cutoff, "discarded": int((complete & ~keep).sum()),
+            "excluded": int((~complete).sum()), "batches": batches, "metrics": metrics}
+
+def _interval(means, confidence):
+    # Intervalo t de Student con las medias de los lotes como observaciones
+    n = len(means)
+    if n == 0:
+        return (0.0, None, None, 0)
+    mean = float(means.mean())
+    if n < 2:
+        return (mean, None, None, n)
+    halfwidth = tCritical(confidence, n - 1) * means.std(ddof=1) / np.sqrt(n)
+    return (mean, mean - halfwidth, mean + halfwidth, n)
@@ -0,0 +1,183 @@
+import argparse                     # Para manejar argumentos desde la línea de comandos
+import json                         # Para guardar los resultados en formato legible por máquinas
+import os
+import platform
+import resource                     # Para medir el pico de memoria residente (RSS) del proceso
+import subprocess
+import sys
+import time
+import tracemalloc                  # Para medir el pico de memoria reservada por Python
+from datetime import datetime, timezone
+from multiprocessing import get_context
+
+from replications import buildSimulation
+from batchengine import BatchSimulation
+
+# Grilla por defecto: duraciones de 10^3 a 10^7, cantidades de corridas, motores y niveles de detalle
+DEFAULT_DURATIONS = [10**3, 10**4, 10**5, 10**6, 10**7]
+DEFAULT_RUNS = [1, 10]
+DEFAULT_ENGINES = ["simpy", "fast", "batch"]
+DEFAULT_VERBOSITIES = ["quiet", "trace"]
+
+def _peakRss():
+    # `ru_maxrss` está en kilobytes en Linux y en bytes en macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+def measure(point):
+    """
+    Ejecuta un punto de la grilla y devuelve sus mediciones.
+
+    Se ejecuta en un proceso nuevo por punto, para que el pico de RSS no arrastre la memoria
+    de puntos anteriores. La salida de la simulación se descarta (se escribe en `os.devnull`),
+    así el nivel `trace` mide el costo de formatear los eventos y no el de la terminal.
+    """
+    engine, duration, runs, verbosity, seed, useTracemalloc = (
+        point["engine"], point["duration"], point["runs"], point["verbosity"], point["seed"], point["tracemalloc"])
+    if useTracemalloc:
+        tracemalloc.start()
+    startTime = statsTime = 0.0
+    events = messages = 0
+    stdout = sys.stdout
+    sys.stdout = open(os.devnull, "w")
+    try:
+        if engine == "batch":
+            # El motor en lote ejecuta todas las corridas juntas
+            batch = BatchSimulation(runs, duration, seed)
+            begin = time.perf_counter()
+            batch.run()
+            startTime = time.perf_counter() - begin
+            begin = time.perf_counter()
+            batch.collectStats()
+            statsTime = time.perf_counter() - begin
+            events = batch.eventCount()
+            messages = int(batch.count.sum())
+        else:
+            params = {"duration": duration, "engine": engine, "seed": seed, "verbosity": verbosity}
+            for i in range(runs):
+                simulation = buildSimulation(params, i)
+                begin = time.perf_counter()
+                simulation.start()
+                startTime += time.perf_counter() - begin
+                begin = time.perf_counter()
+                simulation.showStats()
+                statsTime += time.perf_counter() - begin
+                events += simulation.eventCount()
+                messages += simulation.stats.all.time.count
+    finally:
+        sys.stdout.close()
+        sys.stdout = stdout
+
+    wallTime = startTime + statsTime
+    result = dict(point)
+    result.update({
+        "wall_time_s": wallTime,
+        "start_time_s": startTime,
+        "show_stats_time_s": statsTime,
+        "events": events,
+        "messages": messages,
+        "events_per_s": events / wallTime if wallTime > 0 else None,
+        "us_per_message_start": startTime / messages * 1e6 if messages else None,
+        "us_per_message_show_stats": statsTime / messages * 1e6 if messages else None,
+        "peak_rss_bytes": _peakRss(),
+        "tracemalloc_peak_bytes": tracemalloc.get_traced_memory()[1] if useTracemalloc else None,
+    })
+    if useTracemalloc:
+        tracemalloc.stop()
+    return result
+
+def runPoint(point):
+    # Un proceso nuevo (`spawn`) por punto, sin memoria heredada del proceso principal
+    with get_context("spawn").Pool(processes=1) as pool:
+        return pool.apply(measure, (point,))
+
+def environmentInfo():
+    """
+    Devuelve los datos del entorno en que se ejecutaron las mediciones (versión de Python,
+    plataforma, versiones de las bibliotecas y commit actual si se está en un repositorio git).
+    """
+    import numpy
+    import simpy
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "numpy": numpy.__version__,
+        "simpy": getattr(simpy, "__version__", None),
+    }
+
+def pointKey(result):
+    return (result["engine"], result["duration"], result["runs"], result["verbosity"])
+
+# Valor con formato, o N/A alineado al mismo ancho si el punto no tuvo eventos o mensajes
+def formatValue(value, width, spec):
+    return f"{value:>{width}{spec}}" if value is not None else f"{'N/A':>{width}}"
+
+def saveResults(path, environment, results):
+    with open(path, "w") as file:
+        json.dump({"environment": environment, "results": results}, file, indent=2)
+
+def compare(results, baselinePath):
+    """
+    Imprime la relación de eventos por segundo entre estas mediciones y las de un archivo
+    JSON anterior, para los puntos de la grilla que aparecen en ambos.
+    """
+    with open(baselinePath) as file:
+        baseline = {pointKey(result): result for result in json.load(file)["results"]}
+    print(f"\n--- Comparación con {baselinePath} (eventos/s actual / anterior) ---")
+    for result in results:
+        previous = baseline.get(pointKey(result))
+        if previous and previous["events_per_s"] and result["events_per_s"]:
+            print(f"{result['engine']:>6} duración={result['duration']:<9} corridas={result['runs']:<4} "
+                  f"{result['verbosity']:>7}: {result['events_per_s'] / previous['events_per_s']:.2f}x")
+
+def main():
+    parser = argparse.ArgumentParser(description="Mediciones de rendimiento de la simulación.")
+    parser.add_argument("--durations", type=int, nargs="+", default=DEFAULT_DURATIONS, help="Duraciones de la simulación a medir.")
+    parser.add_argument("--runs", type=int, nargs="+", default=DEFAULT_RUNS, help="Cantidades de corridas a medir.")
+    parser.add_argument("--engines", choices=["simpy", "fast", "batch"], nargs="+", default=DEFAULT_ENGINES, help="Motores a medir.")
+    parser.add_argument("--verbosities", choices=["quiet", "summary", "trace"], nargs="+", default=DEFAULT_VERBOSITIES,
+                        help="Niveles de detalle a medir (el motor batch no escribe eventos y solo se mide una vez).")
+    parser.add_argument("--seed", type=int, default=1, help="Semilla de todas las mediciones.")
+    parser.add_argument("--tracemalloc", action="store_true",
+                        help="Medir también el pico de memoria con tracemalloc (hace más lenta la simulación).")
+    parser.add_argument("--output", default="benchmark.json", help="Archivo JSON donde se guardan los resultados.")
+    parser.add_argument("--compare", default=None, help="Archivo JSON de una medición anterior para comparar.")
+    args = parser.parse_args()
+
+    points = []
+    for engine in args.engines:
+        # El motor en lote no tiene salida de eventos, el nivel de detalle no cambia nada
+        verbosities = ["quiet"] if engine == "batch" else args.verbosities
+        for duration in args.durations:
+            for runs in args.runs:
+                for verbosity in verbosities:
+                    points.append({"engine": engine, "duration": duration, "runs": runs, "verbosity": verbosity,
+                                   "seed": args.seed, "tracemalloc": args.tracemalloc})
+
+    results = []
+    environment = environmentInfo()
+    for point in points:
+        result = runPoint(point)
+        results.append(result)
+        print(f"{result['engine']:>6} duración={result['duration']:<9} corridas={result['runs']:<4} {result['verbosity']:>7}: "
+              f"{result['wall_time_s']:8.2f} s, {formatValue(result['events_per_s'], 10, ',.0f')} eventos/s, "
+              f"{formatValue(result['us_per_message_start'], 7, '.2f')} µs/mensaje, "
+              f"RSS {result['peak_rss_bytes'] / 2**20:.0f} MiB")
+        # Se guarda después de cada punto, así una falla no pierde lo ya medido
+        saveResults(args.output, environment, results)
+    print(f"\nResultados guardados en {args.output}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+import argparse                     # Para manejar argumentos desde la línea de comandos
+import json
+import os
+
+from scenario import Scenario
+from sweep import ResultCache, runSweep, summarize
+
+# Métricas del reporte: tiempos de espera por grupo de mensajes y en general
+WAITING_METRICS = (("queue_2", "Cola C2->dest"), ("queue_3", "Cola C3->dest"), ("queue_3r", "Cola C3->rech"),
+                   ("queue_all", "Cola general"), ("time_all", "Sistema general"))
+
+def capacityPlan(base, maxServers, duration, runs, seed, engine="fast", jobs=1, cache=None):
+    """
+    Evalúa cómo cambian los tiempos de espera al agregar servidores a cada computadora.
+
+    Para cada computadora se simulan los escenarios con 1 a `maxServers` servidores en ella,
+    manteniendo las demás como en `base`. Devuelve, por computadora, la lista de
+    (servidores, resumen de métricas) con la media y el semiancho de cada métrica.
+    """
+    scenarios = []
+    for n in (1, 2, 3):
+        scenarios += [base.replace(**{f"capacity{n}": servers}) for servers in range(1, maxServers + 1)]
+    results = runSweep(scenarios, duration, runs, seed, engine, jobs, cache)
+    plan = {}
+    for n in (1, 2, 3):
+        start = (n - 1) * maxServers
+        plan[n] = [(servers, summarize(results[start + servers - 1])) for servers in range(1, maxServers + 1)]
+    return plan
+
+def formatPlan(plan, base):
+    lines = []
+    for n, rows in plan.items():
+        others = ", ".join(f"C{m}: {base.capacities[m - 1]}" for m in (1, 2, 3) if m != n)
+        lines.append(f"\n--- Computadora {n} (servidores de las demás: {others}) ---")
+        lines.append(f"{'Servidores':>10}" + "".join(f"{label:>22}" for _, label in WAITING_METRICS) + f"{'Ocupación/servidor':>22}")
+        for servers, summary in rows:
+            row = f"{servers:>10}"
+            for metric, _ in WAITING_METRICS + ((f"occ_{n}", None),):
+                mean, halfwidth = summary[metric]["mean"], summary[metric]["halfwidth"]
+                row += f"{mean:>12.2f} ± {halfwidth:<7.2f}" if halfwidth is not None else f"{mean:>22.2f}"
+            lines.append(row)
+    return "\n".join(lines)
+
+def main():
+    parser = argparse.ArgumentParser(description="Reporte de planificación de capacidad: tiempos de espera según la cantidad de servidores.")
+    parser.add_argument("--scenario", default=None, help="Escenario base (JSON, TOML o YAML).")
+    parser.add_argument("--maxServers", type=int, default=3, help="Cantidad máxima de servidores a evaluar en cada computadora.")
+    parser.add_argument("--duration", type=int, default=2000, help="Duración de cada réplica.")
+    parser.add_argument("--runs", type=int, default=10, help="Réplicas por escenario.")
+    parser.add_argument("--seed", type=int, default=1, help="Semilla base de todas las réplicas.")
+    parser.add_argument("--engine", choices=["simpy", "fast"], default="fast", help="Motor de simulación.")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count(), help="Cantidad de procesos.")
+    parser.add_argument("--cache", default=".sweep-cache", help="Carpeta de la caché de resultados (la misma de sweep.py).")
+    parser.add_argument("--noCache", action="store_true", help="No leer ni guardar resultados en la caché.")
+    parser.add_argument("--output", default=None, help="Archivo JSON donde se guarda el reporte.")
+    args = parser.parse_args()
+    if args.maxServers < 1:
+        parser.error("--maxServers debe ser al menos 1")
+
+    try:
+        base = Scenario.fromFile(args.scenario) if args.scenario else Scenario()
+    except (OSError, ValueError, ImportError) as error:
+        parser.error(f"escenario inválido: {error}")
+    cache = None if args.noCache else ResultCache(args.cache)
+    plan = capacityPlan(base, args.maxServers, args.duration, args.runs, args.seed, args.engine, args.jobs, cache)
+
+    print("\n============================ PLANIFICACIÓN DE CAPACIDAD ============================")
+    print("Tiempos promedio en segundos y ocupación por servidor en %, con intervalos de confianza del 95%")
+    print(formatPlan(plan, base))
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump({"scenario": base.asDict(), "duration": args.duration, "runs": args.runs, "seed": args.seed,
+                       "engine": args.engine,
+                       "plan": {f"computer{n}": [{"servers": servers, "summary": summary} for servers, summary in rows]
+                                for n, rows in plan.items()}}, file, indent=2)
+        print(f"\nReporte guardado en {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,8 @@
 import simpy
-import random
-import time
 from message import *
+from variates import Variates
+from eventlog import EventLog
+from scenario import Scenario
 
 class Computer_2:
     """
@@ -20,12 +21,6 @@ class Computer_2:
     env : simpy.Environment
         Entorno de simulación utilizado para manejar eventos y tiempos.
     
-    slowMode : bool
-        Si está activado, añade pausas visibles (`sleep`) para observar el proceso paso a paso.
-    
-    sleep : float
-        Tiempo de espera entre eventos si `slowMode` está activado.
-    
     workTime : float
         Tiempo acumulado que la computadora ha pasado procesando mensajes.
     
@@ -37,63 +32,68 @@ class Computer_2:
     
     countMessages : int
         Contador de mensajes que esta computadora ha recibido.
+
+    variates : Variates
+        Variables aleatorias de la simulación; usa `arrival2` (tiempo entre arribos) y `service2` (procesamiento).
+
+    log : EventLog
+        Salida de eventos de la simulación; solo construye el texto si el nivel de detalle lo requiere.
+
+    scenario : Scenario
+        Parámetros de las distribuciones y probabilidades (por defecto, los del enunciado).
     """
     # Constructor
-    def __init__(self, env, capacity=1, slowMode=False, sleepTime=1):
+    def __init__(self, env, capacity=1, variates=None, log=None, scenario=None):
         self.env = env                            # Entorno de simulación de SimPy
-        self.slowMode = slowMode                  # Activa el modo lento (pausas visibles)
-        self.sleep = sleepTime                    # Tiempo de espera entre acciones si slowMode está activo
         self.workTime = 0                         # Tiempo total que la computadora ha estado procesando
         self.resource = simpy.Resource(env, capacity=capacity)  # Recurso compartido que simula la CPU
         self.id = Computer.COMPUTER_2             # Identificador de esta computadora
+        self.log = log if log is not None else EventLog()  # Salida de eventos
+        self.scenario = scenario if scenario is not None else Scenario()  # Parámetros del sistema
+        self.variates = variates if variates is not None else Variates(scenario=self.scenario)  # Variables aleatorias
         self.countMessages = 0                    # Contador de mensajes recibidos
         self.env.process(self.receiveMessages())  # Se inicia el proceso de recepción de mensajes
 
     # Método que simula el proceso de recibir un mensaje desde el "exterior del sistema"
     def receiveMessages(self):
          while True:
-            if(self.slowMode): time.sleep(self.sleep)  # Simula un retraso en el procesamiento si slowMode es True
            # "Recibe, en promedio, un mensaje cada 15 segundos desde
            # fuera del sistema, tiempo exponencial."
-            yield self.env.timeout(random.expovariate(1/15))  # tiempo entre arribos
+            yield self.env.timeout(self.variates.arrival2())  # tiempo entre arribos
             message = Message(self.id)
-            print(f"[{self.env.now:.2f} s][Evento] La Computadora 2 recibió el mensaje con ID {message.ID} desde el exterior del sistema")
+            self.log.trace("[%.2f s][Evento] La Computadora 2 recibió el mensaje con ID %d desde el exterior del sistema", self.env.now, message.ID)
 
             # Guarda los tiempo de llegada
-            message = Message(self.id)
             message.arrivalTime = self.env.now
 
-            if(self.slowMode): time.sleep(self.sleep)  # Simula un retraso en el procesamiento si slowMode es True
             # Se incrementa el contador de mensajes
 
             self.countMessages += 1
-            if(self.slowMode): time.sleep(self.sleep)  # Simula un retraso en el procesamiento si slowMode es True
             self.env.process(self.processMessage(message))
     def processMessage(self, message, reprocess = False):
         queueStart = self.env.now
+        self.env.simulador.notifyArrival(self.id, message)  # El mensaje llega a la cola de la computadora
         with self.resource.request() as request:
             # Con yield, se "detiene" la ejecución hasta que el "resource" este disponible.
             yield request
             # Se le notifica a la simulación que se empezó a procesar el mensaje
-            self.env.simulador.notifyStart()
+            self.env.simulador.notifyStart(self.id, message)
             queueTime = self.env.now - queueStart
-            message.queueTimes["Computer2"] += queueTime
+            message.queueTime2 += queueTime
             proccesingStart = self.env.now
-            print(f"[{self.env.now:.2f} s][Evento] La Computadora 2 comenzó a {'reprocesar' if reprocess else 'procesar'} el mensaje con ID {message.ID}")
-            if(self.slowMode): time.sleep(self.sleep)  # Simula un retraso en el procesamiento si slowMode es True
+            self.log.trace("[%.2f s][Evento] La Computadora 2 comenzó a %s el mensaje con ID %d", self.env.now, 'reprocesar' if reprocess else 'procesar', message.ID)
             # "Prepara cada uno de estos mensajes, tardando un tiempo uniforme entre 5 y 10 segundos"
-            processingTime = random.uniform(5, 10)
+            processingTime = self.variates.service2()
             message.timeWaiting = processingTime
             # Se "detiene" la ejecución durante "processingTime" segundos.
             yield self.env.timeout(processingTime)
             processingFinishTime = self.env.now - proccesingStart
-            message.processingTimes["Computer2"] += processingFinishTime
-            print(f"[{self.env.now:.2f} s][Evento] La Computadora 2 {'reprocesó' if reprocess else 'procesó'} el mensaje con ID {message.ID} durante {processingTime:.2f} s")
+            message.processingTime2 += processingFinishTime
+            self.log.trace("[%.2f s][Evento] La Computadora 2 %s el mensaje con ID %d durante %.2f s", self.env.now, 'reprocesó' if reprocess else 'procesó', message.ID, processingTime)
             self.workTime += processingTime
-            if(self.slowMode): time.sleep(self.sleep)  # Simula un retraso en el procesamiento si slowMode es True
             # Se envía a la computadora 1
             # Notar que se llama como un "proceso de SimPy" para que se pueda usar `yield`
             self.env.process(self.env.simulador.comp_1.processMessage(message))
             # Se le notifica a la simulación que se terminó de procesar el mensaje
-            self.env.simulador.notifyEnd()
+            self.env.simulador.notifyEnd(self.id, message)
 
@@ -1,7 +1,8 @@
 import simpy
-import random
-import time
 from message import *
+from variates import Variates
+from eventlog import EventLog
+from scenario import Scenario
 
 class Computer_3:
     """
@@ -21,12 +22,6 @@ class Computer_3:
     env : simpy.Environment
         Entorno de simulación utilizado para manejar eventos y tiempos.
     
-    slowMode : bool
-        Si está activado, añade pausas visibles (`sleep`) para observar el proceso paso a paso.
-    
-    sleep : float
-        Tiempo de espera entre eventos si `slowMode` está activado.
-    
     workTime : float
         Tiempo acumulado que la computadora ha pasado procesando mensajes.
     
@@ -41,15 +36,26 @@ class Computer_3:
     
     deniedMessages : int
         Contador de mensajes rechazados por esta computadora.
+
+    variates : Variates
+        Variables aleatorias de la simulación; usa `arrival3` (tiempo entre arribos), `service3` (procesamiento)
+        y `routing3` (decisión de rechazo).
+
+    log : EventLog
+        Salida de eventos de la simulación; solo construye el texto si el nivel de detalle lo requiere.
+
+    scenario : Scenario
+        Parámetros de las distribuciones y probabilidades (por defecto, los del enunciado).
     """
     # Constructor
-    def __init__(self, env, capacity=1, slowMode=False, sleepTime=1):
+    def __init__(self, env, capacity=1, variates=None, log=None, scenario=None):
         self.env = env                                # Entorno de simulación
-        self.slowMode = slowMode                      # Modo lento (con pausas)
-        self.sleep = sleepTime                        # Tiempo de espera artificial si slowMode
         self.workTime = 0                             # Tiempo acumulado trabajando
         self.resource = simpy.Resource(env, capacity=capacity)  # Recurso SimPy para exclusión mutua
         self.id = Computer.COMPUTER_3                 # ID de la computadora
+        self.log = log if log is not None else EventLog()  # Salida de eventos
+        self.scenario = scenario if scenario is not None else Scenario()  # Parámetros del sistema
+        self.variates = variates if variates is not None else Variates(scenario=self.scenario)  # Variables aleatorias
         self.countMessages = 0                        # Mensajes recibidos
         self.deniedMessages = 0                       # Mensajes rechazados
         self.env.process(self.receiveMessages())      # Proceso SimPy que inicia la recepción de mensajes
@@ -57,30 +63,25 @@ class Computer_3:
     # Método que simula el proceso de recibir un mensaje desde el "exterior del sistema"
     def receiveMessages(self):
          while True:
-            if(self.slowMode): time.sleep(self.sleep)  # Simula un retraso en el procesamiento si slowMode es True
-            #guardar tiempo de llegada
-            message = Message(self.id)
-            message.arrivalTime = self.env.now
-
             # Tiempo entre arribos
             yield (self.env.timeout(self.getArrivalTime()))
             message = Message(self.id)
-            print(f"[{self.env.now:.2f} s][Evento] La Computadora 3 recibió el mensaje con ID {message.ID} desde el exterior del sistema")
-            if(self.slowMode): time.sleep(self.sleep)  # Simula un retraso en el procesamiento si slowMode es True
+            #guardar tiempo de llegada
+            message.arrivalTime = self.env.now
+            self.log.trace("[%.2f s][Evento] La Computadora 3 recibió el mensaje con ID %d desde el exterior del sistema", self.env.now, message.ID)
             # Se incrementa el contador de mensajes
             self.countMessages += 1
-            if(self.slowMode): time.sleep(self.sleep)  # Simula un retraso en el procesamiento si slowMode es True
             self.env.process(self.processMessage(message))
     def processMessage(self, message, reprocess = False):
         queueStart = self.env.now
+        self.env.simulador.notifyArrival(self.id, message)  # El mensaje llega a la cola de la computadora
         with self.resource.request() as request:
             yield request
             # Se le notifica a la simulación que se empezó a procesar el mensaje
-            self.env.simulador.notifyStart()
+            self.env.simulador.notifyStart(self.id, message)
             queueTime = self.env.now - queueStart
-            message.queueTimes["Computer3"] += queueTime
-            print(f"[{self.env.now:.2f} s][Evento] La Computadora 3 comenzó a {'reprocesar' if reprocess else 'procesar'} el mensaje con ID {message.ID}")
-            if(self.slowMode): time.sleep(self.sleep)  # Simula un retraso en el procesamiento si slowMode es True
+            message.queueTime3 += queueTime
+            self.log.trace("[%.2f s][Evento] La Computadora 3 comenzó a %s el mensaje con ID %d", self.env.now, 'reprocesar' if reprocess else 'procesar', message.ID)
             # TODO: implementar tiempo de procesamiento, por mientras estoy usando el de la computadora 3
             processingTime = self.getProcessingTime()
             message.timeWaiting = processingTime
@@ -88,29 +89,26 @@ class Computer_3:
             processingStart = self.env.now
             yield self.env.timeout(processingTime)
             processingFinishTime = self.env.now - processingStart
-            message.processingTimes["Computer3"] += processingFinishTime
-            print(f"[{self.env.now:.2f} s][Evento] La Computadora 3 {'reprocesó' if reprocess else 'procesó'} el mensaje con ID {message.ID} durante {processingTime:.2f} s")
+            message.processingTime3 += processingFinishTime
+            self.log.trace("[%.2f s][Evento] La Computadora 3 %s el mensaje con ID %d durante %.2f s", self.env.now, 'reprocesó' if reprocess else 'procesó', message.ID, processingTime)
             self.workTime += processingTime
-            if(self.slowMode): time.sleep(self.sleep)  # Simula un retraso en el procesamiento si slowMode es True
             # "Se da el caso de que en promedio, el 75% de todos los mensajes
             #  que llegan son rechazados totalmente"
-            rejectionProb = random.uniform(0, 1)
+            rejectionProb = self.variates.routing3()
             
-            if rejectionProb <= 0.75:
+            if rejectionProb <= self.scenario.rejectProb3:
                 message.departureTime = self.env.now
                 message.finalStatus = "rejected"
                 self.env.simulador.record_message(message)
-                print(f"[{self.env.now:.2f} s] La Computadora 3 rechazó el mensaje con ID {message.ID}")
-                if(self.slowMode): time.sleep(self.sleep)  # Simula un retraso en el procesamiento si slowMode es True
+                self.log.trace("[%.2f s] La Computadora 3 rechazó el mensaje con ID %d", self.env.now, message.ID)
                 self.deniedMessages += 1
-                print(f"[{self.env.now:.2f} s] La Computadora 3 ha rechazado {self.deniedMessages} mensajes hasta este momento.")
-                if(self.slowMode): time.sleep(self.sleep)  # Simula un retraso en el procesamiento si slowMode es True
+                self.log.trace("[%.2f s] La Computadora 3 ha rechazado %d mensajes hasta este momento.", self.env.now, self.deniedMessages)
             else:
               # Se envía a la computadora 1
               # Notar que se llama como un "proceso de SimPy" para que se pueda usar `yield`
               self.env.process(self.env.simulador.comp_1.processMessage(message))
                         # Se le notifica a la simulación que se terminó de procesar el mensaje
-            self.env.simulador.notifyEnd()
+            self.env.simulador.notifyEnd(self.id, message)
     def getArrivalTime(self):
         #if x <= 4:
           #f(x) = ((x/8) - 1/4)
@@ -119,12 +117,12 @@ class Computer_3:
         # Si lo anterior se gráfica, se puede compronar que es una distribución triangular
         # regular con valor inferior 2, superior 10 y pico (moda) en 4. Por lo que se puede
         # usar:
-        return random.triangular(2, 10, 4)
+        return self.variates.arrival3()
     def getProcessingTime(self):
         # f(x) = ((3 * x^2 ) / 98)
         # Para obtener la probabilidad de la distribución acumulada, se utiliza el método de inversa, se calcula
         # la integral definida de 3 a x de f(x), y se despeja x, obteniendo:
         # x= (98y+27)^1/3
-        uniformValue = random.uniform(3, 5)
-        return (98 * uniformValue + 27) ** (1/3)
+        # (la inversa se aplica en `Variates.service3`, por bloques si se usan)
+        return self.variates.service3()
 
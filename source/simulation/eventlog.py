@@ -0,0 +1,67 @@
+import sys
+
+class EventLog:
+    """
+    Clase que representa la salida de eventos de la simulación, con niveles de detalle.
+
+    Los mensajes se reciben como un formato y sus argumentos (estilo `%`), y solo se
+    construye el texto si el nivel del mensaje está activo. En el nivel `quiet` no se
+    genera ningún texto. Las líneas se acumulan en un buffer y se escriben en bloque.
+
+    Si se indica un `sink`, cada línea se le entrega junto con el tiempo simulado en que se
+    generó (`sink(clock(), línea)`) en lugar de escribirse; así un consumidor aparte (ver
+    `playback.py`) puede mostrar los eventos al ritmo que quiera sin frenar la simulación.
+
+    Niveles:
+        QUIET: No se muestra nada de la simulación.
+        SUMMARY: Se muestran el inicio, el fin, el monitoreo y las mediciones de cada corrida.
+        TRACE: Además se muestra cada evento de las computadoras (comportamiento original).
+
+    Atributos:
+        level (int): Nivel de detalle activo.
+        bufferSize (int): Cantidad de líneas que se acumulan antes de escribirlas.
+        stream: Archivo de salida. Si es `None` se usa el `sys.stdout` vigente al escribir.
+        sink: Función que recibe (tiempo simulado, línea), o `None` para escribir en `stream`.
+        clock: Función que devuelve el tiempo simulado actual (la asigna la simulación).
+    """
+    QUIET = 0
+    SUMMARY = 1
+    TRACE = 2
+
+    # Nombres de los niveles tal como se indican desde la línea de comandos
+    LEVELS = {"quiet": QUIET, "summary": SUMMARY, "trace": TRACE}
+
+    def __init__(self, level=TRACE, bufferSize=1000, stream=None, sink=None, clock=None):
+        self.level = level
+        self.traceEnabled = level >= EventLog.TRACE
+        self.summaryEnabled = level >= EventLog.SUMMARY
+        self.bufferSize = bufferSize
+        self.stream = stream
+        self.buffer = []
+        self.sink = sink
+        self.clock = clock if clock is not None else (lambda: 0.0)
+
+    # Registra un evento de las computadoras
+    def trace(self, fmt, *args):
+        if self.traceEnabled:
+            self.write(fmt % args if args else fmt)
+
+    # Registra información general de la corrida
+    def summary(self, fmt, *args):
+        if self.summaryEnabled:
+            self.write(fmt % args if args else fmt)
+
+    def write(self, line):
+        if self.sink is not None:
+            self.sink(self.clock(), line)
+            return
+        self.buffer.append(line)
+        if len(self.buffer) >= self.bufferSize:
+            self.flush()
+
+    def flush(self):
+        if self.buffer:
+            stream = self.stream if self.stream is not None else sys.stdout
+            stream.write("\n".join(self.buffer) + "\n")
+            stream.flush()
+            self.buffer.clear()
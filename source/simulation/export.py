@@ -0,0 +1,113 @@
+import os
+import zipfile
+
+import numpy as np
+
+def pyarrowAvailable():
+    try:
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+class ColumnarWriter:
+    """
+    Clase que escribe una tabla por columnas en disco, de forma incremental y por bloques.
+
+    Las filas se acumulan hasta `chunkRows` y cada bloque se escribe como un grupo de filas de
+    Parquet (si está instalado `pyarrow`) o, si no, como un arreglo `.npy` comprimido por
+    columna dentro de un archivo `.npz`. En el segundo caso cada columna queda repartida en
+    los miembros `columna.000000.npy`, `columna.000001.npy`, ...; `loadColumns` los vuelve a unir.
+
+    Atributos:
+        path (str): Archivo de salida (con extensión `.parquet` o `.npz` según el formato).
+        format (str): "parquet" o "npz".
+        rows (int): Cantidad de filas escritas (incluidas las que están en el buffer).
+    """
+    def __init__(self, path, chunkRows=10000, format=None):
+        if format is None:
+            format = "parquet" if pyarrowAvailable() else "npz"
+        root, extension = os.path.splitext(path)
+        if extension.lower() not in (".parquet", ".npz"):
+            root = path
+        self.format = format
+        self.path = f"{root}.{format}"
+        self.chunkRows = chunkRows
+        self.rows = 0
+        self.chunks = 0
+        self.buffer = {}
+        self.buffered = 0
+        self.writer = None
+        if format == "npz":
+            self.archive = zipfile.ZipFile(self.path, "w", compression=zipfile.ZIP_DEFLATED)
+
+    # Agrega una fila (diccionario columna -> valor)
+    def append(self, row):
+        for name, value in row.items():
+            self.buffer.setdefault(name, []).append(value)
+        self.buffered += 1
+        self.rows += 1
+        if self.buffered >= self.chunkRows:
+            self.flush()
+
+    # Agrega varias filas dadas como columnas (diccionario columna -> arreglo)
+    def appendColumns(self, columns):
+        self.flush()
+        length = len(next(iter(columns.values())))
+        for start in range(0, length, self.chunkRows):
+            self.writeChunk({name: np.asarray(values[start:start + self.chunkRows]) for name, values in columns.items()})
+        self.rows += length
+
+    def flush(self):
+        if self.buffered:
+            self.writeChunk({name: np.asarray(values) for name, values in self.buffer.items()})
+            self.buffer = {}
+            self.buffered = 0
+
+    def writeChunk(self, columns):
+        if self.format == "parquet":
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            table = pa.table(columns)
+            if self.writer is None:
+                self.writer = pq.ParquetWriter(self.path, table.schema, compression="zstd")
+            elif table.schema != self.writer.schema:
+                # Un bloque puede tener solo enteros en una columna de floats (por ejemplo, métricas en 0)
+                table = table.cast(self.writer.schema)
+            self.writer.write_table(table)
+        else:
+            for name, values in columns.items():
+                with self.archive.open(f"{name}.{self.chunks:06d}.npy", "w", force_zip64=True) as member:
+                    np.lib.format.write_array(member, values, allow_pickle=False)
+        self.chunks += 1
+
+    def close(self):
+        self.flush()
+        if self.format == "parquet":
+            if self.writer is not None:
+                self.writer.close()
+        else:
+            self.archive.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def loadColumns(path, columns=None):
+    """
+    Lee las columnas `columns` (todas si es `None`) de un archivo escrito con `ColumnarWriter`
+    y devuelve un diccionario columna -> arreglo de NumPy. Solo se leen las columnas pedidas.
+    """
+    if path.endswith(".parquet"):
+        import pyarrow.parquet as pq
+        table = pq.read_table(path, columns=columns)
+        return {name: table.column(name).to_numpy() for name in table.column_names}
+    with np.load(path) as archive:
+        members = {}
+        for key in archive.files:
+            name, chunk = key.rsplit(".", 1)
+            if columns is None or name in columns:
+                members.setdefault(name, []).append((int(chunk), key))
+        return {name: np.concatenate([archive[key] for _, key in sorted(keys)]) for name, keys in members.items()}
@@ -0,0 +1,282 @@
+import argparse                     # Para manejar argumentos desde la línea de comandos
+import ipaddress
+import multiprocessing
+import os
+import queue
+import secrets
+import socket
+import threading
+import time
+from collections import deque
+from multiprocessing.managers import BaseManager
+
+from replications import runReplication
+
+# Respuestas de `FarmState.take` cuando no hay una unidad para entregar
+DONE = "done"
+WAIT = "wait"
+
+# Clave compartida por el coordinador y los trabajadores (la conexión usa pickle: solo debe
+# conocerla quien pueda ejecutar código en el coordinador). No hay una clave fija por defecto.
+DEFAULT_KEY = os.environ.get("SIMULATION_FARM_KEY")
+
+class FarmState:
+    """
+    Clase que representa el estado del reparto de unidades de trabajo, compartido por el
+    coordinador con los trabajadores a través de un `BaseManager`.
+
+    Cada unidad es una réplica (número de réplica y diccionario de parámetros, con el
+    escenario, la semilla y la duración). Los trabajadores piden unidades con `take`, avisan
+    que siguen vivos con `heartbeat` y entregan las métricas con `complete`. Si un trabajador
+    deja de avisar durante `timeout` segundos, `reclaim` vuelve a poner sus unidades en la
+    cola para otro trabajador; si el trabajador perdido entrega después, ese resultado se
+    descarta porque ya hay uno (las réplicas son reproducibles, así que ambos son iguales).
+
+    Atributos:
+        tasks (list): Unidades de trabajo, como tuplas (réplica, parámetros).
+        timeout (float): Segundos sin avisos tras los que un trabajador se da por perdido.
+        pending (deque): Unidades sin asignar.
+        assigned (dict): Trabajador al que se entregó cada unidad en curso.
+        results (dict): Métricas de cada unidad terminada.
+        reissued (int): Cantidad de unidades repartidas de nuevo por trabajadores perdidos.
+    """
+    def __init__(self, tasks, timeout=10.0):
+        self.tasks = tasks
+        self.timeout = timeout
+        self.lock = threading.Lock()
+        self.pending = deque(range(len(tasks)))
+        self.assigned = {}
+        self.lastSeen = {}
+        self.results = {}
+        self.reissued = 0
+        # Resultados (o errores) en el orden en que llegan, para el coordinador
+        self.arrivals = queue.Queue()
+
+    def take(self, worker):
+        with self.lock:
+            self.lastSeen[worker] = time.monotonic()
+            if len(self.results) == len(self.tasks):
+                return DONE
+            if not self.pending:
+                # Quedan unidades en curso que podrían volver a la cola
+                return WAIT
+            task = self.pending.popleft()
+            self.assigned[task] = worker
+            index, params = self.tasks[task]
+            return task, index, params
+
+    def heartbeat(self, worker):
+        with self.lock:
+            self.lastSeen[worker] = time.monotonic()
+
+    def complete(self, worker, task, stats):
+        with self.lock:
+            self.lastSeen[worker] = time.monotonic()
+            if task in self.results:
+                return
+            self.results[task] = stats
+            self.assigned.pop(task, None)
+            if task in self.pending:
+                self.pending.remove(task)
+        self.arrivals.put((task, stats, None))
+
+    def fail(self, worker, task, error):
+        # Un error de la simulación se repetiría en cualquier trabajador: se informa al coordinador
+        self.arrivals.put((task, None, f"{worker}: {error}"))
+
+    def reclaim(self):
+        """
+        Devuelve a la cola las unidades de los trabajadores que dejaron de avisar y devuelve
+        la lista de esos trabajadores.
+        """
+        now = time.monotonic()
+        lost = set()
+        with self.lock:
+            for task, worker in list(self.assigned.items()):
+                if now - self.lastSeen.get(worker, now) > self.timeout:
+                    del self.assigned[task]
+                    self.pending.appendleft(task)
+                    self.reissued += 1
+                    lost.add(worker)
+        return sorted(lost)
+
+class _CoordinatorManager(BaseManager):
+    pass
+
+class _WorkerManager(BaseManager):
+    pass
+
+_WorkerManager.register("farm")
+
+def parseAddress(address):
+    # "host:puerto" -> ("host", puerto); sin host se usa 127.0.0.1
+    host, separator, port = address.rpartition(":")
+    if not separator or not port.isdigit():
+        raise ValueError(f"Se esperaba host:puerto: {address}")
+    return (host or "127.0.0.1", int(port))
+
+def isLoopback(host):
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+def farmKey(address, authkey=DEFAULT_KEY):
+    """
+    Devuelve la clave de la granja que escucha en `address`. Sin `authkey` solo se acepta una
+    dirección local (127.0.0.1, localhost o ::1) y se genera una clave al azar, que reciben los
+    trabajadores locales; en cualquier otra dirección se exige una clave explícita, ya que
+    quien la conozca puede ejecutar código en el coordinador y los trabajadores.
+    """
+    if authkey:
+        return authkey
+    if not isLoopback(address[0]):
+        raise ValueError(f"La granja en {address[0]} requiere una clave (--farmKey o SIMULATION_FARM_KEY)")
+    return secrets.token_hex(16)
+
+def runFarm(tasks, address, authkey=DEFAULT_KEY, localWorkers=0, timeout=10.0, log=print):
+    """
+    Coordina el reparto de `tasks` (tuplas (réplica, parámetros)) entre los trabajadores que
+    se conecten a `address` y devuelve (número de unidad, métricas) a medida que llegan.
+
+    Con `localWorkers` se inician esa cantidad de trabajadores en esta máquina, por ejemplo
+    para probar el reparto sin otros nodos. La clave se obtiene con `farmKey`. Los trabajadores perdidos (sin avisos durante
+    `timeout` segundos) se informan con `log` y sus unidades se entregan a otro.
+    """
+    authkey = farmKey(address, authkey)
+    state = FarmState(tasks, timeout)
+    _CoordinatorManager.register("farm", callable=lambda: state)
+    server = _CoordinatorManager(address=address, authkey=authkey.encode()).get_server()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.address
+    log(f"Coordinador escuchando en {host}:{port}: {len(tasks)} unidades de trabajo")
+
+    workers = [multiprocessing.Process(target=runWorker, args=(server.address, authkey, timeout / 4, f"local-{n + 1}"))
+               for n in range(localWorkers)]
+    for worker in workers:
+        worker.start()
+    try:
+        received = 0
+        while received < len(tasks):
+            for worker in state.reclaim():
+                log(f"Se perdió el trabajador {worker}, sus unidades se reparten de nuevo")
+            try:
+                task, stats, error = state.arrivals.get(timeout=timeout / 4)
+            except queue.Empty:
+                continue
+            if error is not None:
+                raise RuntimeError(f"Falló la unidad {task}: {error}")
+            received += 1
+            yield task, stats
+    finally:
+        # El servidor sigue atendiendo hasta que termina el proceso, así los trabajadores reciben DONE
+        for worker in workers:
+            worker.join(timeout)
+            if worker.is_alive():
+                worker.terminate()
+        if state.reissued:
+            log(f"Unidades repartidas de nuevo: {state.reissued}")
+
+def runReplicationsFarm(runs, params, address, authkey=DEFAULT_KEY, localWorkers=0, timeout=10.0):
+    """
+    Igual que `replications.runReplicationsParallel`, pero repartiendo las `runs` réplicas
+    entre los trabajadores de la granja. Los resultados se devuelven en el orden de las réplicas.
+    """
+    tasks = [(i, params) for i in range(runs)]
+    results = {}
+    nextRun = 0
+    for task, stats in runFarm(tasks, address, authkey, localWorkers, timeout):
+        results[task] = stats
+        while nextRun in results:
+            yield nextRun, results.pop(nextRun)
+            nextRun += 1
+
+def runWorker(address, authkey=DEFAULT_KEY, heartbeat=2.5, name=None, connectTimeout=30.0):
+    """
+    Trabajador de la granja: se conecta al coordinador en `address`, ejecuta réplicas hasta
+    que no quedan unidades y devuelve cuántas ejecutó. Mientras ejecuta una réplica, un hilo
+    avisa al coordinador cada `heartbeat` segundos que sigue vivo.
+    """
+    if not authkey:
+        raise ValueError("El trabajador requiere la clave de la granja (--farmKey o SIMULATION_FARM_KEY)")
+    worker = name or f"{socket.gethostname()}-{os.getpid()}"
+    manager = _WorkerManager(address=tuple(address), authkey=authkey.encode())
+    deadline = time.monotonic() + connectTimeout
+    while True:
+        try:
+            manager.connect()
+            break
+        except OSError:
+            # El coordinador todavía no empezó a escuchar
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.5)
+    farm = manager.farm()
+
+    stop = threading.Event()
+
+    def beat():
+        while not stop.wait(heartbeat):
+            try:
+                farm.heartbeat(worker)
+            except (OSError, EOFError):
+                return
+
+    threading.Thread(target=beat, daemon=True).start()
+    done = 0
+    try:
+        while True:
+            try:
+                unit = farm.take(worker)
+            except (OSError, EOFError):
+                # El coordinador terminó
+                break
+            if unit == DONE:
+                break
+            if unit == WAIT:
+                time.sleep(min(heartbeat, 0.5))
+                continue
+            task, index, params = unit
+            try:
+                stats = runReplication(index, params)
+            except Exception as error:
+                farm.fail(worker, task, repr(error))
+                break
+            farm.complete(worker, task, stats)
+            done += 1
+    finally:
+        stop.set()
+    return done
+
+def _workerProcess(address, authkey, heartbeat, name):
+    done = runWorker(address, authkey, heartbeat, name)
+    print(f"Trabajador {name}: {done} réplicas ejecutadas")
+
+def main():
+    parser = argparse.ArgumentParser(description="Trabajador de la granja de réplicas (el coordinador es main.py o sweep.py con --farm).")
+    parser.add_argument("connect", help="Dirección del coordinador, host:puerto.")
+    parser.add_argument("--processes", type=int, default=1, help="Cantidad de trabajadores en esta máquina (uno por núcleo).")
+    parser.add_argument("--farmKey", default=DEFAULT_KEY, help="Clave compartida con el coordinador (por defecto SIMULATION_FARM_KEY).")
+    parser.add_argument("--heartbeat", type=float, default=2.5, help="Segundos entre avisos al coordinador.")
+    args = parser.parse_args()
+    if args.processes < 1:
+        parser.error("--processes debe ser al menos 1")
+    if not args.farmKey:
+        parser.error("se requiere la clave de la granja (--farmKey o SIMULATION_FARM_KEY)")
+    try:
+        address = parseAddress(args.connect)
+    except ValueError as error:
+        parser.error(str(error))
+
+    prefix = f"{socket.gethostname()}-{os.getpid()}"
+    processes = [multiprocessing.Process(target=_workerProcess, args=(address, args.farmKey, args.heartbeat, f"{prefix}-{n + 1}"))
+                 for n in range(args.processes)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+
+if __name__ == "__main__":
+    main()
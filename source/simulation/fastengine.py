@@ -0,0 +1,202 @@
+import heapq
+import itertools
+from collections import deque
+
+from message import *
+from streams import RandomStreams
+from eventlog import EventLog
+from simulation import BaseSimulation
+
+class Station:
+    """
+    Clase que representa una computadora dentro del motor rápido: servidores y cola FIFO.
+
+    Atributos:
+        id (Enum Computer): Identificador de la computadora.
+        capacity (int): Cantidad de mensajes que puede procesar a la vez.
+        busy (int): Cantidad de mensajes que está procesando.
+        queue (deque): Mensajes en espera, como tuplas (mensaje, reproceso, tiempo de llegada a la cola).
+        workTime (float): Tiempo acumulado que la computadora ha pasado procesando mensajes.
+        countMessages, sendMessages, deniedMessages (int): Mismos contadores que las computadoras de SimPy.
+    """
+    def __init__(self, computer, capacity=1):
+        self.id = computer
+        self.capacity = capacity
+        self.busy = 0
+        self.queue = deque()
+        self.workTime = 0
+        self.countMessages = 0
+        self.sendMessages = 0
+        self.deniedMessages = 0
+
+class FastSimulation(BaseSimulation):
+    """
+    Clase que representa un motor de simulación sin SimPy, basado en un calendario de eventos.
+
+    Modela la misma red que `Simulation` (tres computadoras con colas FIFO, las mismas
+    distribuciones de arribo, procesamiento y enrutamiento, y las devoluciones del 20%/50% de
+    la Computadora 1), pero cada evento es una tupla en un `heapq` y cada cola un `deque`, sin
+    procesos generadores ni solicitudes de recursos. Usa los mismos flujos aleatorios por
+    computadora y propósito, por lo que con la misma semilla produce las mismas mediciones
+    salvo en empates de tiempo.
+
+    Atributos:
+        now (float): Tiempo actual de la simulación.
+        calendar (list): Montículo de eventos pendientes (tiempo, secuencia, tipo, computadora, mensaje, reproceso, duración).
+        comp_1, comp_2, comp_3 (Station): Computadoras del sistema.
+        checkpointInterval (float): Cada cuánto tiempo simulado se llama a `onCheckpoint` (None para nunca).
+        onCheckpoint: Función que recibe la simulación en cada punto de control, por ejemplo para
+            guardar una foto de su estado (ver `snapshot.Checkpointer`).
+
+    Como todo el estado son datos (el calendario, las colas y los contadores), se puede copiar
+    en cualquier momento con `snapshot.Snapshot.capture` y continuar después desde ahí.
+    """
+    # Tipos de evento del calendario
+    ARRIVAL_2 = 0
+    ARRIVAL_3 = 1
+    DEPARTURE = 2
+    MONITOR = 3
+    CHECKPOINT = 4
+
+    def __init__(self, duration, monitor=True, monitorInterval=1, seed=None, replication=0,
+                 verbosity=EventLog.TRACE, keepMessages=False, scenario=None, tracePath=None, variates=RandomStreams.PLAIN,
+                 blockSize=None):
+        super().__init__(duration, monitor, monitorInterval, seed, replication, verbosity, keepMessages, scenario=scenario,
+                         tracePath=tracePath, variates=variates, blockSize=blockSize)
+        self.now = 0
+        self.calendar = []
+        self.sequence = itertools.count()
+        self.checkpointInterval = None
+        self.onCheckpoint = None
+
+        capacity1, capacity2, capacity3 = self.scenario.capacities
+        self.comp_1 = Station(Computer.COMPUTER_1, capacity1)
+        self.comp_2 = Station(Computer.COMPUTER_2, capacity2)
+        self.comp_3 = Station(Computer.COMPUTER_3, capacity3)
+
+
+    def schedule(self, time, kind, station=None, message=None, reprocess=False, serviceTime=0):
+        heapq.heappush(self.calendar, (time, next(self.sequence), kind, station, message, reprocess, serviceTime))
+
+    def nextArrival2(self):
+        return self.now + self.variates.arrival2()
+
+    def nextArrival3(self):
+        return self.now + self.variates.arrival3()
+
+    def run(self):
+        # Los primeros arribos ocurren luego de un tiempo entre arribos, como en SimPy
+        # (una simulación restaurada desde una foto ya tiene sus arribos en el calendario)
+        if not self.calendar:
+            self.schedule(self.nextArrival2(), self.ARRIVAL_2)
+            self.schedule(self.nextArrival3(), self.ARRIVAL_3)
+        if self.monitorEnabled and self.log.summaryEnabled:
+            self.schedule(self.now, self.MONITOR)
+        if self.checkpointInterval is not None:
+            self.schedule(self.now + self.checkpointInterval, self.CHECKPOINT)
+
+        calendar = self.calendar
+        duration = self.duration
+        while calendar:
+            event = heapq.heappop(calendar)
+            # Igual que `env.run(until=duration)`, los eventos en `duration` o después no se procesan
+            if event[0] >= duration:
+                heapq.heappush(calendar, event)
+                break
+            self.now, _, kind, station, message, reprocess, serviceTime = event
+            if kind == self.DEPARTURE:
+                self.finishService(station, message, reprocess, serviceTime)
+            elif kind == self.ARRIVAL_3:
+                self.externalArrival(self.comp_3)
+                self.schedule(self.nextArrival3(), self.ARRIVAL_3)
+            elif kind == self.ARRIVAL_2:
+                self.externalArrival(self.comp_2)
+                self.schedule(self.nextArrival2(), self.ARRIVAL_2)
+            elif kind == self.MONITOR:
+                self.monitorReport()
+                self.schedule(self.now + self.monitorInterval, self.MONITOR)
+            else:
+                self.onCheckpoint(self)
+                self.schedule(self.now + self.checkpointInterval, self.CHECKPOINT)
+        self.now = duration
+
+    # Llega un mensaje desde el exterior del sistema a la Computadora 2 o 3
+    def externalArrival(self, station):
+        message = Message(station.id)
+        self.log.trace("[%.2f s][Evento] La Computadora %d recibió el mensaje con ID %d desde el exterior del sistema", self.now, station.id.value, message.ID)
+        message.arrivalTime = self.now
+        station.countMessages += 1
+        self.enqueue(station, message, False)
+
+    # El mensaje llega a la cola de `station`; si hay un servidor libre se procesa de inmediato
+    def enqueue(self, station, message, reprocess):
+        if station is self.comp_1:
+            self.log.trace("[%.2f s][Evento] La Computadora 1 recibió el mensaje con ID %d proveniente de la Computadora %d", self.now, message.ID, message.origin.value)
+        self.notifyArrival(station.id, message)
+        if station.busy < station.capacity:
+            self.startService(station, message, reprocess, self.now)
+        else:
+            station.queue.append((message, reprocess, self.now))
+
+    def startService(self, station, message, reprocess, queueStart):
+        station.busy += 1
+        queueTime = self.now - queueStart
+        self.notifyStart(station.id, message)
+        self.log.trace("[%.2f s][Evento] La Computadora %d comenzó a %s el mensaje con ID %d", self.now, station.id.value, 'reprocesar' if reprocess else 'procesar', message.ID)
+        if station is self.comp_1:
+            message.queueTime1 += queueTime
+            processingTime = self.variates.service1()
+        elif station is self.comp_2:
+            message.queueTime2 += queueTime
+            processingTime = self.variates.service2()
+        else:
+            message.queueTime3 += queueTime
+            processingTime = self.variates.service3()
+        message.timeWaiting = processingTime
+        self.schedule(self.now + processingTime, self.DEPARTURE, station, message, reprocess, processingTime)
+
+    def finishService(self, station, message, reprocess, processingTime):
+        self.log.trace("[%.2f s][Evento] La Computadora %d %s el mensaje con ID %d durante %.2f s", self.now, station.id.value, 'reprocesó' if reprocess else 'procesó', message.ID, processingTime)
+        station.workTime += processingTime
+        # Siguiente computadora del mensaje (None si sale del sistema)
+        nextStation = None
+        nextReprocess = False
+        if station is self.comp_1:
+            returnProb = self.variates.routing1()
+            if message.origin == Computer.COMPUTER_2 and returnProb <= self.scenario.returnProb2:
+                self.log.trace('[%.2f s][Evento] La Computadora 1 regresó a la Computadora 2 el mensaje con ID %d para su reprocesamiento', self.now, message.ID)
+                nextStation, nextReprocess = self.comp_2, True
+            elif message.origin == Computer.COMPUTER_3 and returnProb <= self.scenario.returnProb3:
+                self.log.trace('[%.2f s][Evento] La Computadora 1 regresó a la Computadora 3 el mensaje con ID %d para su reprocesamiento', self.now, message.ID)
+                nextStation, nextReprocess = self.comp_3, True
+            else:
+                station.sendMessages += 1
+                message.departureTime = self.now
+                message.finalStatus = "sent"
+                self.record_message(message)
+                self.log.trace('[%.2f s][Evento] La Computadora 1 envió al destino el mensaje con ID %d proviniente de la computadora %d', self.now, message.ID, message.origin.value)
+                self.log.trace('[%.2f s][Evento] La Computadora 1 ha enviado %d mensajes hasta este momento.', self.now, station.sendMessages)
+        else:
+            if station is self.comp_2:
+                message.processingTime2 += processingTime
+                nextStation = self.comp_1
+            else:
+                message.processingTime3 += processingTime
+                if self.variates.routing3() <= self.scenario.rejectProb3:
+                    message.departureTime = self.now
+                    message.finalStatus = "rejected"
+                    self.record_message(message)
+                    self.log.trace("[%.2f s] La Computadora 3 rechazó el mensaje con ID %d", self.now, message.ID)
+                    station.deniedMessages += 1
+                    self.log.trace("[%.2f s] La Computadora 3 ha rechazado %d mensajes hasta este momento.", self.now, station.deniedMessages)
+                else:
+                    nextStation = self.comp_1
+        # Mismo orden que en SimPy: se libera el servidor, llega el mensaje a su siguiente
+        # computadora y luego se atiende el siguiente mensaje de la cola
+        self.notifyEnd(station.id, message)
+        station.busy -= 1
+        if nextStation is not None:
+            self.enqueue(nextStation, message, nextReprocess)
+        # (si la capacidad se redujo al continuar una foto, se espera a que se liberen más servidores)
+        if station.queue and station.busy < station.capacity:
+            self.startService(station, *station.queue.popleft())
@@ -0,0 +1,86 @@
+import math
+from functools import lru_cache
+from statistics import NormalDist
+
+# Este módulo no importa NumPy ni SciPy: importar `scipy.stats` tarda cerca de un segundo, y
+# cada proceso lo pagaba solo para calcular los valores críticos de la t de Student al final.
+
+def mean(values):
+    values = list(values)
+    return math.fsum(values) / len(values)
+
+def sem(values):
+    """
+    Error estándar de la media (desvío muestral dividido por la raíz de la cantidad de valores).
+    """
+    values = list(values)
+    n = len(values)
+    average = math.fsum(values) / n
+    variance = math.fsum((value - average) ** 2 for value in values) / (n - 1)
+    return math.sqrt(variance / n)
+
+def _studentCdfTwoSided(x, dof):
+    # P(|T| < x) con `dof` entero, por las sumas finitas de Abramowitz y Stegun (26.7.3 y 26.7.4)
+    theta = math.atan(x / math.sqrt(dof))
+    sin, cos2 = math.sin(theta), math.cos(theta) ** 2
+    if dof % 2 == 0:
+        term = total = 1.0
+        for k in range(2, dof, 2):
+            term *= cos2 * (k - 1) / k
+            total += term
+        return sin * total
+    if dof == 1:
+        return 2 * theta / math.pi
+    term = total = math.cos(theta)
+    for k in range(3, dof, 2):
+        term *= cos2 * (k - 1) / k
+        total += term
+    return 2 / math.pi * (theta + sin * total)
+
+def _studentPdf(x, dof):
+    logNorm = math.lgamma((dof + 1) / 2) - math.lgamma(dof / 2) - 0.5 * math.log(dof * math.pi)
+    return math.exp(logNorm - (dof + 1) / 2 * math.log1p(x * x / dof))
+
+def _scipyCritical(confidence, dof):
+    from scipy.stats import t
+    return float(t.ppf((1 + confidence) / 2, dof))
+
+@lru_cache(maxsize=None)
+def tCritical(confidence, dof):
+    """
+    Valor crítico de la t de Student con `dof` grados de libertad para un intervalo bilateral
+    de nivel `confidence` (lo mismo que `scipy.stats.t.ppf((1 + confidence) / 2, dof)`).
+
+    Con grados de libertad enteros se invierte la distribución exacta con el método de Newton,
+    partiendo de la normal; SciPy se importa solo para grados de libertad no enteros o si el
+    método no converge. Cada valor se calcula una sola vez por (nivel, grados de libertad).
+    """
+    if dof != int(dof) or dof < 1:
+        return _scipyCritical(confidence, dof)
+    dof = int(dof)
+    x = NormalDist().inv_cdf((1 + confidence) / 2)
+    for _ in range(100):
+        step = (_studentCdfTwoSided(x, dof) - confidence) / (2 * _studentPdf(x, dof))
+        x -= step
+        if abs(step) <= 1e-15 * x:
+            return x
+    return _scipyCritical(confidence, dof)
+
+def halfwidth(values, confidence=0.95):
+    # Semiancho del intervalo t de Student de la media de `values` (None con menos de dos valores)
+    values = list(values)
+    if len(values) < 2:
+        return None
+    return tCritical(confidence, len(values) - 1) * sem(values)
+
+def interval(values, confidence=0.95):
+    """
+    Intervalo de confianza t de Student de la media de `values`, como (inferior, superior), o
+    None si hay menos de dos valores.
+    """
+    values = list(values)
+    width = halfwidth(values, confidence)
+    if width is None:
+        return None
+    center = mean(values)
+    return (center - width, center + width)
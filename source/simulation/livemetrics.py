@@ -0,0 +1,192 @@
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Métricas expuestas: nombre, tipo y descripción (formato de texto de Prometheus)
+METRICS = (
+    ("simulation_run", "gauge", "Número de la corrida en curso de cada fuente."),
+    ("simulation_time_seconds", "gauge", "Tiempo simulado actual de la corrida."),
+    ("simulation_events_total", "counter", "Eventos procesados: arribos desde el exterior y procesamientos terminados."),
+    ("simulation_events_per_second", "gauge", "Eventos procesados por segundo real desde la publicación anterior."),
+    ("simulation_queue_length", "gauge", "Mensajes esperando en la cola de cada computadora."),
+    ("simulation_busy_servers", "gauge", "Servidores ocupados de cada computadora."),
+    ("simulation_received_messages_total", "counter", "Mensajes recibidos desde el exterior (countMessages)."),
+    ("simulation_sent_messages_total", "counter", "Mensajes enviados al destino por la Computadora 1 (sendMessages)."),
+    ("simulation_rejected_messages_total", "counter", "Mensajes rechazados por la Computadora 3 (deniedMessages)."),
+    ("simulation_work_time_seconds", "counter", "Tiempo trabajado por cada computadora (workTime)."),
+    ("simulation_together_time_seconds", "counter", "Tiempo en que las tres computadoras trabajaron juntas (compTogetherTime)."),
+)
+
+# Métricas del avance de la ejecución completa (sin etiquetas de corrida)
+PROGRESS = (
+    ("simulation_runs_completed", "Corridas terminadas."),
+    ("simulation_runs_total", "Corridas previstas."),
+)
+
+class MetricsPublisher:
+    """
+    Clase que publica el estado de una simulación en curso a un ritmo limitado.
+
+    `attach` envuelve `notifyEnd` solo en la simulación indicada (igual que `Profiler`), y cada
+    `checkEvery` procesamientos terminados se consulta el reloj; si pasaron `interval`
+    segundos reales desde la última publicación, se arma una foto del estado (un diccionario)
+    y se entrega a `push`. Así el costo por evento es un decremento y una comparación, y quien
+    lee las métricas nunca toca la simulación.
+
+    Atributos:
+        push: Función que recibe (fuente, foto), por ejemplo `MetricsServer.update` o `Queue.put`.
+        interval (float): Segundos reales entre publicaciones.
+        source (str): Nombre de quien publica (el proceso), se usa como etiqueta.
+    """
+    def __init__(self, push, interval=1.0, checkEvery=256, source="main"):
+        self.push = push
+        self.interval = interval
+        self.checkEvery = checkEvery
+        self.source = source
+
+    def attach(self, simulation, run=0):
+        self.run = run
+        self.lastWall = time.monotonic()
+        self.lastEvents = 0
+        self.nextPush = self.lastWall + self.interval
+        countdown = self.checkEvery
+        original = simulation.notifyEnd
+
+        def notifyEnd(computer, message):
+            nonlocal countdown
+            original(computer, message)
+            countdown -= 1
+            if countdown <= 0:
+                countdown = self.checkEvery
+                now = time.monotonic()
+                if now >= self.nextPush:
+                    self.publish(simulation, now)
+
+        simulation.notifyEnd = notifyEnd
+
+    def publish(self, simulation, wallNow=None):
+        wallNow = time.monotonic() if wallNow is None else wallNow
+        events = simulation.eventCount()
+        elapsed = wallNow - self.lastWall
+        computers = (simulation.comp_1, simulation.comp_2, simulation.comp_3)
+        snapshot = {
+            "simulation_run": self.run,
+            "simulation_time_seconds": simulation.now,
+            "simulation_events_total": events,
+            "simulation_events_per_second": (events - self.lastEvents) / elapsed if elapsed > 0 else 0.0,
+            "simulation_queue_length": [simulation.queueLength(computer) for computer in computers],
+            "simulation_busy_servers": [simulation.busyServers(computer) for computer in computers],
+            "simulation_received_messages_total": [None, simulation.comp_2.countMessages, simulation.comp_3.countMessages],
+            "simulation_sent_messages_total": [simulation.comp_1.sendMessages, None, None],
+            "simulation_rejected_messages_total": [None, None, simulation.comp_3.deniedMessages],
+            "simulation_work_time_seconds": [computer.workTime for computer in computers],
+            "simulation_together_time_seconds": simulation.compTogetherTime,
+        }
+        self.lastWall, self.lastEvents = wallNow, events
+        self.nextPush = wallNow + self.interval
+        self.push(self.source, snapshot)
+
+class MetricsServer:
+    """
+    Clase que expone por HTTP (solo biblioteca estándar) las últimas fotos recibidas de cada
+    fuente en el formato de texto de Prometheus, en `http://host:port/metrics`.
+
+    Las fotos se reemplazan completas bajo un lock y el texto se arma al momento de cada
+    consulta, en el hilo del servidor, por lo que consultar no frena la simulación.
+
+    Atributos:
+        snapshots (dict): Última foto de cada fuente.
+        progress (dict): Corridas terminadas y previstas de la ejecución.
+        address (tuple): Host y puerto donde escucha el servidor.
+    """
+    def __init__(self, port=9100, host="127.0.0.1"):
+        self.snapshots = {}
+        self.progress = {}
+        self.lock = threading.Lock()
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] not in ("/", "/metrics"):
+                    self.send_error(404)
+                    return
+                body = metrics.render().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                # Las consultas no se muestran en la salida de la simulación
+                pass
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        self.address = self.server.server_address
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def update(self, source, snapshot):
+        with self.lock:
+            self.snapshots[source] = snapshot
+
+    def setProgress(self, **values):
+        with self.lock:
+            self.progress.update(values)
+
+    def listen(self, queue):
+        """
+        Recibe en un hilo aparte las fotos que publican los procesos trabajadores en `queue`.
+        """
+        def drain():
+            while True:
+                item = queue.get()
+                if item is None:
+                    break
+                self.update(*item)
+        threading.Thread(target=drain, daemon=True).start()
+
+    def render(self):
+        with self.lock:
+            snapshots = dict(self.snapshots)
+            progress = dict(self.progress)
+        lines = []
+        for name, kind, description in METRICS:
+            lines.append(f"# HELP {name} {description}")
+            lines.append(f"# TYPE {name} {kind}")
+            for source, snapshot in sorted(snapshots.items()):
+                labels = f'source="{source}"'
+                value = snapshot[name]
+                if isinstance(value, list):
+                    for computer, item in enumerate(value, start=1):
+                        if item is not None:
+                            lines.append(f'{name}{{{labels},computer="{computer}"}} {float(item)!r}')
+                else:
+                    lines.append(f"{name}{{{labels}}} {float(value)!r}")
+        for name, description in PROGRESS:
+            key = name.removeprefix("simulation_runs_")
+            if key in progress:
+                lines.append(f"# HELP {name} {description}")
+                lines.append(f"# TYPE {name} gauge")
+                lines.append(f"{name} {progress[key]}")
+        return "\n".join(lines) + "\n"
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+# Publicador de los procesos trabajadores, lo instala `initWorker` al crear el proceso
+_workerPublisher = None
+
+def initWorker(queue, interval):
+    """
+    Inicializador de los procesos de `multiprocessing.Pool`: las fotos de cada corrida se
+    envían por `queue` al servidor del proceso principal.
+    """
+    global _workerPublisher
+    _workerPublisher = MetricsPublisher(lambda source, snapshot: queue.put((source, snapshot)), interval,
+                                        source=f"worker-{os.getpid()}")
+
+def workerPublisher():
+    return _workerPublisher
@@ -1,8 +1,116 @@
 import argparse                     # Para manejar argumentos desde la línea de comandos
+import multiprocessing
+import os
+import sys
 import numpy as np                  # Para cálculos numéricos como promedio
-from scipy import stats             # Para operaciones estadísticas
-from scipy.stats import sem, t      # sem: error estándar de la media, t: distribución t de Student
-from simulation import Simulation   # Clase principal que contiene la lógica de simulación
+from intervals import interval      # Intervalos t de Student (sin importar SciPy)
+from aggregation import PooledPercentiles  # Percentiles de todas las corridas agrupadas
+from replications import buildSimulation, runReplicationsParallel  # Construcción y ejecución de réplicas
+from streams import newSeed         # Semilla aleatoria cuando no se indica una
+from batchengine import runBatch    # Motor que simula muchas réplicas a la vez con NumPy
+from profiler import Profiler       # Mediciones por fase con --profile
+from stopping import SequentialStop # Regla de parada secuencial por precisión de los intervalos
+from batchmeans import batchMeans, METRIC_LABELS  # Medias por lotes de una corrida larga
+from scenario import Scenario       # Parámetros del sistema leídos de un archivo
+from export import ColumnarWriter   # Exportación por columnas (Parquet o NPZ) de los resultados
+from playback import Playback, EventRecorder, liveEvents  # Reproducción en tiempo real de los eventos
+from livemetrics import MetricsServer, MetricsPublisher  # Métricas en vivo por HTTP
+from snapshot import Snapshot, Checkpointer, nextMessageID  # Fotos del estado para retomar o ramificar una corrida
+from farm import runReplicationsFarm, parseAddress, farmKey, DEFAULT_KEY  # Réplicas repartidas entre varias máquinas
+
+def runSequential(i, params, profiler=None, messageWriter=None, playback=None, recorder=None, publisher=None,
+                  checkpointer=None):
+    """
+    Ejecuta la corrida número `i` en el proceso actual, mostrando sus eventos y
+    mediciones en consola. Devuelve el diccionario de estadísticas de la corrida.
+    Si se recibe un `profiler`, la corrida se mide con él; si se recibe un `messageWriter`,
+    se le agregan los mensajes finalizados de la corrida. Con un `playback` los eventos se
+    muestran a su ritmo mientras la simulación avanza en otro hilo, y con un `recorder`
+    además se graban. Con un `publisher` el estado de la corrida se publica mientras avanza.
+    Con un `checkpointer` se guarda una foto del estado durante la corrida y al terminar.
+    Con `histograms` en los parámetros, el diccionario incluye los histogramas de percentiles
+    de la corrida en la clave `histograms` (ver `replications.runReplication`).
+    """
+    # En el nivel `quiet` no se muestra nada de cada corrida
+    showRun = params["verbosity"] != "quiet"
+    if showRun:
+        print(f"\n============================ EJECUCIÓN #{i+1} ============================\n")
+        print(f"Semilla {params['seed']}, réplica {params['replication'] + i}\n")
+
+    # Crear instancia de la simulación con los argumentos recibidos
+    simulation = buildSimulation(params, i)
+    if publisher is not None:
+        publisher.attach(simulation, i)
+    if checkpointer is not None:
+        checkpointer.attach(simulation)
+
+    # Iniciar simulación
+    if profiler is not None:
+        profiler.instrument(simulation)
+        profiler.run(simulation)
+    elif playback is not None:
+        # La simulación corre a toda velocidad; solo la salida de sus eventos lleva el ritmo
+        for simTime, line in liveEvents(simulation):
+            if recorder is not None:
+                recorder.write(simTime, line)
+            playback.show(simTime, line)
+    else:
+        simulation.start()
+
+    if publisher is not None:
+        publisher.publish(simulation)
+    if checkpointer is not None:
+        checkpointer.save(simulation)
+
+    if messageWriter is not None and len(simulation.msg_stats):
+        columns = simulation.msg_stats.columns()
+        messageWriter.appendColumns(dict(run=np.full(len(simulation.msg_stats), i, dtype=np.int64), **columns))
+
+    # Mostrar estadísticas al final de la corrida
+    if showRun:
+        print("\n-----------------------------------")
+        print(f'Mediciones Ejecución #{i+1}')
+        print("-----------------------------------")
+    run_stats = simulation.showStats()  # Diccionario con estadísticas
+    if params.get("histograms"):
+        run_stats["histograms"] = simulation.stats.histograms()
+    return run_stats
+
+def runBatchMeans(params, warmup, batches):
+    """
+    Ejecuta una sola corrida larga y muestra las métricas de mensajes estimadas con medias por
+    lotes, descartando el período de calentamiento.
+    """
+    # La corrida es larga: a lo sumo se muestra el resumen, nunca cada evento
+    verbosity = "quiet" if params["verbosity"] == "quiet" else "summary"
+    simulation = buildSimulation(dict(params, keepMessages=True, verbosity=verbosity))
+    # Los identificadores se asignan en orden de llegada: con el primero se sabe cuáles siguen en el sistema
+    firstId = nextMessageID()
+    simulation.start()
+    arrivals = simulation.comp_2.countMessages + simulation.comp_3.countMessages
+    try:
+        result = batchMeans(simulation.msg_stats, simulation.duration, warmup, batches, firstId=firstId, arrivals=arrivals)
+    except ValueError as error:
+        print(f"\nNo se pueden calcular las medias por lotes: {error}")
+        return
+
+    print("\n============================ MEDIAS POR LOTES ============================\n")
+    origin = "indicado" if warmup is not None else "estimado con MSER-5"
+    print(f"Calentamiento ({origin}): {result['warmup']:.2f} s, mensajes descartados: {result['discarded']} "
+          f"de {len(simulation.msg_stats)}")
+    batchLength = (result["cutoff"] - result["warmup"]) / result["batches"]
+    if result["cutoff"] < simulation.duration:
+        print(f"Corte en {result['cutoff']:.2f} s (último arribo antes del mensaje más antiguo que sigue en el sistema), "
+              f"mensajes finalizados excluidos: {result['excluded']}")
+        if simulation.duration - result["cutoff"] > batchLength:
+            print(f"Advertencia: el corte queda {simulation.duration - result['cutoff']:.2f} s antes del final; "
+                  "los mensajes que llegan tarde no terminan y la corrida no parece estacionaria")
+    print(f"Lotes: {result['batches']} de {batchLength:.2f} s\n")
+    for key, label in METRIC_LABELS.items():
+        mean, low, high, used = result["metrics"][key]
+        interval = f"({low:.2f}, {high:.2f})" if low is not None else "N/A (se requieren al menos 2 lotes)"
+        empty = f", {result['batches'] - used} sin mensajes de este grupo" if used < result["batches"] else ""
+        print(f"{label}: {mean:.2f} IC 95%: {interval} [{used} lotes{empty}]")
 
 def main():
     """
@@ -19,11 +127,18 @@ def main():
     # Argumento para duración total de la simulación
     parser.add_argument("--duration", type=int, default=100, help="Duración de la simulación en segundos.")
     
-    # Activa el modo lento para observar la simulación en detalle
+    # Activa el modo lento para observar la simulación en detalle (reproducción en tiempo real de los eventos)
     parser.add_argument("--slow", action="store_true", help="Activar modo lento para ver los mensajes.")
     
     # Tiempo de espera entre eventos en modo lento
     parser.add_argument("--sleeptime", type=float, default=1, help="Tiempo de espera entre mensajes (en segundos) en modo lento.")
+
+    # Reloj escalado del modo lento, en lugar de una pausa fija entre eventos
+    parser.add_argument("--speed", type=float, default=None,
+                        help="Segundos simulados por segundo real en modo lento (reemplaza a --sleeptime).")
+
+    # Grabar los eventos para reproducirlos luego con playback.py a cualquier velocidad
+    parser.add_argument("--record", default=None, help="Archivo donde se graban los eventos de las corridas (JSON Lines).")
     
     # Número de veces que se correrá la simulación
     parser.add_argument('--runs', type=int, default=1, help='Cantidad de veces que se corre la simulación')
@@ -34,35 +149,290 @@ def main():
     # Intervalo entre mediciones del monitoreo
     parser.add_argument("--monitorInterval", type=int, default=1, help="Intervalo de monitoreo en segundos.")
 
+    # Cantidad de procesos para repartir las corridas
+    parser.add_argument("--jobs", type=int, default=1, help="Cantidad de procesos para ejecutar las corridas en paralelo.")
+
+    # Semilla base de los generadores aleatorios, para poder reproducir las corridas
+    parser.add_argument("--seed", type=int, default=None, help="Semilla base de los generadores aleatorios (por defecto se genera una).")
+
+    # Número de la primera réplica, permite repetir una corrida específica sin ejecutar las anteriores
+    parser.add_argument("--replication", type=int, default=0, help="Número de réplica de la primera corrida (se usa junto con --seed).")
+
+    # Nivel de detalle de la salida de cada corrida
+    parser.add_argument("--verbosity", choices=["quiet", "summary", "trace"], default="trace",
+                        help="Detalle de la salida: quiet (nada), summary (mediciones) o trace (cada evento).")
+
+    # Conservar cada mensaje finalizado (por defecto solo se acumulan sus métricas)
+    parser.add_argument("--keepMessages", action="store_true", help="Guardar cada mensaje finalizado además de las métricas acumuladas.")
+
+    # Motor de simulación: SimPy (original), el calendario de eventos sin SimPy o las réplicas en lote con NumPy
+    parser.add_argument("--engine", choices=["simpy", "fast", "batch"], default="simpy",
+                        help="Motor de simulación: simpy (procesos de SimPy), fast (calendario de eventos, más rápido) "
+                             "o batch (todas las corridas juntas con NumPy, solo mediciones).")
+
+    # Medir el tiempo de cada fase de la simulación y guardar un perfil de funciones
+    parser.add_argument("--profile", action="store_true", help="Medir el tiempo de cada fase y guardar un perfil de cProfile.")
+    parser.add_argument("--profileOutput", default="simulacion.prof", help="Archivo donde se guarda el perfil de cProfile (con --profile).")
+
+    # Modo secuencial: se ejecutan corridas hasta que los intervalos alcanzan la precisión pedida
+    parser.add_argument("--target-halfwidth", type=float, default=None,
+                        help="Semiancho máximo de los intervalos de time_all, time_2, time_3 y time_3r (--runs pasa a ser el mínimo de corridas).")
+    parser.add_argument("--relative-precision", type=float, default=None,
+                        help="Semiancho máximo relativo a la media (por ejemplo 0.05 para un 5%%).")
+    parser.add_argument("--maxRuns", type=int, default=1000, help="Máximo de corridas en el modo secuencial.")
+
+    # Modo de medias por lotes: una sola corrida larga, sin el período de calentamiento
+    parser.add_argument("--batchMeans", action="store_true", help="Estimar las métricas con medias por lotes de una sola corrida larga.")
+    parser.add_argument("--warmup", type=float, default=None,
+                        help="Período de calentamiento en segundos (con --batchMeans; por defecto se estima con MSER-5).")
+    parser.add_argument("--batches", type=int, default=30, help="Cantidad de lotes (con --batchMeans).")
+
+    # Archivo con los parámetros del sistema (distribuciones, probabilidades y capacidades)
+    parser.add_argument("--scenario", default=None, help="Archivo de escenario JSON, TOML o YAML con los parámetros del sistema.")
+
+    # Cantidad de servidores de cada computadora (reemplaza la del escenario)
+    for n in (1, 2, 3):
+        parser.add_argument(f"--capacity{n}", type=int, default=None, help=f"Cantidad de servidores de la Computadora {n}.")
+
+    # Traza binaria con los eventos de cada mensaje, para analizarla luego con tracefile.py
+    parser.add_argument("--trace", default=None,
+                        help="Archivo de traza binaria (con varias corridas se agrega el número de corrida al nombre).")
+
+    # Exportación por columnas de las métricas de cada corrida (y opcionalmente de cada mensaje)
+    parser.add_argument("--output", default=None,
+                        help="Archivo donde se guardan las métricas de cada corrida (Parquet si está pyarrow, si no NPZ comprimido).")
+    parser.add_argument("--outputMessages", action="store_true",
+                        help="Guardar también cada mensaje finalizado en un segundo archivo (con --output, --jobs 1 y los motores simpy o fast).")
+    parser.add_argument("--outputChunk", type=int, default=10000, help="Filas por bloque escrito en el archivo de --output.")
+
+    # Métricas en vivo por HTTP, para seguir corridas largas sin mirar la consola
+    parser.add_argument("--metricsPort", type=int, default=None,
+                        help="Puerto local donde se exponen las métricas en vivo (formato Prometheus, en /metrics).")
+    parser.add_argument("--metricsInterval", type=float, default=1.0, help="Segundos entre publicaciones de las métricas en vivo.")
+
+    # Variables aleatorias generadas por bloques con NumPy en lugar de una llamada por evento
+    parser.add_argument("--blockSize", type=int, default=None,
+                        help="Tamaño de los bloques de variables aleatorias de NumPy (por defecto cada valor se pide por separado).")
+
+    # Fotos del estado del motor fast: para retomar una corrida larga o continuar desde un calentamiento
+    parser.add_argument("--checkpoint", default=None, help="Archivo donde se guarda una foto del estado al terminar la corrida (solo --engine fast).")
+    parser.add_argument("--checkpointInterval", type=float, default=None,
+                        help="Tiempo simulado entre fotos guardadas durante la corrida (con --checkpoint).")
+    parser.add_argument("--resume", default=None,
+                        help="Foto desde la que se continúa la corrida hasta --duration (solo --engine fast).")
+
+    # Granja de réplicas: este proceso coordina y las réplicas se ejecutan en trabajadores (farm.py) de otras máquinas
+    parser.add_argument("--farm", default=None, metavar="HOST:PUERTO",
+                        help="Repartir las corridas entre los trabajadores que se conecten a esta dirección (por ejemplo 0.0.0.0:5000).")
+    parser.add_argument("--farmWorkers", type=int, default=0, help="Trabajadores locales que se inician junto al coordinador (con --farm).")
+    parser.add_argument("--farmKey", default=DEFAULT_KEY, help="Clave compartida con los trabajadores (por defecto SIMULATION_FARM_KEY; obligatoria si no se escucha en 127.0.0.1).")
+    parser.add_argument("--farmTimeout", type=float, default=10.0,
+                        help="Segundos sin avisos tras los que un trabajador se da por perdido y sus corridas se reparten de nuevo.")
+
     # Parsear todos los argumentos pasados por consola
     args = parser.parse_args()
 
+    if args.jobs < 1:
+        parser.error("--jobs debe ser al menos 1")
+    if args.jobs > 1 and (args.slow or args.record):
+        parser.error("--slow y --record no se pueden combinar con --jobs mayor a 1")
+    if args.engine == "batch" and (args.slow or args.record):
+        parser.error("--slow y --record solo están disponibles con los motores simpy o fast")
+    if args.profile and (args.slow or args.record):
+        parser.error("--profile no se puede combinar con --slow ni --record")
+    if args.speed is not None and (not args.slow or args.speed <= 0):
+        parser.error("--speed debe ser mayor a 0 y se usa junto con --slow")
+    if args.engine == "batch" and args.jobs > 1:
+        parser.error("--engine batch ya ejecuta todas las corridas juntas, no se combina con --jobs")
+    if args.profile and (args.jobs > 1 or args.engine == "batch"):
+        parser.error("--profile solo está disponible con --jobs 1 y los motores simpy o fast")
+    sequentialStop = args.target_halfwidth is not None or args.relative_precision is not None
+    if sequentialStop and (args.jobs > 1 or args.engine == "batch"):
+        parser.error("--target-halfwidth y --relative-precision solo están disponibles con --jobs 1 y los motores simpy o fast")
+    if (args.target_halfwidth is not None and args.target_halfwidth <= 0) or \
+       (args.relative_precision is not None and args.relative_precision <= 0):
+        parser.error("--target-halfwidth y --relative-precision deben ser mayores a 0")
+    if sequentialStop and args.maxRuns < args.runs:
+        parser.error("--maxRuns no puede ser menor que --runs")
+
+    if args.batchMeans and (args.runs > 1 or args.engine == "batch" or sequentialStop):
+        parser.error("--batchMeans ejecuta una sola corrida larga con los motores simpy o fast")
+    if args.batchMeans and (args.slow or args.record):
+        parser.error("--batchMeans no muestra eventos, no se combina con --slow ni --record")
+    if args.trace and args.engine == "batch":
+        parser.error("--trace solo está disponible con los motores simpy o fast")
+    if args.batches < 2:
+        parser.error("--batches debe ser al menos 2")
+    if args.outputMessages and (not args.output or args.jobs > 1 or args.engine == "batch" or args.batchMeans):
+        parser.error("--outputMessages requiere --output, --jobs 1 y los motores simpy o fast")
+    if args.metricsPort is not None and (args.engine == "batch" or args.batchMeans):
+        parser.error("--metricsPort solo está disponible con los motores simpy o fast, sin --batchMeans")
+    if args.metricsInterval <= 0:
+        parser.error("--metricsInterval debe ser mayor a 0")
+    if args.blockSize is not None and args.blockSize < 1:
+        parser.error("--blockSize debe ser al menos 1")
+    if args.outputChunk < 1:
+        parser.error("--outputChunk debe ser al menos 1")
+    if (args.checkpoint or args.resume) and (args.engine != "fast" or args.runs > 1 or sequentialStop or args.batchMeans):
+        parser.error("--checkpoint y --resume ejecutan una sola corrida con --engine fast")
+    if args.resume and args.trace:
+        # Los mensajes que vienen de la foto no tienen su arribo en la traza
+        parser.error("--trace no se combina con --resume (la traza debe empezar en el instante 0)")
+    if args.farm and (args.engine == "batch" or args.profile or args.slow or args.record or sequentialStop
+                      or args.batchMeans or args.outputMessages or args.checkpoint or args.resume):
+        parser.error("--farm solo reparte corridas independientes de los motores simpy o fast (sin --profile, --slow, --record, "
+                     "--target-halfwidth, --batchMeans, --outputMessages, --checkpoint ni --resume)")
+    if args.farm:
+        try:
+            args.farm = parseAddress(args.farm)
+            args.farmKey = farmKey(args.farm, args.farmKey)
+        except ValueError as error:
+            parser.error(str(error))
+        if args.farmWorkers < 0 or args.farmTimeout <= 0:
+            parser.error("--farmWorkers no puede ser negativo y --farmTimeout debe ser mayor a 0")
+    if args.checkpointInterval is not None and (not args.checkpoint or args.checkpointInterval <= 0):
+        parser.error("--checkpointInterval debe ser mayor a 0 y se usa junto con --checkpoint")
+
+    # El escenario se lee una sola vez y se comparte con todas las corridas
+    customScenario = args.scenario is not None or any(getattr(args, f"capacity{n}") is not None for n in (1, 2, 3))
+    try:
+        args.scenario = Scenario.fromFile(args.scenario) if args.scenario else Scenario()
+        capacities = {f"capacity{n}": getattr(args, f"capacity{n}") for n in (1, 2, 3) if getattr(args, f"capacity{n}") is not None}
+        args.scenario = args.scenario.replace(**capacities)
+    except (OSError, ValueError, ImportError) as error:
+        parser.error(f"escenario inválido: {error}")
+    if args.engine == "batch" and args.scenario.capacities != (1, 1, 1):
+        parser.error("--engine batch solo admite un servidor por computadora")
+
+    # Al continuar una foto, la semilla y la réplica son las de la foto; el escenario también,
+    # salvo que se indique otro (una continuación con otros parámetros)
+    args.snapshot = None
+    if args.resume:
+        try:
+            args.snapshot = Snapshot.load(args.resume)
+        except (OSError, ValueError) as error:
+            parser.error(f"foto inválida: {error}")
+        if args.duration <= args.snapshot.time:
+            parser.error(f"--duration debe ser mayor al instante de la foto ({args.snapshot.time:.2f} s)")
+        args.seed, args.replication = args.snapshot.seed, args.snapshot.replication
+        if not customScenario:
+            args.scenario = args.snapshot.scenario
+        print(f"Continuando desde la foto {args.resume} en {args.snapshot.time:.2f} s")
+
+    # Si no se indica una semilla se genera una y se muestra, así cualquier corrida se puede repetir
+    if args.seed is None:
+        args.seed = newSeed()
+    print(f"Semilla base: {args.seed}")
+
+    # Parámetros con los que se construye cada simulación
+    params = vars(args)
+    # Los histogramas de percentiles de cada corrida se agrupan al final (el motor en lote no los calcula)
+    params["histograms"] = args.engine != "batch"
+
+    if args.batchMeans:
+        runBatchMeans(params, args.warmup, args.batches)
+        return
+
     # Lista para guardar los resultados de cada corrida de simulación
     all_results = []
 
+    # Los resultados se escriben en disco por bloques a medida que terminan las corridas
+    writer = ColumnarWriter(args.output, args.outputChunk) if args.output else None
+    messageWriter = None
+    if args.outputMessages:
+        root, _ = os.path.splitext(args.output)
+        messageWriter = ColumnarWriter(f"{root}-mensajes", args.outputChunk, writer.format)
+        params["keepMessages"] = True
+
+    # El servidor de métricas atiende las consultas en su propio hilo
+    metrics = None
+    if args.metricsPort is not None:
+        metrics = MetricsServer(args.metricsPort)
+        metrics.setProgress(completed=0, total=args.runs if not sequentialStop else args.maxRuns)
+        print(f"Métricas en vivo en http://{metrics.address[0]}:{metrics.address[1]}/metrics")
+
+    percentiles = PooledPercentiles()
+
+    def addResult(i, run_stats):
+        histograms = run_stats.pop("histograms", None)
+        if histograms is not None:
+            percentiles.add(histograms)
+        all_results.append(run_stats)
+        if writer is not None:
+            writer.append(dict(run=i, replication=args.replication + i, **run_stats))
+        if metrics is not None:
+            metrics.setProgress(completed=len(all_results))
+
     # --- BUCLE PRINCIPAL DE SIMULACIONES ---
-    for i in range(args.runs):
-        print(f"\n============================ EJECUCIÓN #{i+1} ============================\n")
-        
-        # Crear instancia de la simulación con los argumentos recibidos
-        simulation = Simulation(
-            args.duration,
-            slowMode=args.slow,
-            sleepTime=args.sleeptime,
-            monitor=args.monitor,
-            monitorInterval=args.monitorInterval
-        )
-
-        # Iniciar simulación
-        simulation.start()
+    if args.engine == "batch":
+        # Todas las corridas avanzan juntas; no hay eventos ni mediciones por corrida que mostrar
+        print(f"\nEjecutando {args.runs} corridas en lote...\n")
+        for i, run_stats in enumerate(runBatch(args.runs, args.duration, args.seed, args.replication,
+                                                  blockSize=args.blockSize or 1024, scenario=args.scenario)):
+            addResult(i, run_stats)
+    elif args.farm:
+        # Cada trabajador ejecuta réplicas completas y solo devuelve las métricas
+        print(f"\nRepartiendo {args.runs} corridas entre los trabajadores de la granja...\n")
+        for i, run_stats in runReplicationsFarm(args.runs, params, args.farm, args.farmKey, args.farmWorkers, args.farmTimeout):
+            print(f"Ejecución #{i+1} finalizada")
+            addResult(i, run_stats)
+    elif args.jobs > 1 and args.runs > 1:
+        # Cada proceso construye su propia simulación y solo devuelve las métricas
+        print(f"\nEjecutando {args.runs} corridas en {args.jobs} procesos...\n")
+        metricsQueue = None
+        if metrics is not None:
+            metricsQueue = multiprocessing.Queue()
+            metrics.listen(metricsQueue)
+        for i, run_stats in runReplicationsParallel(args.runs, params, args.jobs, metricsQueue, args.metricsInterval):
+            print(f"Ejecución #{i+1} finalizada")
+            addResult(i, run_stats)
+    else:
+        # Un solo perfilador para todas las corridas, así el desglose es del total
+        profiler = Profiler() if args.profile else None
+        publisher = MetricsPublisher(metrics.update, args.metricsInterval) if metrics is not None else None
+        checkpointer = Checkpointer(args.checkpoint, args.checkpointInterval) if args.checkpoint else None
+        # En modo lento los eventos se muestran con pausas (o con el reloj escalado de --speed)
+        # desde un consumidor aparte; la simulación nunca se detiene
+        playback = None
+        recorder = EventRecorder(args.record) if args.record else None
+        if args.slow or recorder is not None:
+            playback = Playback(args.speed, args.sleeptime if args.slow else 0)
+            if args.slow and sys.stdin.isatty():
+                print("Velocidad: escriba +, -, un número (segundos simulados por segundo) o p para pausar, y Enter\n")
+                playback.controlFromInput()
+        if sequentialStop:
+            stopRule = SequentialStop(args.target_halfwidth, args.relative_precision, minRuns=args.runs, maxRuns=args.maxRuns)
+            while stopRule.shouldContinue():
+                run_stats = runSequential(len(all_results), params, profiler, messageWriter, playback, recorder, publisher)
+                addResult(len(all_results), run_stats)
+                stopRule.add(run_stats)
+                print(f"Corrida #{len(all_results)}: {stopRule.progress()}")
+            reason = "se alcanzó la precisión pedida" if stopRule.reached() else "se agotó el máximo de corridas"
+            print(f"\nCorridas utilizadas: {len(all_results)} ({reason})")
+            # Los promedios e intervalos de abajo se calculan con las corridas que se usaron
+            args.runs = len(all_results)
+        else:
+            for i in range(args.runs):
+                addResult(i, runSequential(i, params, profiler, messageWriter, playback, recorder, publisher, checkpointer))
+        if profiler is not None:
+            print("\n============================ DESGLOSE POR FASE ============================\n")
+            print(profiler.report())
+            print(f"\nPerfil de cProfile guardado en {args.profileOutput} (abrir con `python -m pstats`)\n")
+            print(profiler.dump(args.profileOutput))
+        if checkpointer is not None:
+            print(f"\nFoto del estado guardada en {args.checkpoint} (continuar con `--resume {args.checkpoint}` "
+                  f"o ramificar con `python snapshot.py {args.checkpoint}`)")
+        if recorder is not None:
+            recorder.close()
+            print(f"\nEventos grabados en {args.record} (reproducir con `python playback.py {args.record} --speed 10`)")
 
-        # Mostrar estadísticas al final de la corrida
-        print("\n-----------------------------------")
-        print(f'Mediciones Ejecución #{i+1}')
-        print("-----------------------------------")
-        run_stats = simulation.showStats()  # Diccionario con estadísticas
+    if metrics is not None:
+        metrics.close()
 
-        all_results.append(run_stats)       # Guardar resultados para análisis posterior
+    for output in (writer, messageWriter):
+        if output is not None:
+            output.close()
+            print(f"\n{output.rows} filas guardadas en {output.path}")
 
     # --- CÁLCULO DE PROMEDIOS E INTERVALOS DE CONFIANZA SI HAY MÚLTIPLES CORRIDAS ---
     if args.runs > 1:
@@ -94,15 +464,16 @@ def main():
         print(f"Porcentaje de ocupación de la Computadora 2: {avg_stats['occ_2']:.2f}%")
         print(f"Porcentaje de ocupación de la Computadora 3: {avg_stats['occ_3']:.2f}%")
         print(f"Porcentaje del tiempo que trabajaron las tres computadoras juntas: {avg_stats['occ_all']:.2f}%")
+        # Colas ponderadas por tiempo (el motor en lote no las calcula)
+        if "lq_1" in avg_stats:
+            for n in (1, 2, 3):
+                print(f"Computadora {n}: Lq {avg_stats[f'lq_{n}']:.2f}, L {avg_stats[f'l_{n}']:.2f}, "
+                      f"rho {avg_stats[f'rho_{n}']:.2f}, largo máximo de la cola {avg_stats[f'maxq_{n}']:.2f}")
 
         # --- FUNCIÓN PARA CALCULAR INTERVALOS DE CONFIANZA ---
         def conf_interval(data, alpha=0.05):
-            if len(data) < 2:
-                return None  # No se puede calcular con solo una muestra
-            mean = np.mean(data)
-            s = sem(data)  # Error estándar de la media
-            ci = t.interval(1 - alpha, len(data) - 1, loc=mean, scale=s)
-            return ci
+            # None si no se puede calcular con solo una muestra
+            return interval(data, 1 - alpha)
 
         print("\n--- Intervalos de Confianza (95%) para el Tiempo Promedio en el Sistema ---")
 
@@ -122,6 +493,17 @@ def main():
         data_time_all = [res['time_all'] for res in all_results]
         ci_time_all = conf_interval(data_time_all)
         print(f"Tiempo promedio en el sistema (general): {f'({ci_time_all[0]:.2f}, {ci_time_all[1]:.2f})' if ci_time_all else 'N/A (se requieren al menos 2 corridas)'}")
+
+        # --- PERCENTILES DE TODAS LAS CORRIDAS AGRUPADAS ---
+        if len(percentiles):
+            print("\n--- Percentiles de todas las corridas agrupadas (IC 95% por remuestreo de corridas) ---")
+            pooled = percentiles.results()
+            for suffix, label in (("2", "Comp2->destino"), ("3", "Comp3->destino"), ("3r", "Comp3->rechazado"), ("all", "general")):
+                for name, description in (("time", "Tiempo en el sistema"), ("queue", "Tiempo en colas")):
+                    entry = pooled[f"{name}_{suffix}"]
+                    cells = [f"{label_} {value:.2f}" + (f" ({low:.2f}, {high:.2f})" if low is not None else "")
+                             for label_, (value, low, high) in ((key, entry[key]) for key in ("p50", "p95", "p99"))]
+                    print(f"{description} ({label}): {', '.join(cells)}, máximo {entry['max']:.2f}")
     
     # --- SOLO UNA CORRIDA ---
     elif args.runs == 1:
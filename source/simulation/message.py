@@ -1,10 +1,11 @@
 from enum import Enum
+from array import array
 import itertools
 
 class Computer(Enum):
     """
     Enumeración que representa los identificadores para cada computadora del sistema, se usa para evitar el
-    uso de enteros. 
+    uso de enteros.
     """
     COMPUTER_1 = 1
     COMPUTER_2 = 2
@@ -14,17 +15,23 @@ class Message:
     """
     Clase que representa los mensajes del sistema computadoras del sistema, permite llevar un control de las métricas.
 
+    Usa `__slots__` y un campo fijo por computadora (en lugar de diccionarios) para que cada mensaje
+    ocupe poca memoria y la actualización de tiempos no requiera buscar claves.
+
     Atributos:
         ID (int): Identificador único generado con `intertools`.
         origin (Enum Computer): Computadora de origen del mensaje.
         arrivalTime (float): Tiempo de llegada al sistema.
         timeWaiting(float): Tiempo total que espera el mensaje mientras es atendido ¿?.
         departureTime (float): Tiempo de salida del sistema.
-        queueTimes (dict): Tiempos acumulados en cola para cada computadora.
-        processingTimes (dict): Tiempos acumulados de procesamiento por cada computadora.
+        queueTime1, queueTime2, queueTime3 (float): Tiempos acumulados en cola para cada computadora.
+        processingTime1, processingTime2, processingTime3 (float): Tiempos acumulados de procesamiento por cada computadora.
         finalStatus (str): Estado final del mensaje: "sent" o "rejected".
     """
-    # Se le solicita al generador el 
+    __slots__ = ("ID", "origin", "timeWaiting", "arrivalTime", "departureTime",
+                 "queueTime1", "queueTime2", "queueTime3",
+                 "processingTime1", "processingTime2", "processingTime3", "finalStatus")
+    # Se le solicita al generador el
     _id_generator = itertools.count(0)
     # Constructor de la clase
     def __init__(self, origin):
@@ -33,7 +40,70 @@ class Message:
         self.timeWaiting = 0
         self.arrivalTime = 0
         self.departureTime = 0
-        self.queueTimes = { "Computer1": 0, "Computer2": 0, "Computer3": 0 }
-        self.processingTimes = {"Computer1": 0, "Computer2": 0, "Computer3": 0}
+        self.queueTime1 = 0
+        self.queueTime2 = 0
+        self.queueTime3 = 0
+        self.processingTime1 = 0
+        self.processingTime2 = 0
+        self.processingTime3 = 0
         self.finalStatus = None
 
+    # Tiempo total que el mensaje pasó en las colas de las tres computadoras
+    def totalQueueTime(self):
+        return self.queueTime1 + self.queueTime2 + self.queueTime3
+
+    # Vistas de solo lectura con el formato anterior (diccionarios por computadora)
+    @property
+    def queueTimes(self):
+        return {"Computer1": self.queueTime1, "Computer2": self.queueTime2, "Computer3": self.queueTime3}
+
+    @property
+    def processingTimes(self):
+        return {"Computer1": self.processingTime1, "Computer2": self.processingTime2, "Computer3": self.processingTime3}
+
+class MessageStore:
+    """
+    Clase que representa un almacén columnar de mensajes finalizados.
+
+    Cada atributo de los mensajes se guarda en una columna `array.array` de tipo fijo, por lo
+    que un mensaje guardado ocupa unos 80 bytes y no se conserva ningún objeto `Message`.
+
+    Atributos:
+        ID, origin, status, arrivalTime, departureTime, queueTime1..3, processingTime1..3 (array):
+            Columnas con los datos de cada mensaje; `origin` guarda el valor del Enum `Computer`
+            y `status` uno de `SENT` o `REJECTED`.
+    """
+    # Códigos del estado final en la columna `status`
+    SENT = 1
+    REJECTED = 2
+    STATUS_CODES = {"sent": SENT, "rejected": REJECTED}
+
+    COLUMNS = (("ID", "q"), ("origin", "b"), ("status", "b"), ("arrivalTime", "d"), ("departureTime", "d"),
+               ("queueTime1", "d"), ("queueTime2", "d"), ("queueTime3", "d"),
+               ("processingTime1", "d"), ("processingTime2", "d"), ("processingTime3", "d"))
+
+    def __init__(self):
+        for name, typecode in self.COLUMNS:
+            setattr(self, name, array(typecode))
+
+    def __len__(self):
+        return len(self.ID)
+
+    # Agrega un mensaje finalizado al almacén
+    def append(self, message):
+        self.ID.append(message.ID)
+        self.origin.append(message.origin.value)
+        self.status.append(self.STATUS_CODES.get(message.finalStatus, 0))
+        self.arrivalTime.append(message.arrivalTime)
+        self.departureTime.append(message.departureTime)
+        self.queueTime1.append(message.queueTime1)
+        self.queueTime2.append(message.queueTime2)
+        self.queueTime3.append(message.queueTime3)
+        self.processingTime1.append(message.processingTime1)
+        self.processingTime2.append(message.processingTime2)
+        self.processingTime3.append(message.processingTime3)
+
+    # Devuelve las columnas como arreglos de NumPy (sin copiar los datos)
+    def columns(self):
+        import numpy as np
+        return {name: np.frombuffer(getattr(self, name), dtype=typecode) for name, typecode in self.COLUMNS}
@@ -0,0 +1,243 @@
+import math
+
+from message import Computer
+
+# Percentiles que se informan de cada grupo de mensajes, además del máximo
+PERCENTILES = (("p50", 0.50), ("p95", 0.95), ("p99", 0.99))
+
+class RunningStat:
+    """
+    Clase que representa un acumulador en línea (método de Welford) de media y varianza.
+
+    Permite actualizar las estadísticas con cada valor nuevo en O(1) de tiempo y memoria,
+    sin guardar los valores observados.
+
+    Atributos:
+        count (int): Cantidad de valores acumulados.
+        mean (float): Media de los valores acumulados (0 si no hay valores).
+        m2 (float): Suma de los cuadrados de las diferencias con respecto a la media.
+    """
+    __slots__ = ("count", "mean", "m2")
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def add(self, value):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+    def variance(self):
+        # Varianza muestral, no se puede calcular con menos de dos valores
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+class LogHistogram:
+    """
+    Clase que representa un histograma de cubetas logarítmicas para estimar percentiles en
+    línea con memoria acotada (como los histogramas HDR).
+
+    Cada potencia de 2 se divide en `SUB_BUCKETS` cubetas de igual ancho, por lo que cada
+    percentil se obtiene con un error relativo de a lo sumo 1 / (2 * SUB_BUCKETS) (0,8%) y la
+    cantidad de cubetas depende solo del rango de los valores, no de cuántos hay. Agregar un
+    valor es O(1) y dos histogramas se combinan sumando sus cubetas (`merge`), por ejemplo
+    para obtener los percentiles de todas las réplicas juntas.
+
+    Atributos:
+        counts (dict): Cantidad de valores de cada cubeta positiva.
+        zeros (int): Cantidad de valores menores o iguales a 0.
+        count (int): Cantidad total de valores.
+        minimum, maximum (float): Menor y mayor valor exactos.
+    """
+    __slots__ = ("counts", "zeros", "count", "minimum", "maximum")
+    SUB_BUCKETS = 64
+
+    def __init__(self):
+        self.counts = {}
+        self.zeros = 0
+        self.count = 0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+
+    def add(self, value):
+        self.count += 1
+        if value > self.maximum:
+            self.maximum = value
+        if value < self.minimum:
+            self.minimum = value
+        if value <= 0:
+            self.zeros += 1
+            return
+        # value = mantissa * 2^exponent con 0.5 <= mantissa < 1
+        mantissa, exponent = math.frexp(value)
+        key = exponent * self.SUB_BUCKETS + int((mantissa - 0.5) * 2 * self.SUB_BUCKETS)
+        counts = self.counts
+        counts[key] = counts.get(key, 0) + 1
+
+    def merge(self, other):
+        for key, count in other.counts.items():
+            self.counts[key] = self.counts.get(key, 0) + count
+        self.zeros += other.zeros
+        self.count += other.count
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+        return self
+
+    # Punto medio de la cubeta `key`
+    @classmethod
+    def bucketValue(cls, key):
+        exponent, index = divmod(key, cls.SUB_BUCKETS)
+        return math.ldexp(0.5 + (index + 0.5) / (2 * cls.SUB_BUCKETS), exponent)
+
+    def quantile(self, q):
+        """
+        Percentil `q` (entre 0 y 1) con el criterio del rango más cercano; 0 si no hay valores.
+        """
+        if self.count == 0:
+            return 0.0
+        if q >= 1:
+            return self.maximum
+        rank = max(1, math.ceil(q * self.count))
+        seen = self.zeros
+        if rank <= seen:
+            return self.minimum if self.minimum < 0 else 0.0
+        for key in sorted(self.counts):
+            seen += self.counts[key]
+            if seen >= rank:
+                return min(max(self.bucketValue(key), self.minimum), self.maximum)
+        return self.maximum
+
+class CategoryStats:
+    """
+    Clase que representa las métricas acumuladas de un grupo de mensajes.
+
+    Atributos:
+        time (RunningStat): Tiempo en el sistema (`departureTime - arrivalTime`).
+        queue (RunningStat): Tiempo total en colas.
+        efficiency (RunningStat): Proporción del tiempo en el sistema que el mensaje pasó en colas.
+        timeHistogram, queueHistogram (LogHistogram): Distribución del tiempo en el sistema y en colas, para los percentiles.
+    """
+    __slots__ = ("time", "queue", "efficiency", "timeHistogram", "queueHistogram")
+
+    def __init__(self):
+        self.time = RunningStat()
+        self.queue = RunningStat()
+        self.efficiency = RunningStat()
+        self.timeHistogram = LogHistogram()
+        self.queueHistogram = LogHistogram()
+
+    def add(self, totalTime, queueTime):
+        self.time.add(totalTime)
+        self.queue.add(queueTime)
+        self.timeHistogram.add(totalTime)
+        self.queueHistogram.add(queueTime)
+        # Un mensaje con duración cero no pasó tiempo en colas
+        self.efficiency.add(queueTime / totalTime if totalTime > 0 else 0.0)
+
+class MessageStats:
+    """
+    Clase que acumula las métricas de los mensajes finalizados a medida que terminan.
+
+    Reemplaza el recorrido de la lista de mensajes al final de la simulación: cada mensaje
+    se agrega a su categoría y a la categoría general, y luego se puede descartar.
+
+    Atributos:
+        sent2 (CategoryStats): Mensajes de la Computadora 2 enviados al destino.
+        sent3 (CategoryStats): Mensajes de la Computadora 3 enviados al destino.
+        rejected3 (CategoryStats): Mensajes de la Computadora 3 rechazados.
+        all (CategoryStats): Todos los mensajes finalizados.
+    """
+    def __init__(self):
+        self.sent2 = CategoryStats()
+        self.sent3 = CategoryStats()
+        self.rejected3 = CategoryStats()
+        self.all = CategoryStats()
+
+    def add(self, message):
+        totalTime = message.departureTime - message.arrivalTime
+        queueTime = message.totalQueueTime()
+        if message.origin == Computer.COMPUTER_2:
+            if message.finalStatus == "sent":
+                self.sent2.add(totalTime, queueTime)
+        elif message.finalStatus == "sent":
+            self.sent3.add(totalTime, queueTime)
+        elif message.finalStatus == "rejected":
+            self.rejected3.add(totalTime, queueTime)
+        self.all.add(totalTime, queueTime)
+
+    def histograms(self):
+        """
+        Devuelve los histogramas de cada grupo por nombre de métrica (`time_2`, `queue_3r`,
+        `time_all`, ...), para combinarlos entre réplicas.
+        """
+        groups = (("2", self.sent2), ("3", self.sent3), ("3r", self.rejected3), ("all", self.all))
+        histograms = {}
+        for suffix, group in groups:
+            histograms[f"time_{suffix}"] = group.timeHistogram
+            histograms[f"queue_{suffix}"] = group.queueHistogram
+        return histograms
+
+    # Percentiles y máximo de cada histograma: `time_2_p50`, ..., `time_2_max`, ...
+    def percentileMetrics(self):
+        return percentileMetrics(self.histograms())
+
+def percentileMetrics(histograms):
+    metrics = {}
+    for name, histogram in histograms.items():
+        for label, q in PERCENTILES:
+            metrics[f"{name}_{label}"] = histogram.quantile(q)
+        metrics[f"{name}_max"] = histogram.quantile(1.0) if histogram.count else 0.0
+    return metrics
+
+class TimeWeighted:
+    """
+    Clase que representa un acumulador ponderado por tiempo (área bajo la curva) de una
+    cantidad entera que cambia en instantes discretos, como el largo de una cola.
+
+    Se actualiza solo cuando la cantidad cambia, con O(1) de trabajo, y permite obtener el
+    promedio en el tiempo de forma exacta (sin muestrear). El máximo solo considera valores
+    que se mantuvieron durante un tiempo positivo, así un mensaje que entra y sale de la cola
+    en el mismo instante no lo modifica.
+
+    Atributos:
+        value (int): Valor actual.
+        lastTime (float): Momento del último cambio.
+        area (float): Integral del valor desde `start` hasta `lastTime`.
+        maximum (int): Mayor valor mantenido durante un tiempo positivo hasta `lastTime`.
+        start (float): Comienzo del período medido (0, salvo que se llame a `restart`).
+    """
+    __slots__ = ("value", "lastTime", "area", "maximum", "start")
+
+    def __init__(self):
+        self.value = 0
+        self.lastTime = 0.0
+        self.area = 0.0
+        self.maximum = 0
+        self.start = 0.0
+
+    # Descarta lo acumulado hasta `now` y sigue midiendo desde ahí con el valor actual
+    def restart(self, now):
+        self.start = self.lastTime = now
+        self.area = 0.0
+        self.maximum = 0
+
+    def update(self, now, delta):
+        elapsed = now - self.lastTime
+        if elapsed > 0:
+            self.area += self.value * elapsed
+            if self.value > self.maximum:
+                self.maximum = self.value
+            self.lastTime = now
+        self.value += delta
+
+    # Promedio en el tiempo desde `start` hasta `now`
+    def mean(self, now):
+        if now <= self.start:
+            return 0.0
+        return (self.area + self.value * (now - self.lastTime)) / (now - self.start)
+
+    # Máximo hasta `now`, incluyendo el valor actual si se mantuvo un tiempo positivo
+    def max(self, now):
+        return max(self.maximum, self.value) if now > self.lastTime else self.maximum
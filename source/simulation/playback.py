@@ -0,0 +1,199 @@
+import argparse                     # Para manejar argumentos desde la línea de comandos
+import json
+import queue
+import sys
+import threading
+import time
+
+class Playback:
+    """
+    Clase que muestra una secuencia de eventos (tiempo simulado, línea) a ritmo de tiempo real.
+
+    La simulación no espera nunca: genera los eventos a toda velocidad y este consumidor los
+    va mostrando. Hay dos formas de marcar el ritmo:
+    - Con `speed`, un reloj escalado: `speed` segundos simulados por cada segundo real (por
+      ejemplo `speed=10` muestra 100 s simulados en 10 s).
+    - Sin `speed`, una pausa fija de `delay` segundos entre eventos (el antiguo `--sleeptime`).
+
+    La velocidad se puede cambiar durante la reproducción con `setSpeed` (o escribiendo en la
+    consola con `controlFromInput`) sin volver a ejecutar la simulación.
+
+    Atributos:
+        speed (float): Segundos simulados por segundo real, o `None` para usar `delay`.
+        delay (float): Pausa entre eventos cuando no se indica `speed`.
+        paused (bool): Si es verdadero, la reproducción se detiene hasta reanudarla.
+        stream: Archivo de salida. Si es `None` se usa el `sys.stdout` vigente al escribir.
+    """
+    def __init__(self, speed=None, delay=1.0, stream=None, clock=time.monotonic, sleep=time.sleep):
+        self.speed = speed
+        self.delay = delay
+        self.paused = False
+        self.stream = stream
+        self.clock = clock
+        self.sleep = sleep
+        self.lock = threading.Lock()
+        # Punto de referencia del reloj escalado: (tiempo simulado, tiempo real)
+        self.anchor = None
+
+    def setSpeed(self, speed):
+        with self.lock:
+            self.speed = speed
+            # Se vuelve a anclar el reloj para que el cambio no salte hacia adelante ni hacia atrás
+            self.anchor = None
+
+    def pause(self):
+        with self.lock:
+            self.paused = True
+
+    def resume(self):
+        with self.lock:
+            self.paused = False
+            self.anchor = None
+
+    # Espera hasta el momento real en que corresponde mostrar un evento de tiempo `simTime`
+    def wait(self, simTime):
+        while self.paused:
+            self.sleep(0.1)
+        with self.lock:
+            speed = self.speed
+            if speed is not None and (self.anchor is None or simTime < self.anchor[0]):
+                # Primer evento, cambio de velocidad o una corrida nueva (el tiempo vuelve a empezar)
+                self.anchor = (simTime, self.clock())
+            anchor = self.anchor
+        if speed is None:
+            if self.delay > 0:
+                self.sleep(self.delay)
+            return
+        remaining = anchor[1] + (simTime - anchor[0]) / speed - self.clock()
+        if remaining > 0:
+            self.sleep(remaining)
+
+    def show(self, simTime, line):
+        self.wait(simTime)
+        stream = self.stream if self.stream is not None else sys.stdout
+        stream.write(line + "\n")
+        stream.flush()
+
+    def play(self, events):
+        for simTime, line in events:
+            self.show(simTime, line)
+
+    def controlFromInput(self, source=None):
+        """
+        Permite cambiar la reproducción escribiendo en la consola (una orden por línea):
+        `+` duplica la velocidad, `-` la reduce a la mitad, un número la fija en ese valor,
+        `p` pausa y reanuda. Las órdenes se leen en un hilo aparte.
+        """
+        source = source if source is not None else sys.stdin
+
+        def listen():
+            for command in source:
+                command = command.strip()
+                current = self.speed if self.speed is not None else 1.0
+                if command == "+":
+                    self.setSpeed(current * 2)
+                elif command == "-":
+                    self.setSpeed(current / 2)
+                elif command == "p":
+                    if self.paused:
+                        self.resume()
+                    else:
+                        self.pause()
+                else:
+                    try:
+                        speed = float(command)
+                    except ValueError:
+                        continue
+                    if speed > 0:
+                        self.setSpeed(speed)
+
+        threading.Thread(target=listen, daemon=True).start()
+
+def liveEvents(simulation, queueSize=10000):
+    """
+    Ejecuta `simulation.start()` en un hilo aparte y devuelve sus eventos (tiempo simulado,
+    línea) a medida que se generan. La cola tiene lugar para `queueSize` eventos: si el
+    consumidor se atrasa, la simulación espera a que haya lugar en vez de acumularlos todos.
+    """
+    events = queue.Queue(maxsize=queueSize)
+    done = object()
+    errors = []
+    stopped = threading.Event()
+
+    def put(simTime, line):
+        # Si el consumidor dejó de leer, los eventos restantes se descartan
+        if not stopped.is_set():
+            events.put((simTime, line))
+
+    def produce():
+        try:
+            simulation.start()
+        except BaseException as error:
+            errors.append(error)
+        finally:
+            events.put(done)
+
+    simulation.log.sink = put
+    worker = threading.Thread(target=produce, daemon=True)
+    worker.start()
+    try:
+        while True:
+            event = events.get()
+            if event is done:
+                break
+            yield event
+    finally:
+        stopped.set()
+        # Se vacía la cola por si la simulación estaba esperando lugar
+        while worker.is_alive():
+            try:
+                events.get(timeout=0.1)
+            except queue.Empty:
+                pass
+        simulation.log.sink = None
+    if errors:
+        raise errors[0]
+
+class EventRecorder:
+    """
+    Clase que guarda los eventos (tiempo simulado, línea) en un archivo JSON Lines, para
+    reproducirlos después con `playback.py` a cualquier velocidad.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, "w", encoding="utf-8")
+
+    def write(self, simTime, line):
+        self.file.write(json.dumps([simTime, line], ensure_ascii=False) + "\n")
+
+    def close(self):
+        self.file.close()
+
+def readEvents(path):
+    with open(path, encoding="utf-8") as file:
+        for row in file:
+            simTime, line = json.loads(row)
+            yield simTime, line
+
+def main():
+    parser = argparse.ArgumentParser(description="Reproducción en tiempo real de los eventos grabados con --record.")
+    parser.add_argument("events", help="Archivo de eventos (generado con main.py --record).")
+    parser.add_argument("--speed", type=float, default=None,
+                        help="Segundos simulados por segundo real (por defecto se usa --delay entre eventos).")
+    parser.add_argument("--delay", type=float, default=0.5, help="Pausa en segundos entre eventos cuando no se indica --speed.")
+    parser.add_argument("--interactive", action="store_true",
+                        help="Cambiar la velocidad desde la consola: +, -, un número o p para pausar.")
+    args = parser.parse_args()
+    if args.speed is not None and args.speed <= 0:
+        parser.error("--speed debe ser mayor a 0")
+
+    playback = Playback(args.speed, args.delay)
+    if args.interactive:
+        playback.controlFromInput()
+    try:
+        playback.play(readEvents(args.events))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
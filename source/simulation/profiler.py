@@ -0,0 +1,141 @@
+import cProfile
+import io
+import pstats
+import time
+from collections import defaultdict
+
+class Profiler:
+    """
+    Clase que mide, por fases, en qué se va el tiempo de una simulación.
+
+    No hay ninguna verificación dentro de las computadoras ni de los motores: `instrument`
+    reemplaza, solo en la simulación indicada, los métodos y variables aleatorias de cada
+    fase por versiones que cuentan las llamadas y acumulan su tiempo de reloj. Sin `--profile`
+    no se instala nada, por lo que el costo es nulo. Además se acumula un `cProfile` de las
+    corridas, que se puede guardar como archivo de `pstats`.
+
+    Las fases que agrupan a otras (el proceso completo de cada computadora en SimPy, y la
+    llegada a la cola y el inicio y fin de procesamiento en el motor rápido) incluyen el
+    tiempo de las fases que ocurren dentro de ellas.
+
+    Atributos:
+        counts (dict): Cantidad de llamadas de cada fase.
+        times (dict): Tiempo de reloj acumulado de cada fase, en segundos.
+        profile (cProfile.Profile): Perfil de funciones de las corridas.
+    """
+    # Fases medidas
+    QUEUE = "espera en cola"
+    ARRIVAL = "sorteo de arribo"
+    SERVICE = "sorteo de servicio"
+    ROUTING = "decisión de ruta"
+    STATS = "registro de estadísticas"
+    LOGGING = "salida de eventos"
+
+    # Fase de cada fuente de `Variates`, según el comienzo de su nombre
+    STREAM_PHASES = {"arrival": ARRIVAL, "service": SERVICE, "routing": ROUTING}
+
+    def __init__(self):
+        self.counts = defaultdict(int)
+        self.times = defaultdict(float)
+        self.profile = cProfile.Profile()
+
+    # Devuelve `function` envuelta para contar sus llamadas y medir su tiempo en `phase`
+    def timed(self, phase, function):
+        counts, times, clock = self.counts, self.times, time.perf_counter
+        def wrapper(*args, **kwargs):
+            begin = clock()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                times[phase] += clock() - begin
+                counts[phase] += 1
+        return wrapper
+
+    # Igual que `timed` para funciones generadoras (procesos de SimPy): se mide cada tramo
+    # entre dos `yield`, no el tiempo simulado que el proceso pasa esperando
+    def timedGenerator(self, phase, function):
+        counts, times, clock = self.counts, self.times, time.perf_counter
+        def wrapper(*args, **kwargs):
+            generator = function(*args, **kwargs)
+            counts[phase] += 1
+            value = None
+            while True:
+                begin = clock()
+                try:
+                    event = generator.send(value)
+                except StopIteration:
+                    return
+                finally:
+                    times[phase] += clock() - begin
+                value = yield event
+        return wrapper
+
+    def timedRequest(self, request):
+        # Además del tiempo de la solicitud, cuenta los mensajes que no encontraron la computadora libre
+        counts = self.counts
+        timedRequest = self.timed(self.QUEUE, request)
+        def wrapper(*args, **kwargs):
+            event = timedRequest(*args, **kwargs)
+            if not event.triggered:
+                counts["mensajes que esperaron en cola"] += 1
+            return event
+        return wrapper
+
+    def instrument(self, simulation):
+        """
+        Instala las mediciones en `simulation` (motor de SimPy o motor rápido).
+        """
+        for name in ("notifyArrival", "notifyStart", "notifyEnd", "record_message"):
+            setattr(simulation, name, self.timed(self.STATS, getattr(simulation, name)))
+        for name in ("trace", "summary"):
+            setattr(simulation.log, name, self.timed(self.LOGGING, getattr(simulation.log, name)))
+
+        # Variables aleatorias (las computadoras y el motor rápido las piden a `simulation.variates`)
+        variates = simulation.variates
+        for name in variates.SOURCES:
+            phase = next(phase for prefix, phase in self.STREAM_PHASES.items() if name.startswith(prefix))
+            setattr(variates, name, self.timed(phase, getattr(variates, name)))
+
+        owners = [simulation, simulation.comp_1, simulation.comp_2, simulation.comp_3]
+
+        for computer in owners[1:]:
+            # Computadoras de SimPy: proceso de cada mensaje y solicitud del recurso
+            if hasattr(computer, "processMessage"):
+                phase = f"proceso completo de la Computadora {computer.id.value}"
+                computer.processMessage = self.timedGenerator(phase, computer.processMessage)
+            if hasattr(computer, "resource"):
+                computer.resource.request = self.timedRequest(computer.resource.request)
+        # Motor rápido: llegada a las colas e inicio y fin de cada procesamiento
+        if hasattr(simulation, "enqueue"):
+            simulation.enqueue = self.timed(self.QUEUE, simulation.enqueue)
+            simulation.startService = self.timed("inicio de procesamiento", simulation.startService)
+            simulation.finishService = self.timed("fin de procesamiento", simulation.finishService)
+
+    # Ejecuta `simulation.start()` con el perfil de funciones activo
+    def run(self, simulation):
+        self.profile.enable()
+        try:
+            simulation.start()
+        finally:
+            self.profile.disable()
+
+    def report(self):
+        """
+        Devuelve el desglose por fase como texto: llamadas, tiempo total y µs por llamada.
+        """
+        lines = [f"{'Fase':<45}{'Llamadas':>12}{'Tiempo (s)':>14}{'µs/llamada':>14}"]
+        for phase in sorted(self.counts, key=lambda phase: -self.times.get(phase, 0)):
+            count = self.counts[phase]
+            if phase in self.times:
+                total = self.times[phase]
+                lines.append(f"{phase:<45}{count:>12}{total:>14.4f}{total / count * 1e6 if count else 0:>14.2f}")
+            else:
+                lines.append(f"{phase:<45}{count:>12}")
+        return "\n".join(lines)
+
+    # Guarda el perfil de funciones en `path` y devuelve las funciones más costosas como texto
+    def dump(self, path, limit=15):
+        self.profile.dump_stats(path)
+        output = io.StringIO()
+        pstats.Stats(path, stream=output).sort_stats("cumulative").print_stats(limit)
+        return output.getvalue()
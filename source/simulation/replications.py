@@ -0,0 +1,101 @@
+import os
+from multiprocessing import Pool
+
+from eventlog import EventLog
+from simulation import Simulation
+from fastengine import FastSimulation
+from livemetrics import initWorker, workerPublisher
+from streams import RandomStreams
+
+# Motores de simulación disponibles, por nombre
+ENGINES = {"simpy": Simulation, "fast": FastSimulation}
+
+def buildSimulation(params, index=0):
+    """
+    Construye la simulación de la réplica `index` a partir de un diccionario de parámetros.
+
+    Se usa tanto en el camino secuencial como en los procesos trabajadores, de forma que
+    ambas formas de ejecución configuran la simulación exactamente igual. La réplica usa
+    los flujos aleatorios (semilla, `replication` + `index`), el motor indicado en `engine` y
+    el `Scenario` indicado en `scenario` (por defecto, el del enunciado) y la forma de obtener
+    las variables indicada en `variates` (ver `RandomStreams`), por bloques de `blockSize` si
+    se indica (ver `Variates`). Con una foto en `snapshot` la simulación continúa desde ella
+    hasta `duration` con el escenario indicado (ver `snapshot.Snapshot.restore`).
+    """
+    snapshot = params.get("snapshot")
+    if snapshot is not None:
+        return snapshot.restore(params["duration"], scenario=params.get("scenario"),
+                                verbosity=EventLog.LEVELS[params.get("verbosity", "trace")],
+                                monitor=params.get("monitor", False), tracePath=params.get("trace"))
+    engine = ENGINES[params.get("engine", "simpy")]
+    return engine(
+        params["duration"],
+        monitor=params.get("monitor", False),
+        monitorInterval=params.get("monitorInterval", 1),
+        seed=params.get("seed"),
+        replication=params.get("replication", 0) + index,
+        verbosity=EventLog.LEVELS[params.get("verbosity", "trace")],
+        keepMessages=params.get("keepMessages", False),
+        scenario=params.get("scenario"),
+        tracePath=tracePath(params.get("trace"), index, params.get("runs", 1)),
+        variates=params.get("variates", RandomStreams.PLAIN),
+        blockSize=params.get("blockSize")
+    )
+
+def tracePath(path, index, runs):
+    """
+    Devuelve el archivo de traza de la réplica `index`: `path` si hay una sola corrida, o
+    `path` con el número de corrida antes de la extensión (por ejemplo `traza-3.bin`).
+    """
+    if not path or runs <= 1:
+        return path
+    root, extension = os.path.splitext(path)
+    return f"{root}-{index + 1}{extension}"
+
+def runReplication(index, params):
+    """
+    Ejecuta la réplica número `index` dentro de un proceso trabajador.
+
+    La simulación se ejecuta en el nivel `quiet` (los procesos escribirían de forma
+    intercalada y no se construye ningún texto) y solo se devuelve el diccionario de
+    métricas de `showStats` (con `histograms` en los parámetros, también los histogramas de
+    percentiles de la corrida, en la clave `histograms`). Si el proceso se creó con `metricsQueue`, el estado de la
+    corrida se publica por ella mientras avanza (ver `livemetrics`).
+    """
+    simulation = buildSimulation(dict(params, verbosity="quiet"), index)
+    publisher = workerPublisher()
+    if publisher is not None:
+        publisher.attach(simulation, index)
+    simulation.start()
+    if publisher is not None:
+        publisher.publish(simulation)
+    stats = simulation.showStats()
+    if params.get("histograms"):
+        stats["histograms"] = simulation.stats.histograms()
+    return stats
+
+def _runReplicationTask(task):
+    # `Pool.imap` solo envía un argumento por tarea
+    index, params = task
+    return runReplication(index, params)
+
+def workerPool(jobs, metricsQueue=None, metricsInterval=1.0):
+    """
+    Crea el `Pool` de `jobs` procesos; con `metricsQueue` cada proceso publica por ella el
+    estado de sus corridas cada `metricsInterval` segundos.
+    """
+    if metricsQueue is None:
+        return Pool(processes=jobs)
+    return Pool(processes=jobs, initializer=initWorker, initargs=(metricsQueue, metricsInterval))
+
+def runReplicationsParallel(runs, params, jobs, metricsQueue=None, metricsInterval=1.0):
+    """
+    Reparte `runs` réplicas independientes entre `jobs` procesos.
+
+    Los resultados se devuelven en el orden de las réplicas (no en el orden en que
+    terminan), para que los promedios e intervalos coincidan con el camino secuencial.
+    """
+    tasks = [(i, params) for i in range(runs)]
+    with workerPool(jobs, metricsQueue, metricsInterval) as pool:
+        for i, run_stats in enumerate(pool.imap(_runReplicationTask, tasks)):
+            yield i, run_stats
@@ -0,0 +1,101 @@
+import json
+import os
+
+class Scenario:
+    """
+    Clase que representa los parámetros del sistema: distribuciones de arribo y de
+    procesamiento, probabilidades de enrutamiento y capacidad de cada computadora.
+
+    Los valores por defecto son los del enunciado, por lo que `Scenario()` reproduce el
+    sistema original. Un escenario se puede leer de un archivo JSON, TOML o YAML con
+    `fromFile`; el archivo puede tener los parámetros en el primer nivel o dentro de una
+    sección `scenario`.
+
+    Atributos:
+        arrivalMean2 (float): Media del tiempo exponencial entre arribos a la Computadora 2.
+        arrivalMin3, arrivalMode3, arrivalMax3 (float): Distribución triangular entre arribos a la Computadora 3.
+        serviceMean1, serviceSd1 (float): Distribución normal del procesamiento de la Computadora 1.
+        serviceMin2, serviceMax2 (float): Distribución uniforme del procesamiento de la Computadora 2.
+        serviceUniformMin3, serviceUniformMax3 (float): Rango del uniforme con el que se obtiene el
+            procesamiento de la Computadora 3 por el método de la inversa, (98 * U + 27) ^ (1/3).
+        returnProb2, returnProb3 (float): Probabilidad de que la Computadora 1 devuelva un mensaje a su origen.
+        rejectProb3 (float): Probabilidad de que la Computadora 3 rechace un mensaje.
+        capacity1, capacity2, capacity3 (int): Cantidad de servidores de cada computadora.
+    """
+    DEFAULTS = {
+        "arrivalMean2": 15,
+        "arrivalMin3": 2,
+        "arrivalMode3": 4,
+        "arrivalMax3": 10,
+        "serviceMean1": 3,
+        "serviceSd1": 1,
+        "serviceMin2": 5,
+        "serviceMax2": 10,
+        "serviceUniformMin3": 3,
+        "serviceUniformMax3": 5,
+        "returnProb2": 0.20,
+        "returnProb3": 0.50,
+        "rejectProb3": 0.75,
+        "capacity1": 1,
+        "capacity2": 1,
+        "capacity3": 1,
+    }
+
+    def __init__(self, **values):
+        unknown = set(values) - set(self.DEFAULTS)
+        if unknown:
+            raise ValueError(f"Parámetros de escenario desconocidos: {', '.join(sorted(unknown))}")
+        for name, default in self.DEFAULTS.items():
+            setattr(self, name, values.get(name, default))
+        for name in ("capacity1", "capacity2", "capacity3"):
+            if int(getattr(self, name)) != getattr(self, name) or getattr(self, name) < 1:
+                raise ValueError(f"{name} debe ser un entero mayor o igual a 1")
+            setattr(self, name, int(getattr(self, name)))
+        for name in ("returnProb2", "returnProb3", "rejectProb3"):
+            if not 0 <= getattr(self, name) <= 1:
+                raise ValueError(f"{name} debe estar entre 0 y 1")
+
+    def __eq__(self, other):
+        return isinstance(other, Scenario) and self.asDict() == other.asDict()
+
+    def __repr__(self):
+        changed = {name: value for name, value in self.asDict().items() if value != self.DEFAULTS[name]}
+        return f"Scenario({', '.join(f'{name}={value!r}' for name, value in changed.items())})"
+
+    def asDict(self):
+        return {name: getattr(self, name) for name in self.DEFAULTS}
+
+    # Devuelve una copia del escenario con algunos parámetros cambiados
+    def replace(self, **changes):
+        return Scenario(**dict(self.asDict(), **changes))
+
+    @property
+    def capacities(self):
+        return (self.capacity1, self.capacity2, self.capacity3)
+
+    @classmethod
+    def fromFile(cls, path):
+        config = loadConfig(path)
+        return cls(**config.get("scenario", config))
+
+def loadConfig(path):
+    """
+    Lee un archivo de configuración JSON, TOML o YAML (según su extensión) y devuelve su
+    contenido como diccionario. YAML requiere el paquete opcional `pyyaml`.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".json":
+        with open(path) as file:
+            return json.load(file)
+    if extension == ".toml":
+        import tomllib
+        with open(path, "rb") as file:
+            return tomllib.load(file)
+    if extension in (".yaml", ".yml"):
+        try:
+            import yaml
+        except ImportError:
+            raise ImportError("Para leer escenarios YAML se necesita el paquete pyyaml (pip install pyyaml)") from None
+        with open(path) as file:
+            return yaml.safe_load(file) or {}
+    raise ValueError(f"Formato de escenario no soportado: {extension} (use .json, .toml o .yaml)")
@@ -1,162 +1,278 @@
-import simpy
-import numpy as np
-import scipy as stats
+from abc import ABC, abstractmethod
 
-from scipy.stats import sem, t
+import simpy
 
 from computers.computer1 import Computer_1
 from computers.computer2 import Computer_2
 from computers.computer3 import Computer_3
 from message import *
+from streams import RandomStreams
+from variates import Variates
+from eventlog import EventLog
+from onlinestats import MessageStats, TimeWeighted
+from aggregation import storeMetrics
+from scenario import Scenario
+from tracefile import TraceWriter, ENQUEUE, START, FINISH, SENT, REJECTED
 
-class Simulation:
+class BaseSimulation(ABC):
     """
-    Clase que representa la simulación del sistema, se encarga de gestionar los recurso de SimPy.
-    
+    Clase base de los motores de simulación, con el registro de métricas que comparten.
+
+    Cada motor (SimPy o el motor rápido de `fastengine`) se encarga de avanzar el tiempo y
+    de mover los mensajes entre las computadoras; esta clase lleva los contadores de trabajo
+    conjunto, el registro de mensajes finalizados, el monitoreo y el cálculo de las mediciones.
+
     Atributos:
-        env (simpy.Environment): Entorno de simulación.
-        slowMode (bool): Si está activado, la simulación se ejecuta con retrasos simulados.
-        sleep (float): Tiempo en segundos para esperar en cada evento si slowMode está activo.
-        comp_1, comp_2, comp_3: Instancias de las tres computadoras simuladas.
+        comp_1, comp_2, comp_3: Computadoras del motor; deben tener `workTime`, `countMessages`,
+            `sendMessages` y `deniedMessages` según corresponda.
         duration (float): Duración total de la simulación.
         monitor (bool): Si es verdadero, indica que se debe imprimir la información del monitoreo (estado de colas y servidores).
         monitorInterval (int): Intervalo de tiempo que indica cada cuanto se debe monitorear el estado del sistema.  
         activeComp (int): cantidad de computadoras de que están trabajando en un momento determinado.
         startTogetherTime (float): tiempo de SimPy en que las 3 computadoras comenzaron a trabajar juntas por ultima vez.
         compTogetherTime (float): tiempo total durante el cual las tres computadoras han trabajado de manera simultanea.
+        completedServices (int): Cantidad de procesamientos terminados en las tres computadoras.
+        statsStart (float): Comienzo del período medido; es 0 salvo que se descarte lo anterior con `resetStats`.
+        streams (RandomStreams): Generadores aleatorios propios de esta simulación (uno por computadora y propósito).
+        variates (Variates): Variables aleatorias de cada fuente que usan las computadoras, obtenidas de `streams`.
+        log (EventLog): Salida de eventos y mediciones, con el nivel de detalle indicado en `verbosity`.
+        stats (MessageStats): Métricas de los mensajes finalizados, acumuladas a medida que terminan.
+        keepMessages (bool): Si es verdadero, además se guarda cada mensaje finalizado en `msg_stats` (un `MessageStore` columnar).
+        scenario (Scenario): Parámetros de las distribuciones, probabilidades y capacidades del sistema.
+        queueStats (list): `TimeWeighted` con la cantidad de mensajes en la cola de cada computadora.
+        serverStats (list): `TimeWeighted` con los servidores ocupados de cada computadora; una computadora
+            trabaja si tiene al menos uno ocupado.
+        traceWriter (TraceWriter): Traza binaria de los eventos de cada mensaje (None si no se pidió).
+
+    Las computadoras avisan cuando un mensaje llega a su cola (`notifyArrival`), comienza a
+    procesarse (`notifyStart`) y termina (`notifyEnd`); con esos avisos se actualizan los
+    acumuladores en O(1), sin muestrear el estado. El monitoreo solo lee sus valores actuales.
     """
-    def __init__(self, duration, slowMode=False, sleepTime=1, monitor=True, monitorInterval=1):
-        # Inicializar el ambiente de SimPy
-        self.env = simpy.Environment()
-        # para que la simulación sea accesible desde el `env` de SimPy
-        self.env.simulador = self
-        self.slowMode = slowMode
-        self.sleep = sleepTime
+    def __init__(self, duration, monitor=True, monitorInterval=1, seed=None, replication=0,
+                 verbosity=EventLog.TRACE, keepMessages=False, bufferSize=1000, scenario=None, tracePath=None,
+                 variates=RandomStreams.PLAIN, blockSize=None):
         self.monitorEnabled = monitor
         self.monitorInterval = monitorInterval
         # Variables para monitorear trabajo conjunto
         self.activeComputer = 0
         self.startTogetherTime = None
         self.compTogetherTime = 0
+        self.completedServices = 0
+        self.statsStart = 0
+
+        # Parámetros del sistema (por defecto, los del enunciado)
+        self.scenario = scenario if scenario is not None else Scenario()
+        # Flujos aleatorios independientes de esta réplica
+        self.streams = RandomStreams(seed, replication, variates)
+        # Variables aleatorias de cada fuente (por bloques de NumPy si se indica `blockSize`)
+        self.variates = Variates(self.streams, self.scenario, blockSize)
+        # Salida de eventos, con el tiempo simulado de cada línea para la reproducción en tiempo real
+        self.log = EventLog(verbosity, bufferSize=bufferSize, clock=lambda: self.now)
 
-        self.comp_1 = Computer_1(self.env, 1, self.slowMode, self.sleep)
-        self.comp_2 = Computer_2(self.env, 1, self.slowMode, self.sleep)
-        self.comp_3 = Computer_3(self.env, 1, self.slowMode, self.sleep)
         # Duración total de la simulación
         self.duration = duration
         # Estructura para recolectar los datos
-        # Tiempos de cada mensaje
-        self.msg_stats = [] 
-        # Tiempo ocupado en cada procesador
-        self.proc_busy_times = [0, 0, 0]
-        #Tiempo trabajando los tres juntos
-        self.proc_together_time = 0
+        # Métricas acumuladas de los mensajes (memoria constante)
+        self.stats = MessageStats()
+        # Tiempos de cada mensaje en formato columnar, solo si se pidió conservarlos
+        self.keepMessages = keepMessages
+        self.msg_stats = MessageStore()
+        # Largo de la cola y servidores ocupados de cada computadora, ponderados por tiempo
+        self.queueStats = [TimeWeighted() for _ in range(3)]
+        self.serverStats = [TimeWeighted() for _ in range(3)]
+        # Traza binaria de eventos, solo si se indicó un archivo
+        self.traceWriter = TraceWriter(tracePath, duration, self.scenario.capacities) if tracePath else None
+
     # Funcion para guardar el tiempo de un mensaje
     def record_message(self, msg_info):
-        self.msg_stats.append(msg_info)
-    def monitorSystem(self):
-        while True:
-            print(f"[{self.env.now:.2f} s][*Monitoreo*] "
-                f"Mensajes en colas C1: {len(self.comp_1.resource.queue)}; "
-                f"C2: {len(self.comp_2.resource.queue)}; "
-                f"C3: {len(self.comp_3.resource.queue)} | "
-                f"Estado C1: {'Ocupada' if self.comp_1.resource.count > 0 else 'Libre'}, "
-                f"C2: {'Ocupada' if self.comp_2.resource.count > 0 else 'Libre'}, "
-                f"C3: {'Ocupada' if self.comp_3.resource.count > 0 else 'Libre'} |\n"
-                f"\tTotal recibidos C2: {self.comp_2.countMessages}, "
-                f"Total recibidos C3: {self.comp_3.countMessages}, "
-                f"Total enviados C1: {self.comp_1.sendMessages}, "
-                f"Total rechazados C3: {self.comp_3.deniedMessages} |\n"
-                f"\tTiempo total trabajado por las tres computadoras: {self.env.simulador.comp_1.workTime + self.env.simulador.comp_2.workTime + self.env.simulador.comp_3.workTime:.2f} |\n"
-                f"\tTiempo en que las tres computadoras han trabajado en simultaneo: {self.compTogetherTime:.2f} |"
-                )
-            # Se espera `monitorInterval` tiempos antes de volver a monitorear el sistema
-            yield self.env.timeout(self.monitorInterval)
+        self.stats.add(msg_info)
+        if self.keepMessages:
+            self.msg_stats.append(msg_info)
+        if self.traceWriter is not None:
+            # Los mensajes se envían al destino desde la Computadora 1 y se rechazan en la Computadora 3
+            if msg_info.finalStatus == "sent":
+                self.traceWriter.write(msg_info.ID, msg_info.origin.value, SENT, 1, self.now)
+            else:
+                self.traceWriter.write(msg_info.ID, msg_info.origin.value, REJECTED, 3, self.now)
+
+    # Cantidad de mensajes esperando en la cola de `computer`
+    def queueLength(self, computer):
+        return self.queueStats[computer.id.value - 1].value
+
+    # Cantidad de mensajes que `computer` está procesando
+    def busyServers(self, computer):
+        return self.serverStats[computer.id.value - 1].value
+
+    # Estado de los servidores de una computadora para el monitoreo
+    def serverState(self, computer, capacity):
+        busy = self.busyServers(computer)
+        if capacity == 1:
+            return 'Ocupada' if busy > 0 else 'Libre'
+        return f'{busy}/{capacity} servidores ocupados'
+
+    # Imprime el estado actual del sistema
+    def monitorReport(self):
+        self.log.summary("[%.2f s][*Monitoreo*] "
+            "Mensajes en colas C1: %d; "
+            "C2: %d; "
+            "C3: %d | "
+            "Estado C1: %s, "
+            "C2: %s, "
+            "C3: %s |\n"
+            "\tTotal recibidos C2: %d, "
+            "Total recibidos C3: %d, "
+            "Total enviados C1: %d, "
+            "Total rechazados C3: %d |\n"
+            "\tTiempo total trabajado por las tres computadoras: %.2f |\n"
+            "\tTiempo en que las tres computadoras han trabajado en simultaneo: %.2f |",
+            self.now,
+            self.queueLength(self.comp_1),
+            self.queueLength(self.comp_2),
+            self.queueLength(self.comp_3),
+            self.serverState(self.comp_1, self.scenario.capacity1),
+            self.serverState(self.comp_2, self.scenario.capacity2),
+            self.serverState(self.comp_3, self.scenario.capacity3),
+            self.comp_2.countMessages,
+            self.comp_3.countMessages,
+            self.comp_1.sendMessages,
+            self.comp_3.deniedMessages,
+            self.comp_1.workTime + self.comp_2.workTime + self.comp_3.workTime,
+            self.compTogetherTime
+            )
+
+    # Función que utilizan las computadoras para indicarle a la simulación que un mensaje llegó a su cola
+    def notifyArrival(self, computer, message):
+        self.queueStats[computer.value - 1].update(self.now, 1)
+        if self.traceWriter is not None:
+            self.traceWriter.write(message.ID, message.origin.value, ENQUEUE, computer.value, self.now)
+
     # Función que utilizan las computadoras para indicarle a la simulación que comenzaron a procesar un mensaje 
-    def notifyStart(self):
-        self.activeComputer += 1
-        if self.activeComputer == 3:
-            self.startTogetherTime = self.env.now
+    # (con varios servidores, la computadora empieza a trabajar cuando se ocupa el primero)
+    def notifyStart(self, computer, message):
+        index = computer.value - 1
+        now = self.now
+        if self.traceWriter is not None:
+            self.traceWriter.write(message.ID, message.origin.value, START, computer.value, now)
+        self.queueStats[index].update(now, -1)
+        servers = self.serverStats[index]
+        servers.update(now, 1)
+        if servers.value == 1:
+            self.activeComputer += 1
+            if self.activeComputer == 3:
+                self.startTogetherTime = self.now
             
     # Función que utilizan las computadoras para indicarle a la simulación que terminaron de procesar un mensaje 
-    def notifyEnd(self):
-        if self.activeComputer == 3 and self.startTogetherTime is not None:
-            self.compTogetherTime += self.env.now - self.startTogetherTime
-            self.startTogetherTime = None
-        self.activeComputer -= 1
+    # (la computadora deja de trabajar cuando se libera su último servidor ocupado)
+    def notifyEnd(self, computer, message):
+        if self.traceWriter is not None:
+            self.traceWriter.write(message.ID, message.origin.value, FINISH, computer.value, self.now)
+        servers = self.serverStats[computer.value - 1]
+        servers.update(self.now, -1)
+        if servers.value == 0:
+            if self.activeComputer == 3 and self.startTogetherTime is not None:
+                self.compTogetherTime += self.now - self.startTogetherTime
+                self.startTogetherTime = None
+            self.activeComputer -= 1
+        self.completedServices += 1
+
+    # Cantidad de eventos procesados: arribos desde el exterior y procesamientos terminados
+    def eventCount(self):
+        return self.comp_2.countMessages + self.comp_3.countMessages + self.completedServices
+
+    @abstractmethod
+    def run(self):
+        """
+        Avanza la simulación hasta `duration`; cada motor (SimPy o el motor rápido) lo implementa.
+        """
 
     def start(self):
-        print("-----------------------------------")
-        print(f'[{self.env.now:.2f} s] Comienza la simulación')
-        print("-----------------------------------\n")
-        # Si el monitoreo está activo, se imprime el resultado cada `self.monitorInterval`
-        if self.monitorEnabled:
-            self.env.process(self.monitorSystem())
-        self.env.run(until=self.duration)
-        print("\n-----------------------------------")
-        print(f'[{self.env.now:.2f} s] Simulación finalizada')
-        print("-----------------------------------")
+        self.log.summary("-----------------------------------")
+        self.log.summary('[%.2f s] Comienza la simulación', self.now)
+        self.log.summary("-----------------------------------\n")
+        self.run()
+        if self.traceWriter is not None:
+            self.traceWriter.close()
+        self.log.summary("\n-----------------------------------")
+        self.log.summary('[%.2f s] Simulación finalizada', self.now)
+        self.log.summary("-----------------------------------")
+        self.log.flush()
+
+    # Descarta las mediciones acumuladas hasta ahora (por ejemplo, el calentamiento de una foto
+    # restaurada) sin tocar el estado del sistema: las métricas pasan a medirse desde `now`
+    def resetStats(self):
+        self.statsStart = self.now
+        self.stats = MessageStats()
+        self.msg_stats = MessageStore()
+        for computer in (self.comp_1, self.comp_2, self.comp_3):
+            computer.workTime = 0
+        self.compTogetherTime = 0
+        if self.startTogetherTime is not None:
+            self.startTogetherTime = self.now
+        for accumulator in self.queueStats + self.serverStats:
+            accumulator.restart(self.now)
+
+    # Tiempo sobre el que se calculan las métricas
+    def measuredTime(self):
+        return self.duration - self.statsStart
+
+    # Tiempo trabajado por servidor de cada computadora (con un servidor, el tiempo trabajado por la computadora)
+    def serverWorkTimes(self):
+        capacity1, capacity2, capacity3 = self.scenario.capacities
+        return (self.comp_1.workTime / capacity1, self.comp_2.workTime / capacity2, self.comp_3.workTime / capacity3)
+
+    # Largo promedio de la cola (Lq), mensajes promedio en la computadora (L), utilización por
+    # servidor (rho) y largo máximo de la cola de cada computadora, ponderados por tiempo
+    def queueMetrics(self):
+        metrics = {}
+        for n, capacity in enumerate(self.scenario.capacities, start=1):
+            queue, servers = self.queueStats[n - 1], self.serverStats[n - 1]
+            lq = queue.mean(self.duration)
+            busy = servers.mean(self.duration)
+            metrics[f"lq_{n}"] = lq
+            metrics[f"l_{n}"] = lq + busy
+            metrics[f"rho_{n}"] = busy / capacity
+            metrics[f"maxq_{n}"] = queue.max(self.duration)
+        return metrics
+
+    # Calcula las métricas de la corrida sin imprimirlas
+    def collectStats(self):
+        if self.keepMessages:
+            # Con los mensajes guardados, las métricas se calculan de forma vectorizada sobre sus columnas
+            stats = storeMetrics(self.msg_stats, self.serverWorkTimes(), self.compTogetherTime, self.measuredTime())
+            stats.update(self.queueMetrics())
+            stats.update(self.stats.percentileMetrics())
+            return stats
+
+        # Grupos de mensajes, acumulados durante la simulación
+        msgs_2_sent = self.stats.sent2
+        msgs_3_sent = self.stats.sent3
+        msgs_3_rej  = self.stats.rejected3
+        all_msgs    = self.stats.all
 
-    def showStats(self):
-        # Agrupar mensajes por tipo
-        msgs_2_sent = [m for m in self.msg_stats if m.origin == Computer.COMPUTER_2 and m.finalStatus == "sent"]
-        msgs_3_sent = [m for m in self.msg_stats if m.origin == Computer.COMPUTER_3 and m.finalStatus == "sent"]
-        msgs_3_rej  = [m for m in self.msg_stats if m.origin == Computer.COMPUTER_3 and m.finalStatus == "rejected"]
-        all_msgs    = self.msg_stats
-
-        def avg_time(msgs): return np.mean([m.departureTime - m.arrivalTime for m in msgs]) if msgs else 0
-        def avg_queue(msgs): return np.mean([sum(m.queueTimes.values()) for m in msgs]) if msgs else 0
-        def efficiency(msgs): 
-            t_total = [m.departureTime - m.arrivalTime for m in msgs]
-            t_queue = [sum(m.queueTimes.values()) for m in msgs]
-            return np.mean(np.array(t_queue)/np.array(t_total)) if msgs else 0
         # Tiempos promedios
-        time_2 = avg_time(msgs_2_sent)
-        time_3 = avg_time(msgs_3_sent)
-        time_3r = avg_time(msgs_3_rej)
-        time_all = avg_time(all_msgs)
+        time_2 = msgs_2_sent.time.mean
+        time_3 = msgs_3_sent.time.mean
+        time_3r = msgs_3_rej.time.mean
+        time_all = all_msgs.time.mean
         # Tiempos en colas
-        queue_2 = avg_queue(msgs_2_sent)
-        queue_3 = avg_queue(msgs_3_sent)
-        queue_3r = avg_queue(msgs_3_rej)
-        queue_all = avg_queue(all_msgs)
+        queue_2 = msgs_2_sent.queue.mean
+        queue_3 = msgs_3_sent.queue.mean
+        queue_3r = msgs_3_rej.queue.mean
+        queue_all = all_msgs.queue.mean
         # Coeficientes de eficiencia
-        eff_2 = efficiency(msgs_2_sent)
-        eff_3 = efficiency(msgs_3_sent)
-        eff_3r = efficiency(msgs_3_rej)
-        eff_all = efficiency(all_msgs)
-        # Porcentaje de ocupaciones 
-        occ_1 = (self.comp_1.workTime / self.duration) * 100
-        occ_2 = (self.comp_2.workTime / self.duration) * 100
-        occ_3 = (self.comp_3.workTime / self.duration) * 100
-        occ_all = (self.compTogetherTime / self.duration) * 100
+        eff_2 = msgs_2_sent.efficiency.mean
+        eff_3 = msgs_3_sent.efficiency.mean
+        eff_3r = msgs_3_rej.efficiency.mean
+        eff_all = all_msgs.efficiency.mean
+        # Porcentaje de ocupaciones (por servidor)
+        serverWork_1, serverWork_2, serverWork_3 = self.serverWorkTimes()
+        measured = self.measuredTime()
+        occ_1 = (serverWork_1 / measured) * 100
+        occ_2 = (serverWork_2 / measured) * 100
+        occ_3 = (serverWork_3 / measured) * 100
+        occ_all = (self.compTogetherTime / measured) * 100
 
-        # Imprimir estadísticas de la corrida
-        print("Tiempo promedio en el sistema (Comp2->destino):", time_2)
-        print("Tiempo promedio en el sistema (Comp3->destino):", time_3)
-        print("Tiempo promedio en el sistema (Comp3->rechazado):", time_3r)
-        print("Tiempo promedio en el sistema (general):", time_all)
-
-        print("Tiempo promedio en colas (Comp2->destino):", queue_2)
-        print("Tiempo promedio en colas (Comp3->destino):", queue_3)
-        print("Tiempo promedio en colas (Comp3->rechazado):", queue_3r)
-        print("Tiempo promedio en colas (general):", queue_all)
-
-        print("Coeficiente eficiencia (Comp2->destino):", eff_2)
-        print("Coeficiente eficiencia (Comp3->destino):", eff_3)
-        print("Coeficiente eficiencia (Comp3->rechazado):", eff_3r)
-        print("Coeficiente eficiencia (general):", eff_all)
-
-        print(f"Tiempo de ocupación de la Computadora 1: {self.comp_1.workTime:.2f}")
-        print(f"Tiempo de ocupación de la Computadora 2: {self.comp_2.workTime:.2f}")
-        print(f"Tiempo de ocupación de la Computadora 3: {self.comp_3.workTime:.2f}")
-        print(f"Porcentaje de ocupación de la Computadora 1: {occ_1:.2f}%")
-        print(f"Porcentaje de ocupación de la Computadora 2: {occ_2:.2f}%")
-        print(f"Porcentaje de ocupación de la Computadora 3: {occ_3:.2f}%")
-        print(f"Tiempo en que trabajaron las tres computadoras juntas: {self.compTogetherTime:.2f}")
-        print(f"Porcentaje del tiempo que trabajaron las tres computadoras juntas: {occ_all:.2f}%")
-
-        return {
+        stats = {
             "time_2": time_2,
             "time_3": time_3,
             "time_3r": time_3r,
@@ -174,23 +290,91 @@ class Simulation:
             "occ_3": occ_3,
             "occ_all": occ_all,
         }
-        
-        '''
-        # Intervalos de confianza para el tiempo promedio en el sistema
-        def conf_interval(data, alpha=0.05):
-            if len(data) < 2: return (0, 0)
-            mean = np.mean(data)
-            s = sem(data)
-            ci = t.interval(1-alpha, len(data)-1, loc=mean, scale=s)
-            return ci
-
-        times_2_sent = [m.departureTime - m.arrivalTime for m in msgs_2_sent]
-        times_3_sent = [m.departureTime - m.arrivalTime for m in msgs_3_sent]
-        times_3_rej  = [m.departureTime - m.arrivalTime for m in msgs_3_rej]
-        times_all    = [m.departureTime - m.arrivalTime for m in all_msgs]
-
-        print("IC 95% tiempo promedio (Comp2->destino):", conf_interval(times_2_sent))
-        print("IC 95% tiempo promedio (Comp3->destino):", conf_interval(times_3_sent))
-        print("IC 95% tiempo promedio (Comp3->rechazado):", conf_interval(times_3_rej))
-        print("IC 95% tiempo promedio (general):", conf_interval(times_all))
-        '''
+        stats.update(self.queueMetrics())
+        # Percentiles del tiempo en el sistema y en colas, de los histogramas acumulados
+        stats.update(self.stats.percentileMetrics())
+        return stats
+
+    def showStats(self):
+        stats = self.collectStats()
+
+        # Imprimir estadísticas de la corrida
+        self.log.summary("Tiempo promedio en el sistema (Comp2->destino): %s", stats["time_2"])
+        self.log.summary("Tiempo promedio en el sistema (Comp3->destino): %s", stats["time_3"])
+        self.log.summary("Tiempo promedio en el sistema (Comp3->rechazado): %s", stats["time_3r"])
+        self.log.summary("Tiempo promedio en el sistema (general): %s", stats["time_all"])
+
+        self.log.summary("Tiempo promedio en colas (Comp2->destino): %s", stats["queue_2"])
+        self.log.summary("Tiempo promedio en colas (Comp3->destino): %s", stats["queue_3"])
+        self.log.summary("Tiempo promedio en colas (Comp3->rechazado): %s", stats["queue_3r"])
+        self.log.summary("Tiempo promedio en colas (general): %s", stats["queue_all"])
+
+        self.log.summary("Coeficiente eficiencia (Comp2->destino): %s", stats["eff_2"])
+        self.log.summary("Coeficiente eficiencia (Comp3->destino): %s", stats["eff_3"])
+        self.log.summary("Coeficiente eficiencia (Comp3->rechazado): %s", stats["eff_3r"])
+        self.log.summary("Coeficiente eficiencia (general): %s", stats["eff_all"])
+
+        self.log.summary("Tiempo de ocupación de la Computadora 1: %.2f", self.comp_1.workTime)
+        self.log.summary("Tiempo de ocupación de la Computadora 2: %.2f", self.comp_2.workTime)
+        self.log.summary("Tiempo de ocupación de la Computadora 3: %.2f", self.comp_3.workTime)
+        self.log.summary("Porcentaje de ocupación de la Computadora 1: %.2f%%", stats["occ_1"])
+        self.log.summary("Porcentaje de ocupación de la Computadora 2: %.2f%%", stats["occ_2"])
+        self.log.summary("Porcentaje de ocupación de la Computadora 3: %.2f%%", stats["occ_3"])
+        self.log.summary("Tiempo en que trabajaron las tres computadoras juntas: %.2f", self.compTogetherTime)
+        self.log.summary("Porcentaje del tiempo que trabajaron las tres computadoras juntas: %.2f%%", stats["occ_all"])
+        for n in (1, 2, 3):
+            self.log.summary("Computadora %d: largo promedio de la cola (Lq): %.2f, mensajes promedio (L): %.2f, "
+                             "utilización por servidor (rho): %.2f, largo máximo de la cola: %d",
+                             n, stats[f"lq_{n}"], stats[f"l_{n}"], stats[f"rho_{n}"], stats[f"maxq_{n}"])
+        for suffix, label in (("2", "Comp2->destino"), ("3", "Comp3->destino"), ("3r", "Comp3->rechazado"), ("all", "general")):
+            for name, description in (("time", "el sistema"), ("queue", "colas")):
+                metric = f"{name}_{suffix}"
+                self.log.summary("Percentiles del tiempo en %s (%s): p50 %.2f, p95 %.2f, p99 %.2f, máximo %.2f",
+                                 description, label, stats[f"{metric}_p50"], stats[f"{metric}_p95"],
+                                 stats[f"{metric}_p99"], stats[f"{metric}_max"])
+        self.log.flush()
+
+        return stats
+
+class Simulation(BaseSimulation):
+    """
+    Clase que representa la simulación del sistema, se encarga de gestionar los recurso de SimPy.
+    
+    Atributos:
+        env (simpy.Environment): Entorno de simulación.
+        comp_1, comp_2, comp_3: Instancias de las tres computadoras simuladas.
+
+    El resto de atributos (métricas, monitoreo, flujos aleatorios y salida) se describen en `BaseSimulation`.
+    """
+    def __init__(self, duration, monitor=True, monitorInterval=1, seed=None, replication=0,
+                 verbosity=EventLog.TRACE, keepMessages=False, scenario=None, tracePath=None, variates=RandomStreams.PLAIN,
+                 blockSize=None):
+        super().__init__(duration, monitor, monitorInterval, seed, replication, verbosity, keepMessages,
+                         scenario=scenario, tracePath=tracePath, variates=variates, blockSize=blockSize)
+        # Inicializar el ambiente de SimPy
+        self.env = simpy.Environment()
+        # para que la simulación sea accesible desde el `env` de SimPy
+        self.env.simulador = self
+
+        capacity1, capacity2, capacity3 = self.scenario.capacities
+        self.comp_1 = Computer_1(self.env, capacity1, self.variates, self.log, self.scenario)
+        self.comp_2 = Computer_2(self.env, capacity2, self.variates, self.log, self.scenario)
+        self.comp_3 = Computer_3(self.env, capacity3, self.variates, self.log, self.scenario)
+
+    # Tiempo actual de SimPy
+    @property
+    def now(self):
+        return self.env.now
+
+    def monitorSystem(self):
+        while True:
+            self.monitorReport()
+            # Se espera `monitorInterval` tiempos antes de volver a monitorear el sistema
+            yield self.env.timeout(self.monitorInterval)
+
+    def run(self):
+        # Si el monitoreo está activo, se imprime el resultado cada `self.monitorInterval`
+        # (en el nivel `quiet` no se muestra, por lo que no se agenda el proceso)
+        if self.monitorEnabled and self.log.summaryEnabled:
+            self.env.process(self.monitorSystem())
+        self.env.run(until=self.duration)
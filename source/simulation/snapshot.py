@@ -0,0 +1,298 @@
+import argparse                     # Para manejar argumentos desde la línea de comandos
+import copy
+import itertools
+import json
+import os
+import pickle
+from collections import deque
+
+from message import Message
+from eventlog import EventLog
+from fastengine import FastSimulation
+from replications import workerPool
+from sweep import summarize, SUMMARY_METRICS
+from variance import parseAssignments
+
+# Se incrementa cuando cambia el contenido de las fotos, para no restaurar archivos viejos
+SNAPSHOT_VERSION = 2
+
+class Snapshot:
+    """
+    Clase que representa una foto del estado de una simulación del motor rápido en un instante.
+
+    Guarda todo lo necesario para continuar la simulación desde ese instante: el contenido de
+    la cola de cada computadora, los mensajes en procesamiento con su tiempo de finalización,
+    los próximos arribos desde el exterior, los contadores, `workTime`, `compTogetherTime`, las
+    métricas acumuladas y el estado de los generadores aleatorios. Son solo datos (no hay
+    procesos generadores como en SimPy), por lo que se puede guardar en disco con `save` o
+    enviar a otros procesos.
+
+    A partir de una misma foto se pueden lanzar varias continuaciones con `restore`, por
+    ejemplo con otras probabilidades o capacidades, sin repetir el calentamiento.
+
+    Atributos:
+        time (float): Instante de la foto.
+        duration (float): Duración con la que se creó la simulación original.
+        seed (int), replication (int), variates (str), blockSize (int): Flujos aleatorios de la simulación.
+        scenario (Scenario): Escenario de la simulación original.
+        stations (list): Estado de cada computadora (servidores ocupados, cola y contadores).
+        events (list): Eventos pendientes en orden: (tiempo, tipo, computadora, mensaje, reproceso, duración).
+        state (dict): Contadores de trabajo conjunto, métricas acumuladas y estado aleatorio.
+    """
+    def __init__(self, time, duration, seed, replication, variates, blockSize, scenario, monitorInterval,
+                 keepMessages, stations, events, state):
+        self.version = SNAPSHOT_VERSION
+        self.time = time
+        self.duration = duration
+        self.seed = seed
+        self.replication = replication
+        self.variates = variates
+        self.blockSize = blockSize
+        self.scenario = scenario
+        self.monitorInterval = monitorInterval
+        self.keepMessages = keepMessages
+        self.stations = stations
+        self.events = events
+        self.state = state
+
+    @classmethod
+    def capture(cls, simulation):
+        """
+        Copia el estado actual de `simulation` (un `FastSimulation`). La simulación puede seguir
+        avanzando después sin modificar la foto.
+        """
+        if not isinstance(simulation, FastSimulation):
+            raise ValueError("Solo se pueden tomar fotos del motor fast (los procesos de SimPy no se pueden copiar)")
+        stations = (simulation.comp_1, simulation.comp_2, simulation.comp_3)
+        index = {station: i for i, station in enumerate(stations)}
+        # El monitoreo y los puntos de control no son parte del sistema, se vuelven a agendar al continuar
+        pending = sorted(event for event in simulation.calendar
+                         if event[2] not in (FastSimulation.MONITOR, FastSimulation.CHECKPOINT))
+        events = [(time, kind, index.get(station), message, reprocess, serviceTime)
+                  for time, _, kind, station, message, reprocess, serviceTime in pending]
+        stationStates = [{"busy": station.busy, "queue": list(station.queue), "workTime": station.workTime,
+                          "countMessages": station.countMessages, "sendMessages": station.sendMessages,
+                          "deniedMessages": station.deniedMessages} for station in stations]
+        state = {
+            "activeComputer": simulation.activeComputer,
+            "startTogetherTime": simulation.startTogetherTime,
+            "compTogetherTime": simulation.compTogetherTime,
+            "completedServices": simulation.completedServices,
+            "statsStart": simulation.statsStart,
+            "stats": simulation.stats,
+            "msg_stats": simulation.msg_stats,
+            "queueStats": simulation.queueStats,
+            "serverStats": simulation.serverStats,
+            "random": simulation.variates.getstate(),
+            "nextMessageID": nextMessageID(),
+        }
+        # Una sola copia profunda, así cada mensaje sigue siendo el mismo objeto en la cola o el calendario
+        stationStates, events, state = copy.deepcopy((stationStates, events, state))
+        streams = simulation.streams
+        return cls(simulation.now, simulation.duration, streams.seed, streams.replication, streams.variates,
+                   simulation.variates.blockSize, simulation.scenario, simulation.monitorInterval,
+                   simulation.keepMessages, stationStates, events, state)
+
+    def restore(self, duration, scenario=None, branch=None, resetStats=False, verbosity=EventLog.QUIET,
+                monitor=False, tracePath=None):
+        """
+        Crea un `FastSimulation` que continúa desde la foto hasta `duration`.
+
+        Con `scenario` la continuación usa otros parámetros (capacidades, probabilidades o
+        distribuciones); si tiene más servidores, los mensajes en cola empiezan a procesarse al
+        continuar, y si tiene menos, los que están en procesamiento terminan igual. Sin `branch`
+        se reponen los generadores aleatorios, por lo que todas las continuaciones usan los
+        mismos números y, con el mismo escenario, el resultado es idéntico a no haberse
+        detenido (con bloques y otro escenario se descartan los valores que quedaban del
+        bloque, ya transformados con el escenario de la foto). Con `branch` (un entero) la continuación usa flujos propios e independientes.
+        Con `resetStats` las métricas se miden solo desde el instante de la foto.
+        """
+        if duration < self.time:
+            raise ValueError(f"La continuación debe terminar después de la foto ({self.time:.2f} s)")
+        replication = self.replication if branch is None else f"{self.replication}.{branch}"
+        simulation = FastSimulation(duration, monitor, self.monitorInterval, self.seed, replication, verbosity,
+                                    self.keepMessages, scenario if scenario is not None else self.scenario,
+                                    tracePath, self.variates, self.blockSize)
+        stationStates, events, state = copy.deepcopy((self.stations, self.events, self.state))
+        stations = (simulation.comp_1, simulation.comp_2, simulation.comp_3)
+        simulation.now = self.time
+        for station, stationState in zip(stations, stationStates):
+            for name, value in stationState.items():
+                setattr(station, name, value)
+            station.queue = deque(station.queue)
+        for time, kind, index, message, reprocess, serviceTime in events:
+            simulation.schedule(time, kind, stations[index] if index is not None else None, message, reprocess, serviceTime)
+        for name in ("activeComputer", "startTogetherTime", "compTogetherTime", "completedServices", "statsStart",
+                     "stats", "msg_stats", "queueStats", "serverStats"):
+            setattr(simulation, name, state[name])
+        if branch is None:
+            # Los bloques pendientes se generaron con el escenario de la foto, con otro se descartan
+            sameScenario = scenario is None or scenario == self.scenario
+            simulation.variates.setstate(state["random"], keepBlocks=sameScenario)
+        setNextMessageID(state["nextMessageID"])
+        if resetStats:
+            simulation.resetStats()
+            # `workTime` suma cada procesamiento al terminar: de los que están en curso solo se mide lo que falta
+            for time, kind, index, _, _, serviceTime in events:
+                if kind == FastSimulation.DEPARTURE:
+                    stations[index].workTime -= serviceTime - (time - self.time)
+        # Servidores agregados por el escenario de la continuación
+        for station in stations:
+            while station.queue and station.busy < station.capacity:
+                simulation.startService(station, *station.queue.popleft())
+        return simulation
+
+    # Mensajes en procesamiento: (computadora, mensaje, tiempo restante)
+    def inService(self):
+        return [(index + 1, message, time - self.time) for time, kind, index, message, _, _ in self.events
+                if kind == FastSimulation.DEPARTURE]
+
+    # Próximos arribos desde el exterior: (computadora, tiempo)
+    def pendingArrivals(self):
+        computers = {FastSimulation.ARRIVAL_2: 2, FastSimulation.ARRIVAL_3: 3}
+        return [(computers[kind], time) for time, kind, *_ in self.events if kind in computers]
+
+    def describe(self):
+        lines = [f"Foto en {self.time:.2f} s (semilla {self.seed}, réplica {self.replication}), {self.scenario!r}"]
+        for n, station in enumerate(self.stations, start=1):
+            lines.append(f"Computadora {n}: {len(station['queue'])} en cola, {station['busy']} en procesamiento, "
+                         f"tiempo trabajado {station['workTime']:.2f}")
+        for computer, message, remaining in self.inService():
+            lines.append(f"  Mensaje {message.ID} en la Computadora {computer}, le quedan {remaining:.2f} s")
+        for computer, time in self.pendingArrivals():
+            lines.append(f"  Próximo arribo a la Computadora {computer} en {time:.2f} s")
+        lines.append(f"Tiempo en que trabajaron las tres juntas: {self.state['compTogetherTime']:.2f}")
+        return "\n".join(lines)
+
+    def save(self, path):
+        # Se escribe en un archivo temporal y se renombra, así una caída nunca deja la foto a medias
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, "wb") as file:
+            pickle.dump(self, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary, path)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as file:
+            snapshot = pickle.load(file)
+        # Se compara el nombre de la clase: ejecutando `snapshot.py` la clase de este módulo es `__main__.Snapshot`
+        if type(snapshot).__name__ != cls.__name__ or getattr(snapshot, "version", None) != SNAPSHOT_VERSION:
+            raise ValueError(f"{path} no es una foto de simulación compatible")
+        return snapshot
+
+# Identificador del próximo mensaje, sin consumirlo
+def nextMessageID():
+    current = next(Message._id_generator)
+    Message._id_generator = itertools.count(current)
+    return current
+
+# Los identificadores siguen desde la foto (sin repetir los que ya se usaron en este proceso)
+def setNextMessageID(value):
+    Message._id_generator = itertools.count(max(value, next(Message._id_generator)))
+
+class Checkpointer:
+    """
+    Clase que guarda periódicamente una foto de una simulación en curso, para poder retomarla
+    con `Snapshot.load(path).restore(...)` si el proceso se interrumpe.
+
+    `attach` agenda en el calendario un punto de control cada `interval` segundos simulados,
+    por lo que entre uno y otro la simulación no tiene ningún costo adicional. Cada foto
+    reemplaza a la anterior en `path`.
+
+    Atributos:
+        path (str): Archivo de la foto.
+        interval (float): Tiempo simulado entre fotos (None para guardar solo con `save`).
+        saved (int): Cantidad de fotos guardadas.
+    """
+    def __init__(self, path, interval=None):
+        self.path = path
+        self.interval = interval
+        self.saved = 0
+
+    def attach(self, simulation):
+        if self.interval is not None:
+            simulation.checkpointInterval = self.interval
+            simulation.onCheckpoint = self.save
+
+    def save(self, simulation):
+        Snapshot.capture(simulation).save(self.path)
+        self.saved += 1
+
+def _runContinuation(task):
+    snapshot, duration, scenario, branch, resetStats = task
+    simulation = snapshot.restore(duration, scenario, branch, resetStats)
+    simulation.start()
+    return simulation.showStats()
+
+def runContinuations(snapshot, scenarios, duration, runs=1, jobs=1, resetStats=True):
+    """
+    Continúa `snapshot` hasta `duration` con cada escenario de `scenarios` y devuelve, por
+    escenario, la lista de métricas de sus `runs` continuaciones (en paralelo con `jobs` procesos).
+
+    Con una sola continuación por escenario se reponen los generadores de la foto; con varias,
+    la continuación `k` de cada escenario usa los flujos propios de la rama `k`, los mismos en
+    todos los escenarios (números aleatorios comunes entre escenarios).
+    """
+    tasks = [(snapshot, duration, scenario, None if runs == 1 else k, resetStats)
+             for scenario in scenarios for k in range(runs)]
+    if jobs > 1 and len(tasks) > 1:
+        with workerPool(jobs) as pool:
+            results = pool.map(_runContinuation, tasks)
+    else:
+        results = [_runContinuation(task) for task in tasks]
+    return [results[i * runs:(i + 1) * runs] for i in range(len(scenarios))]
+
+def main():
+    parser = argparse.ArgumentParser(description="Continuaciones de una foto de la simulación (guardada con main.py --checkpoint).")
+    parser.add_argument("snapshot", help="Archivo de la foto.")
+    parser.add_argument("--duration", type=float, required=True, help="Tiempo simulado en que terminan las continuaciones.")
+    parser.add_argument("--branch", action="append", default=[], metavar="PARÁMETRO=VALOR[,PARÁMETRO=VALOR...]",
+                        help="Cambios del escenario de una continuación (se puede repetir; siempre se incluye la foto sin cambios).")
+    parser.add_argument("--runs", type=int, default=1,
+                        help="Continuaciones por escenario (con más de una, cada una usa flujos aleatorios propios).")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count(), help="Cantidad de procesos.")
+    parser.add_argument("--keepWarmup", action="store_true",
+                        help="Incluir en las métricas lo acumulado antes de la foto (por defecto se mide desde la foto).")
+    parser.add_argument("--output", default=None, help="Archivo JSON donde se guardan los resultados.")
+    args = parser.parse_args()
+    if args.runs < 1 or args.jobs < 1:
+        parser.error("--runs y --jobs deben ser al menos 1")
+
+    try:
+        snapshot = Snapshot.load(args.snapshot)
+    except (OSError, ValueError, pickle.UnpicklingError) as error:
+        parser.error(f"foto inválida: {error}")
+    if args.duration <= snapshot.time:
+        parser.error(f"--duration debe ser mayor al instante de la foto ({snapshot.time:.2f} s)")
+    try:
+        scenarios = [snapshot.scenario] + [snapshot.scenario.replace(**parseAssignments(branch.split(",")))
+                                           for branch in args.branch]
+    except ValueError as error:
+        parser.error(f"escenario inválido: {error}")
+
+    print(snapshot.describe())
+    results = runContinuations(snapshot, scenarios, args.duration, args.runs, args.jobs, not args.keepWarmup)
+
+    print("\n============================ CONTINUACIONES ============================\n")
+    since = "el inicio" if args.keepWarmup else f"{snapshot.time:.2f} s"
+    print(f"{args.runs} continuaciones por escenario hasta {args.duration:.2f} s, métricas desde {since}\n")
+    print(f"{'Escenario':<40}" + "".join(f"{metric:>22}" for metric in SUMMARY_METRICS))
+    summaries = []
+    for scenario, runResults in zip(scenarios, results):
+        summary = summarize(runResults)
+        summaries.append({"scenario": scenario.asDict(), "summary": summary, "runs": runResults})
+        cells = []
+        for metric in SUMMARY_METRICS:
+            halfwidth = summary[metric]["halfwidth"]
+            cells.append(f"{summary[metric]['mean']:.2f} ± {halfwidth:.2f}" if halfwidth is not None
+                         else f"{summary[metric]['mean']:.2f}")
+        print(f"{repr(scenario):<40}" + "".join(f"{cell:>22}" for cell in cells))
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump({"snapshot": args.snapshot, "time": snapshot.time, "duration": args.duration,
+                       "resetStats": not args.keepWarmup, "results": summaries}, file, indent=2)
+        print(f"\nResultados guardados en {args.output}")
+
+if __name__ == "__main__":
+    main()
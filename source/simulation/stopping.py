@@ -0,0 +1,73 @@
+import math
+
+from intervals import tCritical
+
+from onlinestats import RunningStat
+
+# Métricas cuya precisión se controla en el modo secuencial
+TRACKED_METRICS = ("time_all", "time_2", "time_3", "time_3r")
+
+class SequentialStop:
+    """
+    Clase que representa una regla de parada secuencial: se siguen ejecutando corridas hasta
+    que el intervalo de confianza de cada métrica controlada alcanza la precisión pedida.
+
+    Después de cada corrida se actualiza la media y la varianza de cada métrica en línea y
+    se recalcula el semiancho del intervalo t de Student. Una métrica cumple si su semiancho
+    es a lo sumo `targetHalfwidth` y, si se indicó, a lo sumo `relativePrecision` veces el
+    valor absoluto de su media.
+
+    Atributos:
+        targetHalfwidth (float): Semiancho máximo absoluto (None si no se controla).
+        relativePrecision (float): Semiancho máximo relativo a la media (None si no se controla).
+        minRuns (int): Corridas mínimas antes de evaluar la regla (al menos 2).
+        maxRuns (int): Presupuesto máximo de corridas.
+        confidence (float): Nivel de confianza de los intervalos.
+        stats (dict): `RunningStat` de cada métrica controlada.
+    """
+    def __init__(self, targetHalfwidth=None, relativePrecision=None, minRuns=2, maxRuns=1000,
+                 confidence=0.95, metrics=TRACKED_METRICS):
+        self.targetHalfwidth = targetHalfwidth
+        self.relativePrecision = relativePrecision
+        self.minRuns = max(2, minRuns)
+        self.maxRuns = maxRuns
+        self.confidence = confidence
+        self.stats = {metric: RunningStat() for metric in metrics}
+
+    @property
+    def runs(self):
+        return next(iter(self.stats.values())).count
+
+    def add(self, runStats):
+        for metric, stat in self.stats.items():
+            stat.add(runStats[metric])
+
+    def halfwidth(self, metric):
+        stat = self.stats[metric]
+        if stat.count < 2:
+            return math.inf
+        return tCritical(self.confidence, stat.count - 1) * math.sqrt(stat.variance() / stat.count)
+
+    def interval(self, metric):
+        mean, halfwidth = self.stats[metric].mean, self.halfwidth(metric)
+        return mean - halfwidth, mean + halfwidth
+
+    def satisfied(self, metric):
+        halfwidth = self.halfwidth(metric)
+        if self.targetHalfwidth is not None and halfwidth > self.targetHalfwidth:
+            return False
+        if self.relativePrecision is not None and halfwidth > self.relativePrecision * abs(self.stats[metric].mean):
+            return False
+        return True
+
+    # Todas las métricas controladas cumplen la precisión pedida
+    def reached(self):
+        return self.runs >= self.minRuns and all(self.satisfied(metric) for metric in self.stats)
+
+    # Se debe ejecutar otra corrida
+    def shouldContinue(self):
+        return self.runs < self.maxRuns and not self.reached()
+
+    # Texto con el semiancho actual de cada métrica controlada
+    def progress(self):
+        return ", ".join(f"{metric} ± {self.halfwidth(metric):.2f}" for metric in self.stats)
@@ -0,0 +1,88 @@
+import hashlib
+import random
+from statistics import NormalDist
+
+# Normal estándar para obtener la normal por el método de la inversa
+_STANDARD_NORMAL = NormalDist()
+
+class InverseRandom(random.Random):
+    """
+    Generador que obtiene cada variable aleatoria por el método de la inversa a partir de un
+    único uniforme de `random()`, de modo que la variable es una función creciente de ese
+    uniforme. Los métodos de `random.Random` que usa la simulación (`uniform`, `expovariate`
+    y `triangular`) ya cumplen esto; la normal, que `random.Random` obtiene por
+    aceptación y rechazo, se reemplaza por la inversa de su función de distribución.
+    """
+    def normalvariate(self, mu=0.0, sigma=1.0):
+        u = self.random()
+        while u <= 0.0 or u >= 1.0:
+            u = self.random()
+        return mu + sigma * _STANDARD_NORMAL.inv_cdf(u)
+
+class AntitheticRandom(InverseRandom):
+    """
+    Generador antitético de `InverseRandom`: con la misma semilla devuelve 1 - U en lugar
+    de cada uniforme U, por lo que cada variable queda en el extremo opuesto de su distribución.
+    """
+    def random(self):
+        return 1.0 - super().random()
+
+class RandomStreams:
+    """
+    Clase que representa las fuentes de números aleatorios de una simulación.
+
+    Cada combinación (semilla, réplica, computadora, propósito) tiene su propio generador
+    `random.Random` independiente, derivado con un hash de esa combinación. De esta forma:
+        - Cada computadora usa sub-flujos separados para arribos, servicio y enrutamiento.
+        - La réplica `i` se puede reproducir por sí sola, sin ejecutar las réplicas 0..i-1.
+        - Dos simulaciones con la misma semilla y réplica obtienen exactamente los mismos números,
+          aunque sus escenarios sean distintos (números aleatorios comunes al comparar escenarios).
+
+    Con `variates` se elige cómo se obtienen las variables: `PLAIN` usa `random.Random` tal
+    cual, `INVERSE` obtiene todas por el método de la inversa y `ANTITHETIC` es su par
+    antitético (1 - U en lugar de U). Una réplica `INVERSE` y la misma réplica `ANTITHETIC`
+    forman un par de variables antitéticas.
+
+    Atributos:
+        seed (int): Semilla base. Si no se indica, se genera una a partir de la entropía del sistema.
+        replication (int): Número de réplica a la que pertenecen los flujos.
+        variates (str): Forma de obtener las variables: `PLAIN`, `INVERSE` o `ANTITHETIC`.
+    """
+    # Propósitos de los sub-flujos de cada computadora
+    ARRIVALS = "arrivals"
+    SERVICE = "service"
+    ROUTING = "routing"
+
+    # Formas de obtener las variables aleatorias
+    PLAIN = "plain"
+    INVERSE = "inverse"
+    ANTITHETIC = "antithetic"
+    GENERATORS = {PLAIN: random.Random, INVERSE: InverseRandom, ANTITHETIC: AntitheticRandom}
+
+    def __init__(self, seed=None, replication=0, variates=PLAIN):
+        if seed is None:
+            seed = newSeed()
+        if variates not in self.GENERATORS:
+            raise ValueError(f"Forma de obtener las variables desconocida: {variates}")
+        self.seed = seed
+        self.replication = replication
+        self.variates = variates
+
+    def stream(self, computer, purpose):
+        """
+        Devuelve un generador independiente para `computer` (Enum Computer) y `purpose`.
+        """
+        return self.GENERATORS[self.variates](self.seedFor(computer, purpose))
+
+    def seedFor(self, computer, purpose):
+        """
+        Devuelve la semilla (entero de 256 bits) del sub-flujo de `computer` y `purpose`.
+        """
+        key = f"{self.seed}:{self.replication}:{computer.value}:{purpose}".encode()
+        return int.from_bytes(hashlib.sha256(key).digest(), "big")
+
+def newSeed():
+    """
+    Genera una semilla nueva a partir de la entropía del sistema operativo.
+    """
+    return random.SystemRandom().randrange(2**32)
@@ -0,0 +1,237 @@
+import argparse                     # Para manejar argumentos desde la línea de comandos
+import hashlib
+import itertools
+import json
+import os
+import multiprocessing
+
+import numpy as np
+
+from intervals import tCritical
+from replications import runReplication, workerPool
+from farm import runFarm, parseAddress, farmKey, DEFAULT_KEY
+from livemetrics import MetricsServer
+from streams import RandomStreams
+from scenario import Scenario, loadConfig
+
+# Se incrementa cuando cambia el modelo, para que no se reutilicen resultados viejos de la caché
+CACHE_VERSION = 6
+
+# Métricas que se muestran en la tabla del barrido
+SUMMARY_METRICS = ("time_all", "queue_all", "occ_1", "occ_2", "occ_3")
+
+# Motores que puede usar el barrido (el motor batch no ejecuta réplicas por separado)
+ENGINES = ("simpy", "fast")
+
+class ResultCache:
+    """
+    Clase que representa una caché en disco de los resultados de cada réplica.
+
+    Cada réplica se guarda en un archivo JSON cuyo nombre es el hash SHA-256 de sus
+    parámetros (escenario, semilla, número de réplica, duración, motor y forma de obtener las
+    variables aleatorias, con su tamaño de bloque), por lo que al
+    repetir un barrido solo se calculan las réplicas de los puntos que cambiaron.
+
+    Atributos:
+        directory (str): Carpeta donde se guardan los resultados.
+    """
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def key(params, index):
+        payload = {
+            "version": CACHE_VERSION,
+            "scenario": params["scenario"].asDict(),
+            "seed": params["seed"],
+            "replication": params.get("replication", 0) + index,
+            "duration": params["duration"],
+            "engine": params["engine"],
+            "variates": params.get("variates", RandomStreams.PLAIN),
+            "blockSize": params.get("blockSize"),
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+    def path(self, key):
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key):
+        try:
+            with open(self.path(key)) as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return None
+
+    def put(self, key, stats):
+        # Se escribe en un archivo temporal y se renombra, así nunca queda un resultado a medias
+        temporary = f"{self.path(key)}.{os.getpid()}.tmp"
+        with open(temporary, "w") as file:
+            json.dump(stats, file)
+        os.replace(temporary, self.path(key))
+
+def expandGrid(base, sweep):
+    """
+    Devuelve la lista de escenarios del barrido: uno por cada combinación de los valores de
+    `sweep` (diccionario de parámetro -> lista de valores) aplicada sobre el escenario `base`.
+    """
+    names = list(sweep)
+    return [base.replace(**dict(zip(names, values))) for values in itertools.product(*(sweep[name] for name in names))]
+
+def _runTask(task):
+    key, index, params = task
+    return key, runReplication(index, params)
+
+def runSweep(scenarios, duration, runs, seed, engine="fast", jobs=1, cache=None, metrics=None, metricsInterval=1.0,
+             variates=RandomStreams.PLAIN, blockSize=None, farm=None):
+    """
+    Ejecuta `runs` réplicas de cada escenario y devuelve, por escenario, la lista de
+    diccionarios de métricas de sus réplicas. Las réplicas que no están en `cache` se
+    reparten entre `jobs` procesos y se guardan en la caché a medida que terminan.
+    Con un `MetricsServer` en `metrics`, los procesos le publican el estado de sus corridas.
+
+    Todos los escenarios usan la misma semilla, por lo que la réplica `i` de cada uno usa los
+    mismos flujos aleatorios (números aleatorios comunes); `variates` indica cómo se obtienen
+    las variables (ver `RandomStreams`) y `blockSize` el tamaño de sus bloques (ver `Variates`).
+
+    Con `farm` (los argumentos de `farm.runFarm`: `address`, `authkey`, `localWorkers` y
+    `timeout`) las réplicas se reparten entre los trabajadores de la granja en lugar de `jobs` procesos.
+    """
+    tasks = []
+    pending = set()
+    results = {}
+    for point, scenario in enumerate(scenarios):
+        params = {"duration": duration, "seed": seed, "engine": engine, "scenario": scenario, "variates": variates,
+                  "blockSize": blockSize}
+        for index in range(runs):
+            key = ResultCache.key(params, index)
+            stats = cache.get(key) if cache is not None else None
+            # Un mismo punto puede aparecer más de una vez en la grilla, se calcula una sola vez
+            if stats is None and key not in pending:
+                pending.add(key)
+                tasks.append((key, index, params))
+            results[(point, index)] = (key, stats)
+    print(f"{len(scenarios)} escenarios x {runs} réplicas: {len(tasks)} por calcular")
+
+    computed = {}
+
+    def store(key, stats):
+        computed[key] = stats
+        if cache is not None:
+            cache.put(key, stats)
+        if metrics is not None:
+            metrics.setProgress(completed=len(computed))
+
+    if tasks and farm is not None:
+        if metrics is not None:
+            metrics.setProgress(completed=0, total=len(tasks))
+        for task, stats in runFarm([(index, params) for _, index, params in tasks], **farm):
+            store(tasks[task][0], stats)
+    elif tasks:
+        metricsQueue = None
+        if metrics is not None:
+            metricsQueue = multiprocessing.Queue()
+            metrics.listen(metricsQueue)
+            metrics.setProgress(completed=0, total=len(tasks))
+        with workerPool(jobs, metricsQueue, metricsInterval) as pool:
+            for key, stats in pool.imap_unordered(_runTask, tasks):
+                store(key, stats)
+        if metricsQueue is not None:
+            metricsQueue.put(None)
+
+    return [[computed.get(key) if stats is None else stats
+             for key, stats in (results[(point, index)] for index in range(runs))]
+            for point in range(len(scenarios))]
+
+def summarize(runResults, confidence=0.95):
+    # Media y semiancho del intervalo t de Student de cada métrica
+    summary = {}
+    for metric in runResults[0]:
+        values = np.array([stats[metric] for stats in runResults])
+        mean = float(values.mean())
+        if len(values) > 1:
+            halfwidth = float(tCritical(confidence, len(values) - 1) * values.std(ddof=1) / np.sqrt(len(values)))
+        else:
+            halfwidth = None
+        summary[metric] = {"mean": mean, "halfwidth": halfwidth}
+    return summary
+
+def main():
+    """
+    Ejecuta un barrido de escenarios definido en un archivo JSON, TOML o YAML con las secciones:
+    - `scenario`: parámetros base (ver `Scenario`).
+    - `sweep`: parámetros a variar, cada uno con su lista de valores.
+    - `duration`, `runs`, `seed` y `engine` (opcionales, también se pueden indicar por consola).
+    """
+    parser = argparse.ArgumentParser(description="Barrido de escenarios de la simulación, con caché de resultados.")
+    parser.add_argument("config", help="Archivo del barrido (JSON, TOML o YAML).")
+    parser.add_argument("--duration", type=int, default=None, help="Duración de cada réplica.")
+    parser.add_argument("--runs", type=int, default=None, help="Réplicas por escenario.")
+    parser.add_argument("--seed", type=int, default=None, help="Semilla base de todas las réplicas.")
+    parser.add_argument("--engine", choices=ENGINES, default=None, help="Motor de simulación.")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count(), help="Cantidad de procesos.")
+    parser.add_argument("--cache", default=".sweep-cache", help="Carpeta de la caché de resultados.")
+    parser.add_argument("--noCache", action="store_true", help="No leer ni guardar resultados en la caché.")
+    parser.add_argument("--output", default=None, help="Archivo JSON donde se guardan los resultados del barrido.")
+    parser.add_argument("--blockSize", type=int, default=None, help="Tamaño de los bloques de variables aleatorias de NumPy.")
+    parser.add_argument("--metricsPort", type=int, default=None,
+                        help="Puerto local donde se exponen las métricas en vivo (formato Prometheus, en /metrics).")
+    parser.add_argument("--metricsInterval", type=float, default=1.0, help="Segundos entre publicaciones de las métricas en vivo.")
+    parser.add_argument("--farm", default=None, metavar="HOST:PUERTO",
+                        help="Repartir las réplicas entre los trabajadores (farm.py) que se conecten a esta dirección.")
+    parser.add_argument("--farmWorkers", type=int, default=0, help="Trabajadores locales que se inician junto al coordinador (con --farm).")
+    parser.add_argument("--farmKey", default=DEFAULT_KEY, help="Clave compartida con los trabajadores (por defecto SIMULATION_FARM_KEY; obligatoria si no se escucha en 127.0.0.1).")
+    parser.add_argument("--farmTimeout", type=float, default=10.0, help="Segundos sin avisos tras los que un trabajador se da por perdido.")
+    args = parser.parse_args()
+    farm = None
+    if args.farm:
+        try:
+            address = parseAddress(args.farm)
+            farm = {"address": address, "authkey": farmKey(address, args.farmKey), "localWorkers": args.farmWorkers,
+                    "timeout": args.farmTimeout}
+        except ValueError as error:
+            parser.error(str(error))
+
+    try:
+        config = loadConfig(args.config)
+        base = Scenario(**config.get("scenario", {}))
+        sweep = config.get("sweep", {})
+        scenarios = expandGrid(base, sweep)
+    except (OSError, ValueError, ImportError) as error:
+        parser.error(f"barrido inválido: {error}")
+    duration = args.duration if args.duration is not None else config.get("duration", 1000)
+    runs = args.runs if args.runs is not None else config.get("runs", 10)
+    seed = args.seed if args.seed is not None else config.get("seed", 1)
+    engine = args.engine if args.engine is not None else config.get("engine", "fast")
+    if engine not in ENGINES:
+        parser.error(f"motor inválido en {args.config}: {engine!r} (se esperaba {' o '.join(ENGINES)})")
+
+    cache = None if args.noCache else ResultCache(args.cache)
+    metrics = MetricsServer(args.metricsPort) if args.metricsPort is not None else None
+    if metrics is not None:
+        print(f"Métricas en vivo en http://{metrics.address[0]}:{metrics.address[1]}/metrics")
+    allResults = runSweep(scenarios, duration, runs, seed, engine, args.jobs, cache, metrics, args.metricsInterval,
+                          blockSize=args.blockSize, farm=farm)
+    if metrics is not None:
+        metrics.close()
+
+    points = []
+    header = "".join(f"{name:>14}" for name in sweep) + "".join(f"{metric:>22}" for metric in SUMMARY_METRICS)
+    print("\n" + header)
+    for scenario, runResults in zip(scenarios, allResults):
+        summary = summarize(runResults)
+        points.append({"scenario": scenario.asDict(), "runs": runResults, "summary": summary})
+        row = "".join(f"{getattr(scenario, name)!s:>14}" for name in sweep)
+        for metric in SUMMARY_METRICS:
+            mean, halfwidth = summary[metric]["mean"], summary[metric]["halfwidth"]
+            row += f"{mean:>12.2f} ± {halfwidth:<7.2f}" if halfwidth is not None else f"{mean:>22.2f}"
+        print(row)
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump({"duration": duration, "runs": runs, "seed": seed, "engine": engine,
+                       "sweep": sweep, "points": points}, file, indent=2)
+        print(f"\nResultados guardados en {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+import unittest
+
+from eventlog import EventLog
+from fastengine import FastSimulation
+from replications import runReplication
+from snapshot import Snapshot
+
+# Pruebas de las garantías de los motores: se ejecutan con `make test`, `python -m pytest` o
+# `python -m unittest test_engines` desde esta carpeta.
+
+SEED = 3
+
+class EngineTest(unittest.TestCase):
+    def test_simpyAndFastGiveTheSameMetrics(self):
+        # Con la misma semilla ambos motores usan los mismos flujos aleatorios en el mismo orden
+        params = {"duration": 3000, "seed": SEED}
+        simpy = runReplication(0, dict(params, engine="simpy"))
+        fast = runReplication(0, dict(params, engine="fast"))
+        self.assertEqual(simpy, fast)
+
+    def test_resumeFromSnapshotMatchesUninterruptedRun(self):
+        # Una corrida detenida en 2000 s y continuada desde su foto hasta 4000 s da los mismos
+        # resultados que una corrida de 4000 s sin interrupciones (también por bloques)
+        for blockSize in (None, 256):
+            with self.subTest(blockSize=blockSize):
+                uninterrupted = FastSimulation(4000, monitor=False, seed=SEED, verbosity=EventLog.QUIET,
+                                               blockSize=blockSize)
+                uninterrupted.start()
+
+                first = FastSimulation(2000, monitor=False, seed=SEED, verbosity=EventLog.QUIET, blockSize=blockSize)
+                first.start()
+                resumed = Snapshot.capture(first).restore(4000)
+                resumed.start()
+                self.assertEqual(resumed.showStats(), uninterrupted.showStats())
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,254 @@
+import argparse                     # Para manejar argumentos desde la línea de comandos
+import struct
+
+import numpy as np
+
+from aggregation import categorySums, sumsMetrics, systemMetrics
+from message import MessageStore
+
+# Tipos de evento de las trazas
+ENQUEUE = 1      # El mensaje llega a la cola de una computadora
+START = 2        # La computadora comienza a procesar el mensaje
+FINISH = 3       # La computadora termina de procesar el mensaje
+SENT = 4         # El mensaje sale del sistema enviado al destino (desde la Computadora 1)
+REJECTED = 5     # El mensaje sale del sistema rechazado (desde la Computadora 3)
+
+EVENT_NAMES = {ENQUEUE: "llega a la cola", START: "comienza a procesarse", FINISH: "termina de procesarse",
+               SENT: "enviado al destino", REJECTED: "rechazado"}
+
+# Encabezado: identificador, versión, tamaño de registro, capacidad de cada computadora y duración
+MAGIC = b"SIMTRACE"
+VERSION = 1
+HEADER = struct.Struct("<8sHHHHH2xd4x")
+# Registro de ancho fijo: ID, tiempo, origen, tipo de evento y computadora
+RECORD = struct.Struct("<qdbbb5x")
+RECORD_DTYPE = np.dtype([("id", "<i8"), ("time", "<f8"), ("origin", "i1"), ("event", "i1"), ("station", "i1"), ("pad", "V5")])
+
+class TraceWriter:
+    """
+    Clase que escribe la traza binaria de una corrida: un registro de ancho fijo por evento.
+
+    Los registros se empaquetan con `struct` en un buffer y se escriben en bloque cada
+    `bufferRecords` registros, por lo que el costo por evento es el de empaquetar 24 bytes.
+
+    Atributos:
+        path (str): Archivo de la traza.
+        records (int): Cantidad de registros escritos.
+    """
+    def __init__(self, path, duration, capacities=(1, 1, 1), bufferRecords=65536):
+        self.path = path
+        self.file = open(path, "wb")
+        self.file.write(HEADER.pack(MAGIC, VERSION, RECORD.size, *capacities, duration))
+        self.buffer = bytearray(RECORD.size * bufferRecords)
+        self.offset = 0
+        self.records = 0
+        self.pack = RECORD.pack_into
+
+    def write(self, messageId, origin, event, station, time):
+        self.pack(self.buffer, self.offset, messageId, time, origin, event, station)
+        self.offset += RECORD.size
+        self.records += 1
+        if self.offset == len(self.buffer):
+            self.flush()
+
+    def flush(self):
+        if self.offset:
+            self.file.write(memoryview(self.buffer)[:self.offset])
+            self.offset = 0
+
+    def close(self):
+        if not self.file.closed:
+            self.flush()
+            self.file.close()
+
+class TraceReader:
+    """
+    Clase que lee una traza binaria sin cargarla en memoria: los registros se mapean con
+    `np.memmap` como un arreglo estructurado y se recorren por bloques de `chunkSize`.
+
+    Permite recalcular las mediciones de `showStats`, obtener la serie del largo de la cola
+    de una computadora y el recorrido de un mensaje, sin volver a ejecutar la simulación.
+
+    Atributos:
+        records (np.memmap): Registros de la traza (campos `id`, `time`, `origin`, `event`, `station`).
+        duration (float): Duración de la corrida.
+        capacities (tuple): Cantidad de servidores de cada computadora.
+    """
+    def __init__(self, path, chunkSize=1 << 22):
+        with open(path, "rb") as file:
+            header = file.read(HEADER.size)
+        magic, version, recordSize, capacity1, capacity2, capacity3, duration = HEADER.unpack(header)
+        if magic != MAGIC or version != VERSION or recordSize != RECORD.size:
+            raise ValueError(f"{path} no es una traza de la simulación (versión {VERSION})")
+        self.capacities = (capacity1, capacity2, capacity3)
+        self.duration = duration
+        self.chunkSize = chunkSize
+        self.records = np.memmap(path, dtype=RECORD_DTYPE, mode="r", offset=HEADER.size)
+
+    def __len__(self):
+        return len(self.records)
+
+    def chunks(self):
+        for start in range(0, len(self.records), self.chunkSize):
+            yield self.records[start:start + self.chunkSize]
+
+    def metrics(self):
+        """
+        Recalcula las 16 métricas de `showStats` a partir de la traza.
+
+        Por mensaje: la llegada al sistema es su primer evento, la salida su evento `SENT` o
+        `REJECTED` y el tiempo en colas la suma de sus inicios menos la suma de sus llegadas a
+        colas. El tiempo trabajado de cada computadora solo incluye los procesamientos que
+        terminaron, igual que en la simulación.
+
+        Solo se guarda el estado de los mensajes que siguen en el sistema: los que salen en un
+        bloque se suman a los totales de su grupo (`categorySums`) y se descartan, así la
+        memoria depende del bloque y de los mensajes en el sistema, no del largo de la traza.
+        """
+        # Estado de los mensajes abiertos, ordenados por ID
+        carry = {"id": np.zeros(0, dtype=np.int64), "arrival": np.zeros(0), "queue": np.zeros(0),
+                 "lastStart": np.zeros(0), "open": np.zeros(0, dtype=bool), "origin": np.zeros(0, dtype=np.int8),
+                 "lastStation": np.zeros(0, dtype=np.int8)}
+        counts = np.zeros(4, dtype=np.int64)
+        sums = {name: np.zeros(4) for name in ("time", "queue", "eff")}
+        workTime = np.zeros(4)
+        together = TogetherTime()
+
+        for chunk in self.chunks():
+            time, event, station = chunk["time"], chunk["event"], chunk["station"]
+            # Índice local de cada mensaje, entre los abiertos y los que aparecen en el bloque
+            keys, inverse = np.unique(np.concatenate([carry["id"], chunk["id"]]), return_inverse=True)
+            previous, ids = inverse[:len(carry["id"])], inverse[len(carry["id"]):]
+            size = len(keys)
+            state = {"arrival": np.full(size, np.nan), "queue": np.zeros(size), "lastStart": np.zeros(size),
+                     "open": np.zeros(size, dtype=bool), "origin": np.zeros(size, dtype=np.int8),
+                     "lastStation": np.zeros(size, dtype=np.int8)}
+            for name, values in state.items():
+                values[previous] = carry[name]
+            status = np.zeros(size, dtype=np.int8)
+            departure = np.zeros(size)
+
+            enqueue = event == ENQUEUE
+            # Primera llegada a una cola de cada mensaje (los registros están en orden de tiempo)
+            first = enqueue & np.isnan(state["arrival"][ids])
+            firstIds, firstIndex = np.unique(ids[first], return_index=True)
+            state["arrival"][firstIds] = time[first][firstIndex]
+            state["origin"][ids] = chunk["origin"]
+            np.subtract.at(state["queue"], ids[enqueue], time[enqueue])
+            start = event == START
+            np.add.at(state["queue"], ids[start], time[start])
+
+            # Último inicio de cada mensaje y si quedó sin terminar (se sobrescribe en orden)
+            finish = event == FINISH
+            state["lastStart"][ids[start]] = time[start]
+            state["lastStation"][ids[start]] = station[start]
+            service = start | finish
+            state["open"][ids[service]] = start[service]
+            np.add.at(workTime, station[finish], time[finish])
+            np.subtract.at(workTime, station[start], time[start])
+
+            for code, value in ((SENT, MessageStore.SENT), (REJECTED, MessageStore.REJECTED)):
+                done = event == code
+                departure[ids[done]] = time[done]
+                status[ids[done]] = value
+            together.add(time, event, station)
+
+            # Los mensajes que salieron se suman a su grupo y dejan de guardarse
+            finished = status > 0
+            chunkCounts, chunkSums = categorySums(state["origin"][finished], status[finished], state["arrival"][finished],
+                                                  departure[finished], state["queue"][finished])
+            counts += chunkCounts
+            for name in sums:
+                sums[name] += chunkSums[name]
+            carry = {"id": keys[~finished], **{name: values[~finished] for name, values in state.items()}}
+
+        # Los procesamientos que no terminaron no cuentan como trabajo
+        unfinished = carry["open"]
+        np.add.at(workTime, carry["lastStation"][unfinished], carry["lastStart"][unfinished])
+
+        serverWorkTimes = [workTime[n] / capacity for n, capacity in zip((1, 2, 3), self.capacities)]
+        return systemMetrics(sumsMetrics(counts, sums), serverWorkTimes, together.total, self.duration)
+
+    def queueLengthSeries(self, computer):
+        """
+        Devuelve la serie del largo de la cola de la computadora `computer` (1, 2 o 3): los
+        tiempos en que cambia y el largo a partir de cada uno.
+        """
+        times, lengths, current = [], [], 0
+        for chunk in self.chunks():
+            mask = (chunk["station"] == computer) & ((chunk["event"] == ENQUEUE) | (chunk["event"] == START))
+            events = chunk[mask]
+            steps = np.where(events["event"] == ENQUEUE, 1, -1)
+            length = current + np.cumsum(steps)
+            if len(length):
+                current = int(length[-1])
+            times.append(np.asarray(events["time"]))
+            lengths.append(length)
+        return np.concatenate(times) if times else np.zeros(0), np.concatenate(lengths) if lengths else np.zeros(0, dtype=int)
+
+    def messagePath(self, messageId):
+        """
+        Devuelve los registros del mensaje `messageId`, en orden de tiempo.
+        """
+        return np.concatenate([np.asarray(chunk[chunk["id"] == messageId]) for chunk in self.chunks()] or
+                              [np.zeros(0, dtype=RECORD_DTYPE)])
+
+class TogetherTime:
+    """
+    Clase que acumula, recorriendo los eventos por bloques, el tiempo en que las tres
+    computadoras tuvieron al menos un servidor ocupado. Igual que en la simulación, solo se
+    suman los períodos que terminaron (el último, si sigue abierto al final, no cuenta).
+    """
+    def __init__(self):
+        self.busy = np.zeros(4, dtype=np.int64)
+        self.openSince = None
+        self.total = 0.0
+
+    def add(self, time, event, station):
+        service = (event == START) | (event == FINISH)
+        if not service.any():
+            return
+        time, station = time[service], station[service]
+        steps = np.where(event[service] == START, 1, -1)
+        counts = np.zeros((len(time), 4), dtype=np.int64)
+        counts[np.arange(len(time)), station] = steps
+        counts = self.busy + np.cumsum(counts, axis=0)
+        allBusy = (counts[:, 1] > 0) & (counts[:, 2] > 0) & (counts[:, 3] > 0)
+        # Cambios de estado: comienzan (False -> True) y terminan (True -> False) los períodos
+        previous = np.concatenate([[self.openSince is not None], allBusy[:-1]])
+        starts = time[allBusy & ~previous]
+        ends = time[~allBusy & previous]
+        if self.openSince is not None:
+            starts = np.concatenate([[self.openSince], starts])
+        closed = len(ends)
+        self.total += float(ends.sum() - starts[:closed].sum())
+        self.openSince = float(starts[closed]) if len(starts) > closed else None
+        if len(counts):
+            self.busy = counts[-1]
+
+def main():
+    parser = argparse.ArgumentParser(description="Análisis de una traza binaria de la simulación.")
+    parser.add_argument("trace", help="Archivo de la traza (generado con --trace).")
+    parser.add_argument("--message", type=int, default=None, help="Mostrar el recorrido del mensaje con este ID.")
+    parser.add_argument("--queue", type=int, choices=[1, 2, 3], default=None,
+                        help="Guardar la serie del largo de la cola de esta computadora en CSV (ver --output).")
+    parser.add_argument("--output", default="cola.csv", help="Archivo CSV de la serie del largo de la cola.")
+    args = parser.parse_args()
+
+    reader = TraceReader(args.trace)
+    print(f"{len(reader)} registros, duración {reader.duration:.2f} s, servidores {reader.capacities}\n")
+    for key, value in reader.metrics().items():
+        print(f"{key}: {value:.4f}")
+
+    if args.message is not None:
+        print(f"\n--- Recorrido del mensaje {args.message} ---")
+        for record in reader.messagePath(args.message):
+            print(f"[{record['time']:.2f} s] Computadora {record['station']}: {EVENT_NAMES[int(record['event'])]}")
+
+    if args.queue is not None:
+        times, lengths = reader.queueLengthSeries(args.queue)
+        np.savetxt(args.output, np.column_stack([times, lengths]), delimiter=",", header="tiempo,largo", comments="", fmt=["%.6f", "%d"])
+        print(f"\nSerie del largo de la cola de la Computadora {args.queue} guardada en {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+import argparse                     # Para manejar argumentos desde la línea de comandos
+import json
+import os
+
+import numpy as np
+
+from intervals import tCritical
+from scenario import Scenario
+from streams import RandomStreams
+from sweep import ResultCache, runSweep, SUMMARY_METRICS
+
+def pairedDifference(first, second, confidence=0.95):
+    """
+    Intervalo de confianza de la diferencia de medias entre dos escenarios a partir de las
+    diferencias réplica a réplica (`first[i] - second[i]`).
+
+    Además devuelve `varianceRatio`: la varianza que tendría la diferencia con réplicas
+    independientes (s1² + s2²) dividida por la varianza de las diferencias pareadas. Es
+    aproximadamente cuántas veces menos réplicas se necesitan para la misma precisión.
+    """
+    first, second = np.asarray(first, dtype=float), np.asarray(second, dtype=float)
+    differences = first - second
+    n = len(differences)
+    result = {"mean": float(differences.mean()), "halfwidth": None, "varianceRatio": None}
+    if n < 2:
+        return result
+    variance = differences.var(ddof=1)
+    result["halfwidth"] = float(tCritical(confidence, n - 1) * np.sqrt(variance / n))
+    independent = first.var(ddof=1) + second.var(ddof=1)
+    if variance > 0:
+        result["varianceRatio"] = float(independent / variance)
+    return result
+
+def antitheticAverage(runResults, antitheticResults):
+    # Promedio de cada par antitético, métrica por métrica: una observación por par
+    return [{metric: (stats[metric] + pair[metric]) / 2 for metric in stats}
+            for stats, pair in zip(runResults, antitheticResults)]
+
+class _MemoryCache:
+    # Caché en memoria para no repetir réplicas al ampliar la cantidad cuando no hay caché en disco
+    def __init__(self):
+        self.results = {}
+
+    def get(self, key):
+        return self.results.get(key)
+
+    def put(self, key, stats):
+        self.results[key] = stats
+
+def compareScenarios(base, alternative, duration, runs, seed, engine="fast", jobs=1, cache=None,
+                     common=True, antithetic=False):
+    """
+    Ejecuta `runs` réplicas de `base` y de `alternative` y devuelve la lista de métricas de
+    las réplicas de cada uno, emparejadas por número de réplica.
+
+    Con `common` (por defecto) la réplica `i` de ambos escenarios usa los mismos flujos
+    aleatorios por fuente (arribos, procesamiento y enrutamiento de cada computadora), así
+    la diferencia entre ellas se debe al cambio de escenario y no al azar; sin `common`, el
+    escenario alternativo usa otra semilla (réplicas independientes). Con `antithetic`, cada
+    réplica es el promedio de un par de corridas antitéticas (U y 1 - U en todas las variables).
+    """
+    variates = RandomStreams.INVERSE if antithetic else RandomStreams.PLAIN
+    if common:
+        results = runSweep([base, alternative], duration, runs, seed, engine, jobs, cache, variates=variates)
+    else:
+        results = [runSweep([scenario], duration, runs, scenarioSeed, engine, jobs, cache, variates=variates)[0]
+                   for scenario, scenarioSeed in ((base, seed), (alternative, seed + 1))]
+    if antithetic:
+        if common:
+            pairs = runSweep([base, alternative], duration, runs, seed, engine, jobs, cache, variates=RandomStreams.ANTITHETIC)
+        else:
+            pairs = [runSweep([scenario], duration, runs, scenarioSeed, engine, jobs, cache, variates=RandomStreams.ANTITHETIC)[0]
+                     for scenario, scenarioSeed in ((base, seed), (alternative, seed + 1))]
+        results = [antitheticAverage(runResults, pairResults) for runResults, pairResults in zip(results, pairs)]
+    return results
+
+def compareToPrecision(base, alternative, duration, minRuns, maxRuns, targetHalfwidth, metric, seed, engine="fast",
+                       jobs=1, cache=None, common=True, antithetic=False, confidence=0.95):
+    """
+    Igual que `compareScenarios`, pero duplica la cantidad de réplicas (desde `minRuns` hasta
+    `maxRuns`) hasta que el semiancho del intervalo de la diferencia en `metric` no supera
+    `targetHalfwidth`. Las réplicas ya calculadas se toman de la caché.
+    """
+    cache = cache if cache is not None else _MemoryCache()
+    runs = minRuns
+    while True:
+        results = compareScenarios(base, alternative, duration, runs, seed, engine, jobs, cache, common, antithetic)
+        difference = pairedDifference([stats[metric] for stats in results[0]], [stats[metric] for stats in results[1]], confidence)
+        if (difference["halfwidth"] is not None and difference["halfwidth"] <= targetHalfwidth) or runs >= maxRuns:
+            return runs, results
+        runs = min(runs * 2, maxRuns)
+
+def parseAssignments(assignments):
+    # Convierte ["returnProb3=0.4", "capacity3=2"] en {"returnProb3": 0.4, "capacity3": 2}
+    changes = {}
+    for assignment in assignments:
+        name, separator, value = assignment.partition("=")
+        if not separator:
+            raise ValueError(f"Se esperaba parámetro=valor: {assignment}")
+        changes[name.strip()] = json.loads(value)
+    return changes
+
+def main():
+    parser = argparse.ArgumentParser(description="Comparación de dos escenarios con reducción de varianza "
+                                                 "(números aleatorios comunes y variables antitéticas).")
+    parser.add_argument("--scenario", default=None, help="Escenario base (JSON, TOML o YAML; por defecto el del enunciado).")
+    parser.add_argument("--alternative", default=None, help="Escenario alternativo (JSON, TOML o YAML).")
+    parser.add_argument("--set", action="append", default=[], metavar="PARÁMETRO=VALOR",
+                        help="Cambio del escenario alternativo respecto del base (se puede repetir).")
+    parser.add_argument("--duration", type=int, default=2000, help="Duración de cada réplica.")
+    parser.add_argument("--runs", type=int, default=10, help="Réplicas por escenario (el mínimo con --target-halfwidth).")
+    parser.add_argument("--seed", type=int, default=1, help="Semilla base de las réplicas.")
+    parser.add_argument("--engine", choices=["simpy", "fast"], default="fast", help="Motor de simulación.")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count(), help="Cantidad de procesos.")
+    parser.add_argument("--independent", action="store_true",
+                        help="Usar réplicas independientes en lugar de números aleatorios comunes (para comparar).")
+    parser.add_argument("--antithetic", action="store_true", help="Promediar cada réplica con su par antitético.")
+    parser.add_argument("--metric", default="time_all", help="Métrica de --target-halfwidth.")
+    parser.add_argument("--target-halfwidth", type=float, default=None,
+                        help="Semiancho máximo del intervalo de la diferencia en --metric (se duplican las réplicas hasta lograrlo).")
+    parser.add_argument("--maxRuns", type=int, default=1000, help="Máximo de réplicas por escenario con --target-halfwidth.")
+    parser.add_argument("--cache", default=".sweep-cache", help="Carpeta de la caché de resultados (la misma de sweep.py).")
+    parser.add_argument("--noCache", action="store_true", help="No leer ni guardar resultados en la caché.")
+    parser.add_argument("--output", default=None, help="Archivo JSON donde se guarda la comparación.")
+    args = parser.parse_args()
+    if args.runs < 2:
+        parser.error("--runs debe ser al menos 2")
+
+    try:
+        base = Scenario.fromFile(args.scenario) if args.scenario else Scenario()
+        alternative = Scenario.fromFile(args.alternative) if args.alternative else base
+        alternative = alternative.replace(**parseAssignments(args.set))
+    except (OSError, ValueError, ImportError) as error:
+        parser.error(f"escenario inválido: {error}")
+    if alternative == base:
+        parser.error("el escenario alternativo es igual al base (use --alternative o --set)")
+
+    cache = None if args.noCache else ResultCache(args.cache)
+    common = not args.independent
+    if args.target_halfwidth is not None:
+        runs, results = compareToPrecision(base, alternative, args.duration, args.runs, args.maxRuns, args.target_halfwidth,
+                                           args.metric, args.seed, args.engine, args.jobs, cache, common, args.antithetic)
+    else:
+        runs = args.runs
+        results = compareScenarios(base, alternative, args.duration, runs, args.seed, args.engine, args.jobs, cache,
+                                   common, args.antithetic)
+
+    mode = "réplicas independientes" if args.independent else "números aleatorios comunes"
+    if args.antithetic:
+        mode += " y pares antitéticos"
+    print("\n============================ COMPARACIÓN DE ESCENARIOS ============================")
+    print(f"Alternativo: {alternative!r} contra base: {base!r}")
+    print(f"{runs} réplicas por escenario con {mode}; intervalos de confianza del 95% de la diferencia (alternativo - base)\n")
+    metrics = list(dict.fromkeys(SUMMARY_METRICS + (args.metric,)))
+    print(f"{'Métrica':>12}{'Base':>14}{'Alternativo':>14}{'Diferencia':>26}{'Reducción de varianza':>24}")
+    comparison = {}
+    for metric in metrics:
+        baseValues = [stats[metric] for stats in results[0]]
+        alternativeValues = [stats[metric] for stats in results[1]]
+        difference = pairedDifference(alternativeValues, baseValues)
+        comparison[metric] = dict(difference, base=float(np.mean(baseValues)), alternative=float(np.mean(alternativeValues)))
+        ratio = f"{difference['varianceRatio']:.1f}x" if difference["varianceRatio"] is not None else "N/A"
+        print(f"{metric:>12}{comparison[metric]['base']:>14.2f}{comparison[metric]['alternative']:>14.2f}"
+              f"{difference['mean']:>16.2f} ± {difference['halfwidth']:<7.2f}{ratio:>24}")
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump({"base": base.asDict(), "alternative": alternative.asDict(), "duration": args.duration, "runs": runs,
+                       "seed": args.seed, "engine": args.engine, "common": common, "antithetic": args.antithetic,
+                       "comparison": comparison}, file, indent=2)
+        print(f"\nComparación guardada en {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+import copy
+
+import numpy as np
+
+from message import Computer
+from scenario import Scenario
+from streams import RandomStreams
+
+class VariatePool:
+    """
+    Clase que representa una fuente de números aleatorios generados por bloques con NumPy.
+
+    `draw(size)` genera un bloque de `size` valores ya transformados (por ejemplo, truncados
+    o con la inversa aplicada) y cada llamada a la fuente devuelve el siguiente valor del
+    bloque; cuando se agota se genera otro. Como cada bloque sale del mismo generador en
+    orden, la secuencia es la misma en cada ejecución con la misma semilla y tamaño de bloque.
+
+    Atributos:
+        blockSize (int): Cantidad de valores de cada bloque.
+        blocks (int): Cantidad de bloques generados.
+    """
+    def __init__(self, draw, blockSize):
+        self.draw = draw
+        self.blockSize = blockSize
+        self.blocks = 0
+        self.refill()
+
+    def refill(self):
+        # Los valores se pasan a una lista de floats de Python: leerlos es más barato que indexar el arreglo
+        self.setRemaining(self.draw(self.blockSize).tolist())
+        self.blocks += 1
+
+    # Valores del bloque actual que todavía no se usaron (sin consumirlos)
+    def remaining(self):
+        return list(copy.copy(self.values))
+
+    def setRemaining(self, values):
+        self.values = iter(values)
+        self.next = self.values.__next__
+
+    def __call__(self):
+        try:
+            return self.next()
+        except StopIteration:
+            self.refill()
+            return self.next()
+
+class Variates:
+    """
+    Clase que reúne las variables aleatorias de la simulación, una función sin argumentos por
+    fuente, que usan tanto las computadoras de SimPy como el motor rápido:
+        arrival2, arrival3: Tiempo entre arribos desde el exterior a las Computadoras 2 y 3.
+        service1, service2, service3: Tiempo de procesamiento de cada computadora.
+        routing1, routing3: Uniforme (0, 1) de la decisión de devolver (C1) o rechazar (C3).
+
+    Sin `blockSize`, cada valor se pide a su `random.Random` de `RandomStreams` (el
+    comportamiento original, con los mismos resultados). Con `blockSize`, cada fuente es un
+    `VariatePool` con un generador de NumPy derivado de la misma semilla, réplica, computadora
+    y propósito, y la truncación en 0 de la normal y la inversa cúbica de la Computadora 3 se
+    calculan por bloque. Con `variates` `INVERSE` o `ANTITHETIC` los bloques se obtienen por el
+    método de la inversa a partir de uniformes (U o 1 - U).
+
+    El estado de todas las fuentes se obtiene con `getstate` y se repone con `setstate`, para
+    continuar una simulación guardada con los mismos números (ver `snapshot`).
+
+    Atributos:
+        blockSize (int): Tamaño de los bloques, o `None` para pedir cada valor por separado.
+        generators (dict): Generador de cada fuente (`random.Random` o `numpy.random.Generator`).
+        pools (dict): `VariatePool` de cada fuente cuando se usan bloques.
+    """
+    # Fuente de cada variable: (computadora, propósito)
+    SOURCES = {
+        "arrival2": (Computer.COMPUTER_2, RandomStreams.ARRIVALS),
+        "arrival3": (Computer.COMPUTER_3, RandomStreams.ARRIVALS),
+        "service1": (Computer.COMPUTER_1, RandomStreams.SERVICE),
+        "service2": (Computer.COMPUTER_2, RandomStreams.SERVICE),
+        "service3": (Computer.COMPUTER_3, RandomStreams.SERVICE),
+        "routing1": (Computer.COMPUTER_1, RandomStreams.ROUTING),
+        "routing3": (Computer.COMPUTER_3, RandomStreams.ROUTING),
+    }
+
+    def __init__(self, streams=None, scenario=None, blockSize=None):
+        self.streams = streams if streams is not None else RandomStreams()
+        self.scenario = scenario if scenario is not None else Scenario()
+        self.blockSize = blockSize
+        if blockSize is not None and blockSize < 1:
+            raise ValueError("El tamaño de bloque debe ser al menos 1")
+        self.generators = {}
+        self.pools = {}
+        for name, (computer, purpose) in self.SOURCES.items():
+            if blockSize is None:
+                generator = self.streams.stream(computer, purpose)
+                sampler = getattr(self, f"_{name}")(generator)
+            else:
+                generator = np.random.default_rng(self.streams.seedFor(computer, purpose))
+                sampler = self.pools[name] = VariatePool(getattr(self, f"_{name}Block")(generator), blockSize)
+            self.generators[name] = generator
+            setattr(self, name, sampler)
+
+    def getstate(self):
+        """
+        Devuelve el estado de cada fuente: el de su `random.Random` o, por bloques, el del
+        generador de NumPy junto con los valores que quedan del bloque actual.
+        """
+        if self.blockSize is None:
+            return {name: generator.getstate() for name, generator in self.generators.items()}
+        return {name: (generator.bit_generator.state, self.pools[name].remaining())
+                for name, generator in self.generators.items()}
+
+    def setstate(self, state, keepBlocks=True):
+        """
+        Repone el estado obtenido con `getstate`. Los valores que quedaban del bloque ya están
+        transformados con el escenario en que se generaron: si el escenario cambió, se llama
+        con `keepBlocks=False` para descartarlos y reponer solo los generadores de NumPy, así
+        el próximo bloque se genera con los parámetros nuevos.
+        """
+        if self.blockSize is None:
+            for name, generator in self.generators.items():
+                generator.setstate(state[name])
+        else:
+            for name, generator in self.generators.items():
+                generator.bit_generator.state, values = state[name]
+                self.pools[name].setRemaining(values if keepBlocks else [])
+
+    # --- Un valor por llamada, con `random.Random` ---
+    def _arrival2(self, stream):
+        rate = 1 / self.scenario.arrivalMean2
+        return lambda: stream.expovariate(rate)
+
+    def _arrival3(self, stream):
+        low, high, mode = self.scenario.arrivalMin3, self.scenario.arrivalMax3, self.scenario.arrivalMode3
+        return lambda: stream.triangular(low, high, mode)
+
+    def _service1(self, stream):
+        mean, sd = self.scenario.serviceMean1, self.scenario.serviceSd1
+        # La normal podría dar valores negativos, se trunca en 0
+        return lambda: max(0, stream.normalvariate(mean, sd))
+
+    def _service2(self, stream):
+        low, high = self.scenario.serviceMin2, self.scenario.serviceMax2
+        return lambda: stream.uniform(low, high)
+
+    def _service3(self, stream):
+        low, high = self.scenario.serviceUniformMin3, self.scenario.serviceUniformMax3
+        # Inversa de la distribución de la Computadora 3: x = (98y + 27)^(1/3)
+        return lambda: (98 * stream.uniform(low, high) + 27) ** (1/3)
+
+    def _routing1(self, stream):
+        return lambda: stream.uniform(0, 1)
+
+    _routing3 = _routing1
+
+    # --- Por bloques, con NumPy ---
+    def _uniforms(self, generator, size):
+        u = generator.random(size)
+        return 1.0 - u if self.streams.variates == RandomStreams.ANTITHETIC else u
+
+    @property
+    def _inverse(self):
+        return self.streams.variates != RandomStreams.PLAIN
+
+    def _arrival2Block(self, generator):
+        mean = self.scenario.arrivalMean2
+        if self._inverse:
+            return lambda size: -mean * np.log1p(-self._uniforms(generator, size))
+        return lambda size: generator.exponential(mean, size)
+
+    def _arrival3Block(self, generator):
+        low, high, mode = self.scenario.arrivalMin3, self.scenario.arrivalMax3, self.scenario.arrivalMode3
+        if self._inverse:
+            def draw(size):
+                u = self._uniforms(generator, size)
+                c = (mode - low) / (high - low)
+                return np.where(u <= c, low + np.sqrt(u * (high - low) * (mode - low)),
+                                high - np.sqrt((1 - u) * (high - low) * (high - mode)))
+            return draw
+        return lambda size: generator.triangular(low, mode, high, size)
+
+    def _service1Block(self, generator):
+        mean, sd = self.scenario.serviceMean1, self.scenario.serviceSd1
+        if self._inverse:
+            # SciPy solo se importa si se usa la inversa de la normal
+            from scipy.special import ndtri
+            return lambda size: np.maximum(0, mean + sd * ndtri(self._uniforms(generator, size)))
+        return lambda size: np.maximum(0, generator.normal(mean, sd, size))
+
+    def _service2Block(self, generator):
+        low, high = self.scenario.serviceMin2, self.scenario.serviceMax2
+        return lambda size: low + (high - low) * self._uniforms(generator, size)
+
+    def _service3Block(self, generator):
+        low, high = self.scenario.serviceUniformMin3, self.scenario.serviceUniformMax3
+        return lambda size: np.cbrt(98 * (low + (high - low) * self._uniforms(generator, size)) + 27)
+
+    def _routing1Block(self, generator):
+        return lambda size: self._uniforms(generator, size)
+
+    _routing3Block = _routing1Block